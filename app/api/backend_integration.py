@@ -3,11 +3,12 @@
 백엔드에서 호출할 수 있는 레시피 추천 API를 제공합니다.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from app.services.recommendation_service import RecommendationService
 from app.models.schemas import RecommendationRequest
+from app.container import get_recommendation_service
 import logging
 import time
 
@@ -44,7 +45,10 @@ class BackendRecipeRecommendationResponse(BaseModel):
     processingTime: float
 
 @router.post("/recipes", response_model=BackendRecipeRecommendationResponse)
-async def recommend_recipes_for_backend(request: BackendRecipeRecommendationRequest):
+async def recommend_recipes_for_backend(
+    request: BackendRecipeRecommendationRequest,
+    recommendation_service: RecommendationService = Depends(get_recommendation_service)
+):
     """
     백엔드에서 호출하는 레시피 추천 API
     
@@ -70,7 +74,6 @@ async def recommend_recipes_for_backend(request: BackendRecipeRecommendationRequ
             user_id=request.userId
         )
         
-        recommendation_service = RecommendationService()
         ai_response = await recommendation_service.get_recommendations(recommendation_request)
         
         # AI 서버 응답을 백엔드 호환 형식으로 변환
@@ -116,11 +119,12 @@ async def recommend_recipes_for_backend(request: BackendRecipeRecommendationRequ
         raise HTTPException(status_code=500, detail=f"레시피 추천 중 오류가 발생했습니다: {str(e)}")
 
 @router.get("/health")
-async def backend_health_check():
+async def backend_health_check(
+    recommendation_service: RecommendationService = Depends(get_recommendation_service)
+):
     """백엔드용 헬스체크"""
     try:
         # OpenSearch 연결 테스트
-        recommendation_service = RecommendationService()
         connection_ok = await recommendation_service.opensearch_client.test_connection()
         
         return {
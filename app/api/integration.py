@@ -4,11 +4,12 @@ recipe-ai-project 통합 API 엔드포인트
 recipe-ai-project의 OpenSearch와 연동하여 레시피 추천과 재료 검색 기능을 제공합니다.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
 from pydantic import BaseModel
 from app.clients.opensearch_client import opensearch_client
 from app.clients.openai_client import OpenAIClient
+from app.container import get_openai_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -75,7 +76,10 @@ async def search_ingredients_by_text(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/recipes/recommend/vector")
-async def recommend_recipes_by_vector(request: RecipeSearchRequest):
+async def recommend_recipes_by_vector(
+    request: RecipeSearchRequest,
+    openai_client: OpenAIClient = Depends(get_openai_client)
+):
     """
     벡터 검색을 통한 레시피 추천
     사용자의 재료를 임베딩으로 변환하여 유사한 레시피를 찾습니다.
@@ -85,8 +89,6 @@ async def recommend_recipes_by_vector(request: RecipeSearchRequest):
     
     try:
         # OpenAI로 재료 임베딩 생성
-        openai_client = OpenAIClient()
-        
         # 재료 텍스트 조합
         ingredients_text = ", ".join(request.ingredients)
         
@@ -141,7 +143,8 @@ async def recommend_recipes_by_vector(request: RecipeSearchRequest):
 @router.post("/ingredients/search/vector")
 async def search_ingredients_by_vector(
     query: str = Query(..., description="검색할 재료명"),
-    limit: int = Query(10, description="결과 개수")
+    limit: int = Query(10, description="결과 개수"),
+    openai_client: OpenAIClient = Depends(get_openai_client)
 ):
     """
     벡터 검색을 통한 재료 검색
@@ -151,7 +154,6 @@ async def search_ingredients_by_vector(
     
     try:
         # OpenAI로 쿼리 임베딩 생성
-        openai_client = OpenAIClient()
         embeddings = await openai_client.get_embeddings([query])
         query_embedding = embeddings[0]
         
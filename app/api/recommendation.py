@@ -2,15 +2,19 @@
 레시피 추천 API 엔드포인트
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 from app.models.schemas import RecommendationRequest, RecommendationResponse
 from app.services.recommendation_service import RecommendationService
+from app.container import get_recommendation_service
 
 router = APIRouter()
 
 @router.post("/recommend", response_model=RecommendationResponse)
-async def get_recipe_recommendations(request: RecommendationRequest):
+async def get_recipe_recommendations(
+    request: RecommendationRequest,
+    recommendation_service: RecommendationService = Depends(get_recommendation_service)
+):
     """
     재료 기반 레시피 추천을 제공합니다.
     
@@ -21,14 +25,16 @@ async def get_recipe_recommendations(request: RecommendationRequest):
         RecommendationResponse: 추천 레시피 목록과 점수
     """
     try:
-        recommendation_service = RecommendationService()
         result = await recommendation_service.get_recommendations(request)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/by-ingredients")
-async def recommend_by_ingredients(request: dict):
+async def recommend_by_ingredients(
+    request: dict,
+    recommendation_service: RecommendationService = Depends(get_recommendation_service)
+):
     """
     재료 기반 레시피 추천 (간단한 형식)
     
@@ -51,7 +57,6 @@ async def recommend_by_ingredients(request: dict):
             limit=limit
         )
         
-        recommendation_service = RecommendationService()
         result = await recommendation_service.get_recommendations(recommendation_request)
         
         # 올바른 속성명 사용
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
+import json
 from ..models.schemas import (
     SemanticSearchRequest,
     SemanticSearchResponse,
@@ -38,11 +40,19 @@ except ImportError as e:
 from app.clients.opensearch_client import opensearch_client
 from app.clients.openai_client import openai_client
 from app.utils.score_normalizer import ScoreNormalizer
+from app.container import get_container
 
 router = APIRouter()
 
+def get_search_service(request: Request):
+    """앱 컨테이너에서 공용 검색 서비스 인스턴스를 주입"""
+    return get_container(request).get_service(EnhancedSearchService)
+
 @router.post("/semantic", response_model=SemanticSearchResponse)
-async def semantic_search(request: SemanticSearchRequest):
+async def semantic_search(
+    request: SemanticSearchRequest,
+    search_service=Depends(get_search_service)
+):
     """
     🎯 최종 완성된 엄격한 시맨틱 검색 API + 오타 교정
     
@@ -67,7 +77,6 @@ async def semantic_search(request: SemanticSearchRequest):
         query = request.query.strip()
         print(f"\n🎯 최종 완성된 시맨틱 검색 요청 (오타 교정 포함): '{query}' (서비스: {EnhancedSearchService.__name__})")
         
-        search_service = EnhancedSearchService()
         results = await search_service.semantic_search(
             query=query,
             search_type=request.search_type,
@@ -126,14 +135,63 @@ async def semantic_search(request: SemanticSearchRequest):
         print(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=error_detail)
 
+@router.post("/semantic/stream")
+async def semantic_search_stream(
+    request: SemanticSearchRequest,
+    search_service=Depends(get_search_service)
+):
+    """
+    🎯 단계별 스트리밍 시맨틱 검색 (NDJSON)
+    
+    /semantic과 같은 요청을 받아 한 줄에 하나씩 JSON 이벤트를 보냅니다.
+    각 이벤트는 SemanticSearchResponse 필드에 stage/final/corrected_query가 추가된 형태입니다.
+    
+    1. stage="text": 텍스트 검색 결과 (벡터 검색이 필요할 때 먼저 전송)
+    2. stage="final": 벡터/재료 검색까지 반영한 최종 결과 (/semantic 응답과 동일)
+    
+    오류 시 stage="error", detail 이벤트로 종료합니다.
+    """
+    if not request.query or not request.query.strip():
+        raise HTTPException(status_code=400, detail="검색어가 필요합니다")
+    
+    query = request.query.strip()
+    print(f"\n🎯 스트리밍 시맨틱 검색 요청: '{query}' (서비스: {EnhancedSearchService.__name__})")
+    
+    async def events():
+        try:
+            stream = getattr(search_service, "semantic_search_stream", None)
+            if stream is None:
+                # 단계별 검색을 지원하지 않는 서비스는 최종 결과만 전송
+                results = await search_service.semantic_search(
+                    query=query, search_type=request.search_type, limit=request.limit
+                )
+                event = {"stage": "final", "final": True, **results.model_dump()}
+                event["corrected_query"] = results.corrected_query or query
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+                return
+            
+            async for event in stream(query=query, search_type=request.search_type, limit=request.limit):
+                print(f"📤 스트리밍 {event['stage']}: {len(event['recipes'])}개 레시피, {event['processing_time']:.2f}초")
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            print(f"스트리밍 시맨틱 검색 오류: {e}")
+            yield json.dumps(
+                {"stage": "error", "final": True, "detail": f"스트리밍 시맨틱 검색 오류: {str(e)}"},
+                ensure_ascii=False
+            ) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
 @router.get("/test")
 async def test_search():
     """기본적인 OpenSearch 연결 테스트"""
     try:
         search_body = {"size": 5, "query": {"match_all": {}}}
         
-        recipe_response = await opensearch_client.search(index="recipes", body=search_body)
-        ingredient_response = await opensearch_client.search(index="ingredients", body=search_body)
+        recipe_response, ingredient_response = await opensearch_client.msearch([
+            ("recipes", search_body),
+            ("ingredients", search_body)
+        ])
         
         return {
             "status": "success",
@@ -244,7 +302,7 @@ async def search_ingredients(
         if query in synonyms:
             search_terms.extend(synonyms[query])
         
-        all_results = {}
+        searches = []
         for term in search_terms:
             search_body = {
                 "query": {
@@ -259,9 +317,12 @@ async def search_ingredients(
                 },
                 "size": limit
             }
-            
-            response = await opensearch_client.search(index="ingredients", body=search_body)
-            
+            searches.append(("ingredients", search_body))
+        
+        responses = await opensearch_client.msearch(searches)
+        
+        all_results = {}
+        for response in responses:
             for hit in response["hits"]["hits"]:
                 source = hit["_source"]
                 ingredient_id = source.get("ingredient_id", 0)
@@ -444,7 +505,7 @@ async def test_typo_correction():
         }
 
 @router.get("/test-semantic-queries")
-async def test_semantic_queries():
+async def test_semantic_queries(search_service=Depends(get_search_service)):
     """주요 시맨틱 검색 쿼리 테스트"""
     test_queries = [
         "피망 요리",
@@ -455,7 +516,6 @@ async def test_semantic_queries():
     ]
     
     results = {}
-    search_service = EnhancedSearchService()
     
     for query in test_queries:
         try:
@@ -523,13 +583,13 @@ async def debug_image_fields():
 async def debug_index(index_name: str):
     """특정 인덱스 디버그 정보 조회"""
     try:
-        exists = opensearch_client.client.indices.exists(index=index_name)
+        exists = await opensearch_client.async_client.indices.exists(index=index_name)
         if not exists:
             return {"error": f"인덱스 '{index_name}'가 존재하지 않습니다"}
         
-        mapping = opensearch_client.client.indices.get_mapping(index=index_name)
-        count = opensearch_client.client.count(index=index_name)
-        sample = opensearch_client.client.search(index=index_name, body={"size": 2, "query": {"match_all": {}}})
+        mapping = await opensearch_client.async_client.indices.get_mapping(index=index_name)
+        count = await opensearch_client.async_client.count(index=index_name)
+        sample = await opensearch_client.async_client.search(index=index_name, body={"size": 2, "query": {"match_all": {}}})
         
         return {
             "index": index_name,
@@ -546,7 +606,7 @@ async def debug_index(index_name: str):
 async def test_vector_search():
     """벡터 검색 테스트"""
     try:
-        sample_ingredient = opensearch_client.client.search(
+        sample_ingredient = await opensearch_client.async_client.search(
             index="ingredients",
             body={"size": 1, "query": {"exists": {"field": "embedding"}}, "_source": ["ingredient_id", "name", "embedding"]}
         )
@@ -1,6 +1,8 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
+from app.config.settings import get_settings
 from app.utils.korean_spell_checker import spell_checker
 
 router = APIRouter()
@@ -14,6 +16,15 @@ class SpellCheckResponse(BaseModel):
     is_corrected: bool
     suggestions: Optional[List[str]] = None
 
+class SpellSuggestion(BaseModel):
+    name: str
+    distance: int
+    similarity: float
+
+class SpellSuggestResponse(BaseModel):
+    original: str
+    suggestions: List[SpellSuggestion]
+
 @router.post("/spell-check", response_model=SpellCheckResponse)
 async def correct_spelling(request: SpellCheckRequest):
     """
@@ -60,36 +71,47 @@ async def correct_spelling(request: SpellCheckRequest):
 async def correct_spelling_batch(queries: List[str]):
     """
     여러 검색어 일괄 오타 교정
+    
+    - 중복 검색어는 한 번만 교정
+    - 서로 다른 검색어는 SPELL_BATCH_CONCURRENCY개까지 동시에 교정
     """
     try:
         if not queries:
             raise HTTPException(status_code=400, detail="검색어 목록이 필요합니다")
         
-        results = []
+        unique_queries = list(dict.fromkeys(query.strip() for query in queries if query and query.strip()))
+        semaphore = asyncio.Semaphore(max(1, get_settings().spell_batch_concurrency))
+        
+        async def correct(original: str) -> dict:
+            async with semaphore:
+                corrected = await spell_checker.correct_typo(original)
+            return {
+                "original": original,
+                "corrected": corrected,
+                "is_corrected": corrected != original,
+                "distance": spell_checker.jamo_distance(original, corrected),  # 자모 편집 거리
+                "suggestions": spell_checker.get_typo_suggestions(original)
+            }
         
+        corrections = dict(zip(unique_queries, await asyncio.gather(*(correct(q) for q in unique_queries))))
+        
+        results = []
         for query in queries:
             if query and query.strip():
-                original = query.strip()
-                corrected = await spell_checker.correct_typo(original)
-                suggestions = spell_checker.get_typo_suggestions(original)
-                
-                results.append({
-                    "original": original,
-                    "corrected": corrected,
-                    "is_corrected": corrected != original,
-                    "suggestions": suggestions
-                })
+                results.append(dict(corrections[query.strip()]))
             else:
                 results.append({
                     "original": query,
                     "corrected": query,
                     "is_corrected": False,
+                    "distance": 0,
                     "suggestions": []
                 })
         
         return {
             "results": results,
             "total": len(results),
+            "unique": len(unique_queries),
             "corrected_count": len([r for r in results if r["is_corrected"]])
         }
         
@@ -99,6 +121,34 @@ async def correct_spelling_batch(queries: List[str]):
         print(f"❌ 일괄 오타 교정 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"일괄 오타 교정 오류: {str(e)}")
 
+@router.get("/spell-suggest", response_model=SpellSuggestResponse)
+async def suggest_spelling(query: str, max_distance: Optional[int] = None, limit: int = 5):
+    """
+    유사 레시피명/재료명 추천 API ("혹시 이것을 찾으셨나요?")
+    
+    - 레시피명/재료명 BK-tree에서 자모 편집 거리 max_distance 이내 후보를 거리순으로 반환
+    - max_distance를 생략하면 단어 길이에 맞는 기본 허용 거리 사용
+    """
+    try:
+        if not query or not query.strip():
+            raise HTTPException(status_code=400, detail="검색어가 필요합니다")
+        if max_distance is not None and not 0 <= max_distance <= 4:
+            raise HTTPException(status_code=400, detail="max_distance는 0~4 사이여야 합니다")
+        
+        original_query = query.strip()
+        suggestions = spell_checker.suggest(original_query, max_distance=max_distance, limit=max(1, min(limit, 20)))
+        
+        return SpellSuggestResponse(
+            original=original_query,
+            suggestions=[SpellSuggestion(**suggestion) for suggestion in suggestions]
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ 추천 후보 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"추천 후보 조회 오류: {str(e)}")
+
 @router.get("/test-spell-check")
 async def test_spell_check():
     """오타 교정 기능 테스트"""
@@ -7,23 +7,131 @@ OpenAI API와의 통신을 담당합니다.
 
 from openai import AsyncOpenAI
 from app.config.settings import get_settings
-from typing import List
+from app.utils.embedding_cache import get_embedding_cache
+from app.clients.openai_rate_limiter import get_openai_rate_limiter
+from app.utils.vectors import Vector, decode_embedding
+from typing import List, Optional, Dict, Callable, Awaitable
 import logging
 import asyncio
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# text-embedding-3-small 기본 차원
+NATIVE_EMBEDDING_DIMENSION = 1536
+
+class EmbeddingBatcher:
+    """
+    동시에 들어온 임베딩 요청을 짧은 시간(max_wait) 모아 한 번의 embeddings.create로 처리합니다.
+    
+    - 대기 중인 텍스트가 max_batch_size개가 되면 즉시 전송
+    - 같은 텍스트는 한 번만 요청하고 결과를 모든 호출자에게 전달
+    - API 오류나 응답 개수 불일치는 해당 배치의 모든 호출자에게 그대로 전달
+    """
+    
+    def __init__(
+        self,
+        call_api: Callable[[List[str]], Awaitable[dict]],
+        parse_response: Callable[[dict], List[Vector]],
+        max_batch_size: int = 64,
+        max_wait: float = 0.005
+    ):
+        self._call_api = call_api
+        self._parse_response = parse_response
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        
+        # 통계
+        self.requests = 0
+        self.batches = 0
+        self.batched_texts = 0
+    
+    async def embed(self, text: str) -> Vector:
+        """텍스트 하나를 배치에 넣고 결과를 기다립니다."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(text, []).append(future)
+        self.requests += 1
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        
+        return await future
+    
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, batch: Dict[str, List[asyncio.Future]]):
+        texts = list(batch)
+        self.batches += 1
+        self.batched_texts += len(texts)
+        
+        try:
+            try:
+                response = await self._call_api(texts)
+                embeddings = self._parse_response(response)
+                if len(embeddings) != len(texts):
+                    raise ValueError(f"임베딩 응답 개수 불일치: 요청 {len(texts)}개, 응답 {len(embeddings)}개")
+            except Exception as e:
+                self._fail(batch, e)
+                return
+            
+            for text, embedding in zip(texts, embeddings):
+                for future in batch[text]:
+                    if not future.done():
+                        future.set_result(embedding)
+        finally:
+            # 취소 등 어떤 경로로 끝나더라도 기다리는 호출자가 영원히 멈추지 않도록 정리
+            self._fail(batch, RuntimeError("임베딩 배치가 결과 없이 종료됨"))
+    
+    def _fail(self, batch: Dict[str, List[asyncio.Future]], error: BaseException):
+        """아직 결과가 없는 모든 호출자에게 오류 전달"""
+        for futures in batch.values():
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+    
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_texts / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000
+        }
+
 class OpenAIClient:
-    def __init__(self):
+    def __init__(self, dimensions: Optional[int] = None, use_cache: bool = True):
+        """
+        Args:
+            dimensions: 임베딩 차원 (기본 Settings.vector_dimension)
+            use_cache: 디스크 임베딩 캐시 사용 여부 (EMBEDDING_CACHE_ENABLED=false면 항상 미사용)
+        """
         self.settings = get_settings()
         
         # httpx 클라이언트 호환성을 위한 설정
+        # 재시도는 공용 제한기(OpenAIRateLimiter)가 담당하므로 SDK 자체 재시도는 끔
         try:
             # 최신 방식으로 초기화 시도
             self.client = AsyncOpenAI(
                 api_key=self.settings.openai_api_key,
-                timeout=30.0
+                timeout=30.0,
+                max_retries=0
             )
         except TypeError:
             # 구버전 호환성을 위한 대안
@@ -31,15 +139,43 @@ class OpenAIClient:
             http_client = httpx.AsyncClient(timeout=30.0)
             self.client = AsyncOpenAI(
                 api_key=self.settings.openai_api_key,
-                http_client=http_client
+                http_client=http_client,
+                max_retries=0
             )
         
+        # 모든 OpenAI 요청이 공유하는 동시성/요청률 제한기
+        self.limiter = get_openai_rate_limiter()
+        
         # 업로드된 임베딩과 동일한 모델 사용
         self.model = "text-embedding-3-small"
-        self.max_retries = self.settings.vector_embedding_max_retries
-        self.request_delay = self.settings.vector_embedding_request_delay
+        # 축소 차원 모드 (text-embedding-3의 dimensions 파라미터, 기본 1536이면 전달하지 않음)
+        self.dimensions = dimensions or self.settings.vector_dimension
+        # 디스크 기반 임베딩 캐시 (같은 텍스트의 반복 임베딩 방지, 모델/차원별로 분리)
+        self.cache = None
+        if use_cache and self.settings.embedding_cache_enabled:
+            try:
+                self.cache = get_embedding_cache(
+                    self.settings.embedding_cache_dir,
+                    self.model,
+                    self.dimensions,
+                    self.settings.embedding_cache_refresh_interval
+                )
+            except Exception as e:
+                logger.warning(f"임베딩 캐시 초기화 실패, 캐시 없이 동작: {str(e)}")
+        
+        self._cache_flush_task: Optional[asyncio.Future] = None
+        
+        # 동시 요청 마이크로 배칭 (여러 호출자의 텍스트를 한 번의 API 호출로 묶음)
+        self.batcher = None
+        if self.settings.embedding_batching_enabled:
+            self.batcher = EmbeddingBatcher(
+                self._call_embedding_api,
+                self._parse_embedding_response,
+                max_batch_size=self.settings.embedding_batch_max_size,
+                max_wait=self.settings.embedding_batch_max_wait_ms / 1000.0
+            )
 
-    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+    async def get_embeddings(self, texts: List[str]) -> List[Vector]:
         """
         텍스트 목록의 임베딩을 생성합니다.
         
@@ -47,24 +183,83 @@ class OpenAIClient:
             texts: 임베딩을 생성할 텍스트 목록
             
         Returns:
-            List[List[float]]: 임베딩 목록 (1536차원)
+            List[Vector]: 정규화된 float32 임베딩 목록 (Settings.vector_dimension차원, 기본 1536)
         """
         try:
             # 단일 텍스트인 경우 리스트로 변환
             if isinstance(texts, str):
                 texts = [texts]
             
-            # API 호출
-            response = await self._call_embedding_api(texts)
+            # 캐시 조회
+            embeddings: List[Optional[Vector]] = (
+                self.cache.get_many(texts) if self.cache else [None] * len(texts)
+            )
             
-            # 응답 파싱
-            return self._parse_embedding_response(response)
+            # 미스가 있으면 다른 워커가 기록한 임베딩이 있는지 인덱스 꼬리를 확인 (간격 제한, 스레드에서)
+            if (
+                self.cache
+                and any(embedding is None for embedding in embeddings)
+                and self.cache.refresh_due()
+                and await asyncio.to_thread(self.cache.maybe_refresh)
+            ):
+                embeddings = self.cache.recheck_misses(texts, embeddings)
+            
+            # 캐시에 없는 텍스트만 API 호출 (중복 제거)
+            missing = list(dict.fromkeys(
+                text for text, embedding in zip(texts, embeddings) if embedding is None
+            ))
+            if missing:
+                if self.batcher and len(missing) < self.batcher.max_batch_size:
+                    # 다른 동시 요청과 묶어서 호출
+                    fetched = list(await asyncio.gather(
+                        *(self.batcher.embed(text) for text in missing)
+                    ))
+                else:
+                    # 이미 충분히 큰 목록은 바로 호출
+                    response = await self._call_embedding_api(missing)
+                    fetched = self._parse_embedding_response(response)
+                
+                if self.cache and self.cache.stage(missing, fetched):
+                    # 디스크 기록은 요청 경로 밖(스레드)에서
+                    self._schedule_cache_flush()
+                
+                fetched_by_text = dict(zip(missing, fetched))
+                embeddings = [
+                    embedding if embedding is not None else fetched_by_text[text]
+                    for text, embedding in zip(texts, embeddings)
+                ]
+            
+            return embeddings
             
         except Exception as e:
             logger.error(f"Error in get_embeddings: {str(e)}")
             raise
 
-    async def get_embedding(self, text: str) -> List[float]:
+    async def warm_cache(self, texts: List[str], batch_size: int = 256) -> dict:
+        """
+        텍스트 목록의 임베딩을 미리 만들어 캐시에 저장합니다. (이미 캐시된 텍스트는 건너뜀)
+        
+        Returns:
+            dict: total(중복 제거 후 개수), cached(이미 있던 개수), embedded(새로 만든 개수)
+        """
+        if not self.cache:
+            return {"enabled": False}
+        
+        unique = list(dict.fromkeys(text for text in texts if text and text.strip()))
+        await asyncio.to_thread(self.cache.refresh)
+        missing = self.cache.find_missing(unique)
+        
+        embedded = 0
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i:i + batch_size]
+            response = await self._call_embedding_api(batch)
+            await asyncio.to_thread(self.cache.put_many, batch, self._parse_embedding_response(response))
+            embedded += len(batch)
+            logger.info(f"임베딩 캐시 워밍: {embedded}/{len(missing)}")
+        
+        return {"total": len(unique), "cached": len(unique) - len(missing), "embedded": embedded}
+
+    async def get_embedding(self, text: str) -> Vector:
         """
         단일 텍스트의 임베딩을 생성합니다.
         
@@ -72,7 +267,7 @@ class OpenAIClient:
             text: 임베딩을 생성할 텍스트
             
         Returns:
-            List[float]: 임베딩 벡터 (1536차원)
+            Vector: 정규화된 float32 임베딩 벡터 (Settings.vector_dimension차원, 기본 1536)
         """
         embeddings = await self.get_embeddings([text])
         return embeddings[0]
@@ -81,28 +276,88 @@ class OpenAIClient:
         """
         OpenAI 임베딩 API를 호출합니다.
         """
-        for attempt in range(self.max_retries):
-            try:
-                response = await self.client.embeddings.create(
-                    model=self.model,
-                    input=texts
-                )
-                return response
-                
-            except Exception as e:
-                if attempt == self.max_retries - 1:
-                    raise
-                logger.warning(
-                    f"Retry {attempt + 1}/{self.max_retries} "
-                    f"after error: {str(e)}"
-                )
-                await asyncio.sleep(self.request_delay)
+        request_options = {}
+        if self.dimensions != NATIVE_EMBEDDING_DIMENSION:
+            request_options["dimensions"] = self.dimensions
+        
+        # 응답 헤더(x-ratelimit-*)를 제한기에 반영하기 위해 raw 응답으로 호출
+        # base64로 받아 파이썬 float 리스트 변환 없이 바로 float32 배열로 디코딩
+        return await self.limiter.call(
+            lambda: self.client.embeddings.with_raw_response.create(
+                model=self.model,
+                input=texts,
+                encoding_format="base64",
+                **request_options
+            ),
+            label="임베딩 API"
+        )
 
-    def _parse_embedding_response(self, response: dict) -> List[List[float]]:
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-3.5-turbo",
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ):
         """
-        임베딩 API 응답을 파싱합니다.
+        Chat Completions API를 공용 제한기를 거쳐 호출합니다.
+        
+        Returns:
+            ChatCompletion 응답 (response.choices[0].message.content)
+        """
+        request_options = {}
+        if max_tokens is not None:
+            request_options["max_tokens"] = max_tokens
+        
+        return await self.limiter.call(
+            lambda: self.client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                **request_options
+            ),
+            label="Chat API"
+        )
+
+    def _parse_embedding_response(self, response: dict) -> List[Vector]:
         """
-        return [data.embedding for data in response.data]
+        임베딩 API 응답을 파싱합니다. (base64 → 정규화된 float32 벡터)
+        """
+        return [decode_embedding(data.embedding) for data in response.data]
+
+    def _schedule_cache_flush(self):
+        """메모리에 쌓인 임베딩을 백그라운드 스레드에서 디스크에 기록 (이미 실행 중이면 그 작업이 이어서 처리)"""
+        if self._cache_flush_task is None or self._cache_flush_task.done():
+            self._cache_flush_task = asyncio.ensure_future(self._flush_cache())
+
+    async def _flush_cache(self):
+        try:
+            while self.cache.unflushed_count():
+                await asyncio.to_thread(self.cache.flush)
+        except Exception as e:
+            logger.warning(f"임베딩 캐시 기록 실패 (메모리 캐시로 계속 동작): {str(e)}")
+
+    async def aclose(self):
+        """남은 임베딩 캐시를 기록하고 AsyncOpenAI(httpx) 연결 풀 종료"""
+        if self._cache_flush_task is not None:
+            await self._cache_flush_task
+        await self.client.close()
+
+    def cache_stats(self) -> dict:
+        """임베딩 캐시 적중/미스 통계"""
+        if not self.cache:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
+
+    def rate_limiter_stats(self) -> dict:
+        """OpenAI 요청 제한기 지표 (동시 요청 수, 대기 시간, 429 횟수 등)"""
+        return self.limiter.stats()
+
+    def batcher_stats(self) -> dict:
+        """임베딩 마이크로 배칭 통계"""
+        if not self.batcher:
+            return {"enabled": False}
+        return {"enabled": True, **self.batcher.stats()}
 
 # 싱글톤 인스턴스
 openai_client = OpenAIClient()
\ No newline at end of file
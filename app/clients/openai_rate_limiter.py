@@ -0,0 +1,236 @@
+"""
+OpenAI 요청 제한기
+
+임베딩/채팅 등 모든 OpenAI 요청이 하나의 제한기를 거치도록 합니다.
+
+- 동시 요청 수 제한 (세마포어)
+- 분당 요청 수 토큰 버킷 (OPENAI_REQUESTS_PER_MINUTE)
+- 429/5xx/연결 오류 시 지수 백오프 + 지터로 재시도
+  (retry-after / retry-after-ms 헤더가 있으면 그 값을 우선 사용)
+- 응답의 x-ratelimit-remaining-requests가 0이면 x-ratelimit-reset-requests까지 전체 요청을 멈춤
+  → 한 요청이 429를 받으면 다른 요청도 같이 기다리므로 재시도 폭주를 막음
+"""
+
+import asyncio
+import logging
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+import openai
+
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 오류 (요청 과다, 서버 오류, 타임아웃, 연결 오류)
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+)
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """'1s', '6m0s', '20ms' 형식의 x-ratelimit-reset 값을 초 단위로 변환"""
+    if not value:
+        return None
+    matches = _DURATION_PATTERN.findall(value)
+    if not matches:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in matches)
+
+
+def retry_after_from_headers(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """retry-after-ms / retry-after 헤더에서 대기 시간(초) 추출"""
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+
+
+class OpenAIRateLimiter:
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_minute: float = 3000,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate = requests_per_minute / 60.0
+        self._capacity = max(1.0, self._rate)  # 최대 1초 분량까지 몰아서 허용
+        self._tokens = self._capacity
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+
+        # 지표
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.failures = 0
+        self.total_wait = 0.0
+        self.last_wait = 0.0
+
+    async def call(self, request: Callable[[], Awaitable[Any]], label: str = "OpenAI") -> Any:
+        """
+        제한기를 거쳐 요청을 실행합니다.
+
+        Args:
+            request: 매 시도마다 호출할 코루틴 팩토리.
+                     with_raw_response 응답(headers, parse())을 반환하면 헤더를 반영하고 parse() 결과를 돌려줌
+            label: 로그용 이름
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._acquire()
+            try:
+                response = await request()
+            except RETRYABLE_ERRORS as e:
+                headers = getattr(getattr(e, "response", None), "headers", None)
+                if isinstance(e, openai.RateLimitError):
+                    self.throttled += 1
+                if attempt == self.max_retries:
+                    self.failures += 1
+                    raise
+                delay = self._backoff_delay(attempt, headers)
+                if isinstance(e, openai.RateLimitError):
+                    # 다른 요청도 같이 멈춰서 재시도 폭주를 막음
+                    self._block_for(delay)
+                self.retries += 1
+                logger.warning(
+                    f"{label} 재시도 {attempt + 1}/{self.max_retries} ({delay:.2f}초 후): {type(e).__name__}: {str(e)}"
+                )
+            except Exception:
+                self.failures += 1
+                raise
+            else:
+                headers = getattr(response, "headers", None)
+                self._observe_headers(headers)
+                return response.parse() if hasattr(response, "parse") else response
+            finally:
+                self._release()
+
+            await asyncio.sleep(delay)
+
+    async def _acquire(self):
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                while True:
+                    now = time.monotonic()
+                    pause = self._blocked_until - now
+                    if pause > 0:
+                        await asyncio.sleep(pause)
+                        continue
+
+                    self._refill(now)
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        break
+                    await asyncio.sleep((1.0 - self._tokens) / self._rate)
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - start
+        self.total_wait += waited
+        self.last_wait = waited
+        self.in_flight += 1
+        self.requests += 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def _refill(self, now: float):
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+
+    def _backoff_delay(self, attempt: int, headers: Optional[Mapping[str, str]]) -> float:
+        """서버가 알려준 대기 시간을 우선, 없으면 지수 백오프 (full jitter)"""
+        retry_after = retry_after_from_headers(headers)
+        if retry_after is not None:
+            # 동시에 깨어나지 않도록 약간의 지터 추가
+            return min(self.backoff_max, retry_after) + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _block_for(self, seconds: float):
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def _observe_headers(self, headers: Optional[Mapping[str, str]]):
+        """남은 요청 수가 0이면 리셋 시각까지 새 요청을 멈춤"""
+        if not headers:
+            return
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        if remaining is None:
+            return
+        try:
+            if int(remaining) > 0:
+                return
+        except ValueError:
+            return
+        reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+        if reset:
+            self._block_for(min(reset, self.backoff_max))
+
+    def stats(self) -> Dict[str, Any]:
+        blocked = max(0.0, self._blocked_until - time.monotonic())
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "requests_per_minute": self.requests_per_minute,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "failures": self.failures,
+            "avg_wait_ms": round(self.total_wait / self.requests * 1000, 2) if self.requests else 0.0,
+            "last_wait_ms": round(self.last_wait * 1000, 2),
+            "blocked_for_ms": round(blocked * 1000, 2)
+        }
+
+
+_rate_limiter: Optional[OpenAIRateLimiter] = None
+
+
+def get_openai_rate_limiter() -> OpenAIRateLimiter:
+    """프로세스 전역 OpenAI 요청 제한기 (모든 OpenAIClient가 공유)"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        settings = get_settings()
+        _rate_limiter = OpenAIRateLimiter(
+            max_concurrency=settings.openai_max_concurrency,
+            requests_per_minute=settings.openai_requests_per_minute,
+            max_retries=settings.openai_max_retries,
+            backoff_base=settings.vector_embedding_request_delay,
+            backoff_max=settings.openai_backoff_max
+        )
+    return _rate_limiter
@@ -4,9 +4,9 @@ OpenSearch 클라이언트
 recipe-ai-project의 로컬 OpenSearch와 호환되도록 수정된 클라이언트입니다.
 """
 
-from opensearchpy import OpenSearch
+from opensearchpy import OpenSearch, AsyncOpenSearch
 from app.config.settings import get_settings
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import logging
 import os
 
@@ -34,24 +34,37 @@ class OpenSearchClient:
             verify_certs = True
             port = 443
         
-        self.client = OpenSearch(
+        connection_options = dict(
             hosts=[{'host': opensearch_host, 'port': port}],
             http_auth=auth,
             use_ssl=use_ssl,
             verify_certs=verify_certs,
-            timeout=30,  # int로 설정
+            timeout=self.settings.opensearch_timeout,  # int로 설정
             max_retries=3,
             retry_on_timeout=True
         )
         
-        # recipe-ai-project와 동일한 인덱스명 사용
-        self.recipes_index = "recipes"
-        self.ingredients_index = "ingredients"
+        # 동기 클라이언트: 스크립트/관리 작업용
+        self.client = OpenSearch(**connection_options)
+        
+        # 비동기 클라이언트: API 요청 경로용 (이벤트 루프를 막지 않음)
+        # aiohttp 커넥션 풀 크기를 늘려 동시 검색 요청이 I/O를 겹쳐서 처리하도록 함
+        self.async_client = AsyncOpenSearch(
+            maxsize=self.settings.opensearch_pool_maxsize,
+            **connection_options
+        )
+        
+        # recipe-ai-project와 동일한 인덱스명 사용 (축소 차원 인덱스 등은 RECIPES_INDEX/INGREDIENTS_INDEX로 지정)
+        self.recipes_index = self.settings.recipes_index
+        self.ingredients_index = self.settings.ingredients_index
         
         # 테스트용 인덱스 (없을 경우)
         self.recipes_index_fallback = "recipes_index" 
         self.ingredients_index_fallback = "ingredients_index"
         
+        # 인프로세스 벡터 인덱스 (VECTOR_BACKEND=local일 때 load_local_vector_indexes()로 로드)
+        self.local_indexes: Dict[str, Any] = {}
+        
         logger.info(f"OpenSearch 클라이언트 초기화: {opensearch_host}:{port}")
 
     async def test_connection(self) -> bool:
@@ -59,7 +72,7 @@ class OpenSearchClient:
         OpenSearch 연결 테스트
         """
         try:
-            info = self.client.info()
+            info = await self.async_client.info()
             logger.info(f"OpenSearch 연결 성공: {info['version']['number']}")
             return True
         except Exception as e:
@@ -68,51 +81,37 @@ class OpenSearchClient:
 
     async def search_recipes_by_ingredients(
         self,
-        ingredient_embeddings: List[List[float]],
+        ingredient_embeddings: List[Sequence[float]],
         limit: int = 10
     ) -> List[Dict[str, Any]]:
         """
         재료 임베딩을 기반으로 레시피를 검색합니다.
-        recipe-ai-project와 호환되는 script_score 방식으로 수정
+        Settings.vector_search_mode에 따라 script_score(전수 스캔) 또는 knn(HNSW) 쿼리를 사용합니다.
         """
         try:
-            # 여러 재료의 평균 임베딩 계산
-            if len(ingredient_embeddings) > 1:
-                import numpy as np
-                combined_embedding = np.mean(ingredient_embeddings, axis=0)
-                # 벡터 정규화 (recipe-ai-project와 동일)
-                normalized_vector = combined_embedding / np.linalg.norm(combined_embedding)
-            else:
-                import numpy as np
-                normalized_vector = np.array(ingredient_embeddings[0])
-                normalized_vector = normalized_vector / np.linalg.norm(normalized_vector)
+            # app.utils 패키지 초기화가 이 모듈을 import하므로 지연 import
+            from app.utils.vectors import compose_query_vector
+            
+            # 여러 재료의 평균 임베딩 계산 + 벡터 정규화 (recipe-ai-project와 동일)
+            normalized_vector = compose_query_vector(ingredient_embeddings)
 
-            # script_score 쿼리 사용 (recipe-ai-project와 동일)
-            query = {
-                "size": limit,
-                "query": {
-                    "script_score": {
-                        "query": {"match_all": {}},
-                        "script": {
-                            "source": "cosineSimilarity(params.query_vector, doc['embedding']) + 1.0",
-                            "params": {"query_vector": list(map(float, normalized_vector))}
-                        }
-                    }
-                },
-                "_source": {
-                    "excludes": ["embedding"]  # 응답에서 임베딩 제외 (크기 절약)
-                }
-            }
+            # 로컬 스냅샷 인덱스가 있으면 네트워크 없이 NumPy로 top-k 계산
+            local_index = self.local_indexes.get(self.recipes_index)
+            if local_index is not None:
+                return local_index.search(normalized_vector, limit)
+
+            query = self._build_vector_query(normalized_vector, limit)
             
-            response = self.client.search(
+            response = await self.async_client.search(
                 index=self.recipes_index,
                 body=query
             )
             
-            return self._parse_search_results(response)
+            return self._parse_vector_results(response)
             
         except Exception as e:
-            logger.error(f"Error in search_recipes_by_ingredients (script_score): {str(e)}")
+            logger.error(f"Error in search_recipes_by_ingredients ({self.settings.vector_search_mode}): {str(e)}")
+            self._record_error("레시피 벡터 검색", e)
             # 백업: 텍스트 검색으로 대체
             logger.info("텍스트 검색으로 대체 시도...")
             return await self.search_recipes_by_text("재료", limit)
@@ -141,7 +140,7 @@ class OpenSearchClient:
                 }
             }
             
-            response = self.client.search(
+            response = await self.async_client.search(
                 index=self.ingredients_index,
                 body=query
             )
@@ -154,43 +153,34 @@ class OpenSearchClient:
 
     async def vector_search_ingredients(
         self,
-        vector: List[float],
+        vector: Sequence[float],
         limit: int = 10
     ) -> List[Dict[str, Any]]:
         """
-        재료에 대한 벡터 검색 수행 - script_score 쿼리 사용
+        재료에 대한 벡터 검색 수행 - script_score 또는 knn 쿼리 사용
         """
         try:
-            import numpy as np
-            # 벡터 정규화 (recipe-ai-project와 동일)
-            normalized_vector = np.array(vector) / np.linalg.norm(vector)
+            from app.utils.vectors import normalize
             
-            # script_score 쿼리 사용 (recipe-ai-project와 동일)
-            query = {
-                "size": limit,
-                "query": {
-                    "script_score": {
-                        "query": {"match_all": {}},
-                        "script": {
-                            "source": "cosineSimilarity(params.query_vector, doc['embedding']) + 1.0",
-                            "params": {"query_vector": list(map(float, normalized_vector))}
-                        }
-                    }
-                },
-                "_source": {
-                    "excludes": ["embedding"]
-                }
-            }
+            # 벡터 정규화 (recipe-ai-project와 동일, 이미 정규화된 벡터는 그대로 사용)
+            normalized_vector = normalize(vector)
+            
+            local_index = self.local_indexes.get(self.ingredients_index)
+            if local_index is not None:
+                return local_index.search(normalized_vector, limit)
+            
+            query = self._build_vector_query(normalized_vector, limit)
             
-            response = self.client.search(
+            response = await self.async_client.search(
                 index=self.ingredients_index,
                 body=query
             )
             
-            return self._parse_search_results(response)
+            return self._parse_vector_results(response)
             
         except Exception as e:
-            logger.error(f"Error in vector_search_ingredients (script_score): {str(e)}")
+            logger.error(f"Error in vector_search_ingredients ({self.settings.vector_search_mode}): {str(e)}")
+            self._record_error("재료 벡터 검색", e)
             # 백업: 텍스트 검색으로 대체
             return await self.search_ingredients_by_text("재료", limit)
 
@@ -218,7 +208,7 @@ class OpenSearchClient:
                 }
             }
             
-            response = self.client.search(
+            response = await self.async_client.search(
                 index=self.recipes_index,
                 body=query
             )
@@ -250,7 +240,7 @@ class OpenSearchClient:
                 }
             }
             
-            response = self.client.search(
+            response = await self.async_client.search(
                 index=self.recipes_index,
                 body=query
             )
@@ -266,7 +256,7 @@ class OpenSearchClient:
         레시피 ID로 특정 레시피를 조회합니다.
         """
         try:
-            response = self.client.get(
+            response = await self.async_client.get(
                 index=self.recipes_index,
                 id=recipe_id,
                 _source_excludes=["embedding"]
@@ -281,7 +271,7 @@ class OpenSearchClient:
         재료 ID로 특정 재료를 조회합니다.
         """
         try:
-            response = self.client.get(
+            response = await self.async_client.get(
                 index=self.ingredients_index,
                 id=str(ingredient_id),
                 _source_excludes=["embedding"]
@@ -296,8 +286,8 @@ class OpenSearchClient:
         인덱스 통계 정보 조회
         """
         try:
-            recipe_count = self.client.count(index=self.recipes_index)["count"]
-            ingredient_count = self.client.count(index=self.ingredients_index)["count"]
+            recipe_count = (await self.async_client.count(index=self.recipes_index))["count"]
+            ingredient_count = (await self.async_client.count(index=self.ingredients_index))["count"]
             
             return {
                 "recipes_count": recipe_count,
@@ -313,6 +303,233 @@ class OpenSearchClient:
                 "error": str(e)
             }
 
+    async def get_index_fingerprint(self) -> Tuple:
+        """
+        레시피/재료 인덱스의 변경 여부를 판단하기 위한 지문
+        (primary 샤드 기준 문서 수, 삭제 문서 수, 색인 횟수)
+        """
+        stats = await self.async_client.indices.stats(
+            index=f"{self.recipes_index},{self.ingredients_index}",
+            metric="docs,indexing"
+        )
+        fingerprint = []
+        for index_name, index_stats in sorted(stats.get("indices", {}).items()):
+            primaries = index_stats.get("primaries", {})
+            fingerprint.append((
+                index_name,
+                primaries.get("docs", {}).get("count", 0),
+                primaries.get("docs", {}).get("deleted", 0),
+                primaries.get("indexing", {}).get("index_total", 0)
+            ))
+        return tuple(fingerprint)
+
+    # search_after 정렬에 쓸 수 있는 필드 타입 (text는 fielddata가 없으면 정렬 불가)
+    SORTABLE_FIELD_TYPES = {
+        "keyword", "long", "integer", "short", "byte", "unsigned_long",
+        "double", "float", "half_float", "scaled_float", "date", "date_nanos", "boolean"
+    }
+
+    @classmethod
+    def sortable_field(cls, properties: Dict[str, Any], field: str) -> Optional[str]:
+        """
+        매핑(properties)에서 field를 정렬할 때 쓸 필드명
+        
+        keyword/숫자/날짜 필드면 그대로, text 필드에 keyword 하위 필드가 있으면 "field.keyword",
+        정렬할 수 없거나 매핑에 없으면 None
+        """
+        mapping = properties.get(field)
+        if not mapping:
+            return None
+        if mapping.get("type") in cls.SORTABLE_FIELD_TYPES:
+            return field
+        for sub_name, sub_mapping in mapping.get("fields", {}).items():
+            if sub_mapping.get("type") in cls.SORTABLE_FIELD_TYPES:
+                return f"{field}.{sub_name}"
+        return None
+
+    async def fetch_field_values(
+        self,
+        index: str,
+        field: str,
+        sort_field: str,
+        batch_size: int = 1000
+    ) -> List[str]:
+        """
+        인덱스 전체 문서의 field 값을 search_after 페이지 단위로 모두 가져옵니다.
+        (오타 교정 사전 등 이름 목록 구축용, sort_field는 문서마다 고유한 필드)
+        sort_field가 text면 매핑의 keyword 하위 필드로 정렬하고, 정렬할 수 없으면 ValueError
+        """
+        mapping = await self.async_client.indices.get_mapping(index=index)
+        properties = next(iter(mapping.values()))["mappings"].get("properties", {})
+        resolved_sort_field = self.sortable_field(properties, sort_field)
+        if resolved_sort_field is None:
+            raise ValueError(f"{index}.{sort_field}는 정렬할 수 없는 필드입니다 (keyword/숫자 필드 필요)")
+        
+        values = []
+        search_after = None
+        while True:
+            body = {
+                "size": batch_size,
+                "query": {"match_all": {}},
+                "sort": [{resolved_sort_field: "asc"}],
+                "_source": [field]
+            }
+            if search_after is not None:
+                body["search_after"] = search_after
+            
+            response = await self.async_client.search(index=index, body=body)
+            hits = response["hits"]["hits"]
+            for hit in hits:
+                value = hit["_source"].get(field)
+                if value:
+                    values.append(value)
+            
+            if len(hits) < batch_size:
+                return values
+            search_after = hits[-1]["sort"]
+
+    def load_local_vector_indexes(self) -> Dict[str, Any]:
+        """
+        VECTOR_BACKEND=local이면 스냅샷에서 레시피/재료 벡터 인덱스를 로드합니다.
+        스냅샷이 없는 인덱스는 기존처럼 OpenSearch 벡터 검색을 사용합니다.
+        """
+        self.local_indexes = {}
+        if self.settings.vector_backend != "local":
+            return {}
+        
+        # app.utils 패키지가 이 모듈을 import하므로 순환 import를 피하기 위해 지연 import
+        from app.utils.vector_snapshot import load_local_vector_index
+        
+        for index_name in [self.recipes_index, self.ingredients_index]:
+            local_index = load_local_vector_index(self.settings.vector_snapshot_dir, index_name)
+            if local_index is None:
+                continue
+            if local_index.dimension != self.settings.vector_dimension:
+                logger.warning(
+                    f"로컬 벡터 스냅샷 차원 불일치로 사용 안 함: {index_name} "
+                    f"(스냅샷 {local_index.dimension}, 설정 {self.settings.vector_dimension})"
+                )
+                continue
+            self.local_indexes[index_name] = local_index
+        return self.local_vector_stats()
+
+    def local_vector_stats(self) -> Dict[str, Any]:
+        """로드된 로컬 벡터 인덱스 정보"""
+        return {name: index.stats() for name, index in self.local_indexes.items()}
+
+    def _build_vector_query(self, normalized_vector, limit: int) -> Dict[str, Any]:
+        """
+        벡터 검색 쿼리 body를 생성합니다.
+        
+        - script_score: match_all 전수 스캔 (recipe-ai-project와 동일, 정확한 코사인 유사도)
+        - knn: HNSW 근사 검색 (knn_vector 매핑 필요, scripts/create_knn_index.py 참고)
+        
+        두 모드의 원시 점수 스케일은 다릅니다.
+        - script_score: 1 + cos (0~2)
+        - knn(cosinesimil): nmslib/faiss는 1 / (2 - cos), lucene은 (1 + cos) / 2
+        knn 결과는 _parse_vector_results에서 1 + cos로 되돌리므로 호출하는 쪽은 항상 1 + cos 점수를 받습니다.
+        (ScoreNormalizer.normalize_vector_score와 하이브리드 가중치가 이 스케일 기준)
+        """
+        from app.utils.vectors import vector_to_json
+        
+        query_vector = vector_to_json(normalized_vector)
+        
+        if self.settings.vector_search_mode == "knn":
+            query = {
+                "knn": {
+                    "embedding": {
+                        "vector": query_vector,
+                        "k": limit
+                    }
+                }
+            }
+        else:
+            # script_score 쿼리 사용 (recipe-ai-project와 동일)
+            query = {
+                "script_score": {
+                    "query": {"match_all": {}},
+                    "script": {
+                        "source": "cosineSimilarity(params.query_vector, doc['embedding']) + 1.0",
+                        "params": {"query_vector": query_vector}
+                    }
+                }
+            }
+        
+        return {
+            "size": limit,
+            "query": query,
+            "_source": {
+                "excludes": ["embedding"]  # 응답에서 임베딩 제외 (크기 절약)
+            }
+        }
+
+    def build_knn_index_body(
+        self,
+        source_properties: Dict[str, Any] = None,
+        dimension: int = None
+    ) -> Dict[str, Any]:
+        """
+        HNSW k-NN 인덱스 생성용 settings/mappings body를 생성합니다.
+        
+        Args:
+            source_properties: 기존 인덱스의 mappings.properties (embedding 외 필드를 그대로 복사)
+            dimension: 벡터 차원 (기본값: Settings.vector_dimension)
+        """
+        properties = dict(source_properties or {})
+        properties["embedding"] = {
+            "type": "knn_vector",
+            "dimension": dimension or self.settings.vector_dimension,
+            "method": {
+                "name": "hnsw",
+                "space_type": self.settings.knn_space_type,
+                "engine": self.settings.knn_engine,
+                "parameters": {
+                    "m": self.settings.knn_m,
+                    "ef_construction": self.settings.knn_ef_construction
+                }
+            }
+        }
+        
+        return {
+            "settings": {
+                "index": {
+                    "knn": True,
+                    "knn.algo_param.ef_search": self.settings.knn_ef_search
+                }
+            },
+            "mappings": {
+                "properties": properties
+            }
+        }
+
+    def _record_error(self, label: str, error: Any):
+        """빈 결과로 대체한 오류를 진행 중인 검색에 기록 (결과 캐시가 장애 결과를 저장하지 않도록)"""
+        # app.utils 패키지 초기화가 이 모듈을 import하므로 지연 import
+        from app.utils.concurrency import record_error
+        record_error(label, error)
+
+    def _parse_vector_results(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """벡터 검색 결과 파싱 (knn 모드면 점수를 script_score와 같은 1 + cos 스케일로 변환)"""
+        results = self._parse_search_results(response)
+        if self.settings.vector_search_mode == "knn":
+            for result in results:
+                result["score"] = self.knn_score_to_cosine_score(result["score"])
+        return results
+
+    def knn_score_to_cosine_score(self, score: float) -> float:
+        """
+        knn(cosinesimil) 점수 → 1 + cos
+        
+        - nmslib/faiss: score = 1 / (2 - cos) → cos = 2 - 1 / score
+        - lucene: score = (1 + cos) / 2 → 1 + cos = 2 * score
+        """
+        if self.settings.knn_engine == "lucene":
+            return 2.0 * score
+        if score <= 0:
+            return 0.0
+        cos = 2.0 - 1.0 / score
+        return max(0.0, min(2.0, 1.0 + cos))
+
     def _parse_search_results(
         self,
         response: Dict[str, Any]
@@ -334,38 +551,134 @@ class OpenSearchClient:
         일반적인 OpenSearch 검색 메서드 - 개선된 오류 처리
         """
         try:
-            # body에서 _source 필드 검증 및 수정
-            if "_source" in body:
-                # _source가 dict인 경우
-                if isinstance(body["_source"], dict):
-                    # excludes 또는 includes만 허용
-                    if "excludes" not in body["_source"] and "includes" not in body["_source"]:
-                        # 잘못된 _source 구조면 기본값으로 설정
-                        body["_source"] = {"excludes": ["embedding"]}
-                # _source가 list인 경우는 유지
-                elif not isinstance(body["_source"], list):
-                    # 잘못된 타입이면 기본값으로 설정
-                    body["_source"] = {"excludes": ["embedding"]}
+            self._sanitize_source(body)
             
             # OpenSearch 검색 실행
-            response = self.client.search(index=index, body=body)
+            response = await self.async_client.search(index=index, body=body)
             return response
             
         except Exception as e:
             logger.error(f"OpenSearch 검색 오류 (인덱스: {index}): {str(e)}")
             logger.error(f"검색 쿼리: {body}")
+            self._record_error(f"OpenSearch 검색 ({index})", e)
             
             # 빈 결과 반환
-            return {
-                "hits": {
-                    "hits": [],
-                    "total": {"value": 0}
-                }
+            return self._empty_response()
+
+    async def msearch(self, searches: List[Tuple[str, dict]]) -> List[Dict[str, Any]]:
+        """
+        여러 검색을 _msearch 한 번의 왕복으로 실행합니다.
+        
+        Args:
+            searches: (인덱스, 검색 body) 튜플 목록
+            
+        Returns:
+            입력 순서와 동일한 검색 응답 목록 (실패한 항목은 빈 결과)
+        """
+        if not searches:
+            return []
+        
+        lines = []
+        for index, body in searches:
+            self._sanitize_source(body)
+            lines.append({"index": index})
+            lines.append(body)
+        
+        try:
+            response = await self.async_client.msearch(body=lines)
+        except Exception as e:
+            logger.error(f"OpenSearch 멀티 검색 오류 ({len(searches)}건): {str(e)}")
+            self._record_error("OpenSearch 멀티 검색", e)
+            return [self._empty_response() for _ in searches]
+        
+        results = []
+        for (index, body), item in zip(searches, response.get("responses", [])):
+            if "error" in item:
+                logger.error(f"OpenSearch 멀티 검색 항목 오류 (인덱스: {index}): {item['error']}")
+                logger.error(f"검색 쿼리: {body}")
+                self._record_error(f"OpenSearch 멀티 검색 ({index})", item["error"])
+                results.append(self._empty_response())
+            else:
+                results.append(item)
+        
+        # 응답 개수가 모자라면 빈 결과로 채움
+        if len(results) < len(searches):
+            self._record_error("OpenSearch 멀티 검색", f"응답 {len(results)}/{len(searches)}건")
+        while len(results) < len(searches):
+            results.append(self._empty_response())
+        
+        return results
+
+    async def bulk(
+        self,
+        index: str,
+        documents: List[Tuple[str, dict]],
+        refresh: bool = False
+    ) -> List[Tuple[str, dict, Dict[str, Any]]]:
+        """
+        여러 문서를 _bulk API 한 번으로 색인합니다.
+        
+        Args:
+            index: 대상 인덱스
+            documents: (문서 ID, 문서 본문) 목록
+            refresh: 완료 후 바로 검색 가능하도록 refresh 할지 여부
+            
+        Returns:
+            실패한 항목의 (문서 ID, 문서 본문, 오류 정보) 목록 (모두 성공하면 빈 목록)
+            요청 자체가 실패하면 예외를 그대로 전달합니다.
+        """
+        if not documents:
+            return []
+        
+        lines = []
+        for doc_id, document in documents:
+            lines.append({"index": {"_index": index, "_id": doc_id}})
+            lines.append(document)
+        
+        response = await self.async_client.bulk(body=lines, refresh=refresh)
+        if not response.get("errors"):
+            return []
+        
+        failures = []
+        for (doc_id, document), item in zip(documents, response.get("items", [])):
+            result = item.get("index", {})
+            if result.get("status", 200) >= 300:
+                failures.append((doc_id, document, {
+                    "status": result.get("status"),
+                    "error": result.get("error")
+                }))
+        return failures
+
+    def _sanitize_source(self, body: dict):
+        """
+        body의 _source 필드를 검증하고 잘못된 구조면 기본값으로 교체합니다.
+        """
+        if "_source" in body:
+            # _source가 dict인 경우
+            if isinstance(body["_source"], dict):
+                # excludes 또는 includes만 허용
+                if "excludes" not in body["_source"] and "includes" not in body["_source"]:
+                    # 잘못된 _source 구조면 기본값으로 설정
+                    body["_source"] = {"excludes": ["embedding"]}
+            # _source가 list인 경우는 유지
+            elif not isinstance(body["_source"], list):
+                # 잘못된 타입이면 기본값으로 설정
+                body["_source"] = {"excludes": ["embedding"]}
+
+    def _empty_response(self) -> Dict[str, Any]:
+        """
+        검색 실패 시 사용할 빈 검색 응답
+        """
+        return {
+            "hits": {
+                "hits": [],
+                "total": {"value": 0}
             }
+        }
 
     def close(self):
         """
-        OpenSearch 클라이언트 연결을 종료합니다.
+        OpenSearch 동기 클라이언트 연결을 종료합니다.
         """
         try:
             if hasattr(self.client, 'close'):
@@ -374,5 +687,16 @@ class OpenSearchClient:
         except Exception as e:
             logger.error(f"OpenSearch 클라이언트 종료 중 오류: {str(e)}")
 
+    async def aclose(self):
+        """
+        비동기 커넥션 풀과 동기 클라이언트를 모두 종료합니다.
+        """
+        try:
+            await self.async_client.close()
+            logger.info("OpenSearch 비동기 클라이언트 연결 종료")
+        except Exception as e:
+            logger.error(f"OpenSearch 비동기 클라이언트 종료 중 오류: {str(e)}")
+        self.close()
+
 # 싱글톤 인스턴스
 opensearch_client = OpenSearchClient()
\ No newline at end of file
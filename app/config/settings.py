@@ -14,6 +14,8 @@ class Settings(BaseSettings):
     opensearch_username: str = os.getenv("OPENSEARCH_USERNAME", "")
     opensearch_password: str = os.getenv("OPENSEARCH_PASSWORD", "")
     opensearch_use_ssl: bool = os.getenv("OPENSEARCH_USE_SSL", "false").lower() == "true"
+    opensearch_timeout: int = int(os.getenv("OPENSEARCH_TIMEOUT", "30"))
+    opensearch_pool_maxsize: int = int(os.getenv("OPENSEARCH_POOL_MAXSIZE", "25"))  # 비동기 커넥션 풀 크기
     
     # OpenAI 설정
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
@@ -35,13 +37,88 @@ class Settings(BaseSettings):
     environment: str = os.getenv("ENVIRONMENT", "production")
     
     # 벡터 임베딩 설정 (recipe-ai-project와 일치)
-    vector_dimension: int = 1536  # OpenAI text-embedding-3-small
+    # OpenAI text-embedding-3-small 기본 1536차원, EMBEDDING_DIMENSIONS로 축소 가능 (예: 256/512)
+    # 축소 시 같은 차원의 인덱스가 필요 (scripts/create_knn_index.py --dimension)
+    vector_dimension: int = int(os.getenv("EMBEDDING_DIMENSIONS", "1536"))
     vector_embedding_max_retries: int = 3
-    vector_embedding_request_delay: float = 0.5
+    vector_embedding_request_delay: float = 0.5  # OpenAI 재시도 지수 백오프 기본 간격
+    
+    # OpenAI 요청 제한 (임베딩/채팅 전체 공유)
+    openai_max_concurrency: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+    openai_requests_per_minute: float = float(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "3000"))
+    openai_max_retries: int = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+    openai_backoff_max: float = float(os.getenv("OPENAI_BACKOFF_MAX", "20"))
+    
+    # OpenAI 관련성 재평가 (배치 크기, 동시 배치 수, 전체 마감 시간(초) - 마감 후 미평가 후보는 원래 점수 유지)
+    relevance_scoring_batch_size: int = int(os.getenv("RELEVANCE_SCORING_BATCH_SIZE", "5"))
+    relevance_scoring_concurrency: int = int(os.getenv("RELEVANCE_SCORING_CONCURRENCY", "4"))
+    relevance_scoring_timeout: float = float(os.getenv("RELEVANCE_SCORING_TIMEOUT", "8"))
+    
+    # 재정렬 모드: "llm" (전부 LLM, 기본값), "hybrid" (로컬 재정렬 + 애매한 후보만 LLM), "local" (LLM 없음)
+    rerank_mode: str = os.getenv("RERANK_MODE", "llm")
+    # hybrid 모드에서 LLM으로 보낼 로컬 점수 범위 (통과 기준 ± margin)
+    rerank_uncertainty_margin: float = float(os.getenv("RERANK_UNCERTAINTY_MARGIN", "15"))
+    
+    # LLM 관련성 판단 캐시 ((검색어, 레시피 ID, 프롬프트 버전) → 점수, 디스크에 JSON으로 보관)
+    relevance_cache_enabled: bool = os.getenv("RELEVANCE_CACHE_ENABLED", "true").lower() == "true"
+    relevance_cache_path: str = os.getenv("RELEVANCE_CACHE_PATH", "data/relevance_cache.json")
+    relevance_cache_max_entries: int = int(os.getenv("RELEVANCE_CACHE_MAX_ENTRIES", "20000"))
+    relevance_cache_ttl: float = float(os.getenv("RELEVANCE_CACHE_TTL", "604800"))  # 7일
+    
+    # 임베딩 캐시 설정 (디스크 기반, 워커 간 공유)
+    embedding_cache_enabled: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    embedding_cache_dir: str = os.getenv("EMBEDDING_CACHE_DIR", "data/embedding_cache")
+    # 캐시 미스 시 다른 워커가 기록한 임베딩을 다시 확인하는 최소 간격 (초)
+    embedding_cache_refresh_interval: float = float(os.getenv("EMBEDDING_CACHE_REFRESH_INTERVAL", "1.0"))
+    # 서버 시작 시 동의어 사전의 모든 재료 임베딩을 백그라운드로 미리 캐시
+    embedding_warm_on_startup: bool = os.getenv("EMBEDDING_WARM_ON_STARTUP", "false").lower() == "true"
+    
+    # 임베딩 마이크로 배칭 설정 (동시 요청을 모아 한 번의 API 호출로 처리)
+    embedding_batching_enabled: bool = os.getenv("EMBEDDING_BATCHING_ENABLED", "true").lower() == "true"
+    embedding_batch_max_size: int = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64"))
+    embedding_batch_max_wait_ms: float = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+    
+    # 벡터 검색 모드: "script_score" (정확한 전수 스캔) 또는 "knn" (HNSW 근사 검색)
+    vector_search_mode: str = os.getenv("VECTOR_SEARCH_MODE", "script_score")
+    
+    # HNSW k-NN 인덱스 설정 (scripts/create_knn_index.py 및 knn 모드에서 사용)
+    knn_engine: str = os.getenv("KNN_ENGINE", "nmslib")
+    # knn 원시 점수는 1 / (2 - cos) (lucene은 (1 + cos) / 2) → OpenSearchClient가 script_score와 같은 1 + cos로 변환
+    knn_space_type: str = "cosinesimil"
+    knn_m: int = int(os.getenv("KNN_M", "16"))
+    knn_ef_construction: int = int(os.getenv("KNN_EF_CONSTRUCTION", "256"))
+    knn_ef_search: int = int(os.getenv("KNN_EF_SEARCH", "100"))
+    
+    # 벡터 검색 백엔드: "opensearch" (네트워크 쿼리) 또는 "local" (스냅샷 기반 인프로세스 NumPy 검색)
+    vector_backend: str = os.getenv("VECTOR_BACKEND", "opensearch")
+    vector_snapshot_dir: str = os.getenv("VECTOR_SNAPSHOT_DIR", "data/vector_snapshot")
+    
+    # 검색 브랜치(레시피/재료) 동시 실행 시 브랜치별 제한 시간(초)
+    search_branch_timeout: float = float(os.getenv("SEARCH_BRANCH_TIMEOUT", "10"))
+    # 텍스트 검색과 동시에 벡터 검색을 미리 시작 (텍스트 결과가 충분하면 취소)
+    # 모든 요청이 임베딩 호출 비용을 내게 되므로 기본은 끔
+    speculative_vector_search: bool = os.getenv("SPECULATIVE_VECTOR_SEARCH", "false").lower() == "true"
+    
+    # 로컬 오타 교정 색인 (레시피/재료명 자모 SymSpell, 갱신 주기(초), 최대 자모 편집 거리)
+    spell_index_enabled: bool = os.getenv("SPELL_INDEX_ENABLED", "true").lower() == "true"
+    spell_index_refresh_interval: float = float(os.getenv("SPELL_INDEX_REFRESH_INTERVAL", "600"))
+    spell_index_max_distance: int = int(os.getenv("SPELL_INDEX_MAX_DISTANCE", "2"))
+    
+    # 오타 교정 결과 LRU 캐시 크기 ("교정 불필요" 결과 포함), 일괄 교정 동시 실행 수
+    spell_correction_cache_size: int = int(os.getenv("SPELL_CORRECTION_CACHE_SIZE", "5000"))
+    spell_batch_concurrency: int = int(os.getenv("SPELL_BATCH_CONCURRENCY", "8"))
+    
+    # 시맨틱 검색 결과 캐시 (LRU + TTL, 인덱스 변경 시 무효화)
+    search_cache_enabled: bool = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+    search_cache_max_entries: int = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1000"))
+    search_cache_ttl: float = float(os.getenv("SEARCH_CACHE_TTL", "300"))
+    search_cache_stale_ttl: float = float(os.getenv("SEARCH_CACHE_STALE_TTL", "600"))
+    search_cache_negative_ttl: float = float(os.getenv("SEARCH_CACHE_NEGATIVE_TTL", "30"))
+    search_cache_fingerprint_interval: float = float(os.getenv("SEARCH_CACHE_FINGERPRINT_INTERVAL", "30"))
     
     # 인덱스 설정 (recipe-ai-project와 일치)
-    recipes_index: str = "recipes"
-    ingredients_index: str = "ingredients"
+    recipes_index: str = os.getenv("RECIPES_INDEX", "recipes")
+    ingredients_index: str = os.getenv("INGREDIENTS_INDEX", "ingredients")
     
     # CORS 설정
     allowed_origins: list = ["*"]  # 개발용, 운영환경에서는 특정 도메인으로 제한
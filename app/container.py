@@ -0,0 +1,79 @@
+"""
+애플리케이션 범위 의존성 컨테이너
+
+OpenSearch/OpenAI 클라이언트와 서비스 인스턴스를 서버 시작 시 한 번만 만들어
+모든 요청이 같은 연결 풀을 공유하도록 합니다.
+main.py의 lifespan에서 생성/종료하고, 라우터는 FastAPI Depends로 주입받습니다.
+"""
+
+import logging
+from typing import Any, Dict, Type, TypeVar
+
+from fastapi import Request
+
+from app.clients.opensearch_client import OpenSearchClient, opensearch_client
+from app.clients.openai_client import OpenAIClient, openai_client
+from app.services.recommendation_service import RecommendationService
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ServiceContainer:
+    def __init__(
+        self,
+        opensearch: OpenSearchClient = opensearch_client,
+        openai: OpenAIClient = openai_client
+    ):
+        self.opensearch_client = opensearch
+        self.openai_client = openai
+        self._services: Dict[type, Any] = {}
+
+    def get_service(self, service_cls: Type[T]) -> T:
+        """서비스 클래스별 인스턴스를 한 번만 만들어 재사용 (공용 클라이언트 주입)"""
+        service = self._services.get(service_cls)
+        if service is None:
+            service = service_cls(
+                opensearch_client=self.opensearch_client,
+                openai_client=self.openai_client
+            )
+            self._services[service_cls] = service
+        return service
+
+    async def close(self):
+        """공유 연결 풀 종료"""
+        try:
+            await self.opensearch_client.aclose()
+            logger.info("✅ OpenSearch 연결 종료")
+        except Exception as e:
+            logger.error(f"⚠️ OpenSearch 종료 중 오류: {str(e)}")
+
+        try:
+            await self.openai_client.aclose()
+            logger.info("✅ OpenAI 연결 종료")
+        except Exception as e:
+            logger.error(f"⚠️ OpenAI 종료 중 오류: {str(e)}")
+
+        self._services.clear()
+
+
+def get_container(request: Request) -> ServiceContainer:
+    """요청이 속한 앱의 컨테이너 (lifespan 밖에서 호출되면 기본 컨테이너를 만들어 둠)"""
+    container = getattr(request.app.state, "container", None)
+    if container is None:
+        container = ServiceContainer()
+        request.app.state.container = container
+    return container
+
+
+def get_opensearch_client(request: Request) -> OpenSearchClient:
+    return get_container(request).opensearch_client
+
+
+def get_openai_client(request: Request) -> OpenAIClient:
+    return get_container(request).openai_client
+
+
+def get_recommendation_service(request: Request) -> RecommendationService:
+    return get_container(request).get_service(RecommendationService)
@@ -1,8 +1,17 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import recommendation, integration, search, spell_check
 from app.config.settings import get_settings
 from app.clients.opensearch_client import opensearch_client
+from app.clients.openai_client import openai_client
+from app.utils.search_result_cache import get_search_result_cache
+from app.utils.relevance_cache import get_relevance_cache
+from app.utils.local_reranker import get_rerank_stats
+from app.container import ServiceContainer
+from app.utils.synonym_matcher import get_synonym_matcher
+from app.utils.korean_spell_checker import spell_checker
 from app.api import ocr
 import logging
 
@@ -14,12 +23,84 @@ logger = logging.getLogger(__name__)
 # 설정 로드
 settings = get_settings()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작/종료 시 실행 (공용 클라이언트/서비스 컨테이너 생성 및 정리)"""
+    logger.info("🚀 Refrige-Go AI Server 시작")
+    logger.info(f"환경: {settings.environment}")
+    logger.info(f"OpenSearch: {settings.opensearch_host}:{settings.opensearch_port}")
+    
+    container = ServiceContainer(opensearch_client, openai_client)
+    app.state.container = container
+    
+    # 로컬 벡터 인덱스 (VECTOR_BACKEND=local)
+    if settings.vector_backend == "local":
+        local_stats = opensearch_client.load_local_vector_indexes()
+        logger.info(f"🧮 로컬 벡터 인덱스: {local_stats or '없음 (OpenSearch 사용)'}")
+    
+    # OpenSearch 연결 테스트
+    try:
+        connection_ok = await opensearch_client.test_connection()
+        if connection_ok:
+            logger.info("✅ OpenSearch 연결 성공")
+            
+            stats = await opensearch_client.get_stats()
+            logger.info(f"📊 레시피: {stats.get('recipes_count', 0)}개")
+            logger.info(f"📊 재료: {stats.get('ingredients_count', 0)}개")
+        else:
+            logger.warning("⚠️ OpenSearch 연결 실패")
+            logger.warning("recipe-ai-project OpenSearch 실행 필요")
+            
+    except Exception as e:
+        logger.error(f"❌ 시작 중 오류: {str(e)}")
+    
+    # 동의어 사전 재료 임베딩 캐시 워밍 (요청 처리를 막지 않도록 백그라운드 실행)
+    warm_task = None
+    if settings.embedding_warm_on_startup:
+        warm_task = asyncio.create_task(warm_ingredient_embeddings())
+    
+    # 로컬 오타 교정 색인 구축 및 주기적 갱신 (구축 전에는 OpenSearch로 교정)
+    spell_index_task = None
+    if settings.spell_index_enabled:
+        spell_index_task = asyncio.create_task(
+            spell_checker.run_index_refresh(settings.spell_index_refresh_interval)
+        )
+    
+    # LLM 관련성 판단 캐시 주기 저장 (파일 I/O는 스레드에서)
+    relevance_cache = get_relevance_cache()
+    relevance_save_task = None
+    if relevance_cache is not None:
+        relevance_save_task = asyncio.create_task(relevance_cache.run_periodic_save())
+    
+    yield
+    
+    logger.info("🛑 AI Server 종료")
+    if warm_task and not warm_task.done():
+        warm_task.cancel()
+    if spell_index_task:
+        spell_index_task.cancel()
+    if relevance_save_task:
+        relevance_save_task.cancel()
+    # 아직 저장하지 않은 LLM 관련성 판단을 디스크에 기록
+    if relevance_cache is not None:
+        await asyncio.to_thread(relevance_cache.save)
+    await container.close()
+
+async def warm_ingredient_embeddings():
+    """동의어 사전의 모든 재료 임베딩을 미리 캐시"""
+    try:
+        result = await openai_client.warm_cache(get_synonym_matcher().all_ingredient_names())
+        logger.info(f"🔥 재료 임베딩 캐시 워밍 완료: {result}")
+    except Exception as e:
+        logger.error(f"⚠️ 재료 임베딩 캐시 워밍 실패: {str(e)}")
+
 app = FastAPI(
     title="Refrige-Go AI Server",
     description="시맨틱 검색 및 레시피 추천 AI 서버",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -75,6 +156,17 @@ async def health_check():
                 "recipes_count": stats.get("recipes_count", 0),
                 "ingredients_count": stats.get("ingredients_count", 0)
             },
+            "embedding_cache": openai_client.cache_stats(),
+            "embedding_batcher": openai_client.batcher_stats(),
+            "openai_rate_limiter": openai_client.rate_limiter_stats(),
+            "vector_backend": {
+                "backend": settings.vector_backend,
+                "local_indexes": opensearch_client.local_vector_stats()
+            },
+            "search_cache": get_search_result_cache().stats() if settings.search_cache_enabled else {"enabled": False},
+            "relevance_cache": get_relevance_cache().stats() if settings.relevance_cache_enabled else {"enabled": False},
+            "spell_index": spell_checker.index_stats() if settings.spell_index_enabled else {"enabled": False},
+            "reranker": {"mode": settings.rerank_mode, **get_rerank_stats().as_dict()},
             "features": {
                 "semantic_search": opensearch_status,
                 "vector_search": opensearch_status,
@@ -92,40 +184,6 @@ async def health_check():
             "suggestion": "recipe-ai-project OpenSearch가 실행 중인지 확인해주세요"
         })
 
-@app.on_event("startup")
-async def startup_event():
-    """서버 시작 시 실행"""
-    logger.info("🚀 Refrige-Go AI Server 시작")
-    logger.info(f"환경: {settings.environment}")
-    logger.info(f"OpenSearch: {settings.opensearch_host}:{settings.opensearch_port}")
-    
-    # OpenSearch 연결 테스트
-    try:
-        connection_ok = await opensearch_client.test_connection()
-        if connection_ok:
-            logger.info("✅ OpenSearch 연결 성공")
-            
-            stats = await opensearch_client.get_stats()
-            logger.info(f"📊 레시피: {stats.get('recipes_count', 0)}개")
-            logger.info(f"📊 재료: {stats.get('ingredients_count', 0)}개")
-        else:
-            logger.warning("⚠️ OpenSearch 연결 실패")
-            logger.warning("recipe-ai-project OpenSearch 실행 필요")
-            
-    except Exception as e:
-        logger.error(f"❌ 시작 중 오류: {str(e)}")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """서버 종료 시 실행"""
-    logger.info("🛑 AI Server 종료")
-    
-    try:
-        opensearch_client.close()
-        logger.info("✅ OpenSearch 연결 종료")
-    except Exception as e:
-        logger.error(f"⚠️ 종료 중 오류: {str(e)}")
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -107,6 +107,7 @@ class SemanticSearchResponse(BaseModel):
     ingredients: List[IngredientSearchResult]
     total_matches: int
     processing_time: float
+    corrected_query: Optional[str] = None  # 오타 교정 후 실제로 검색한 검색어 (교정을 지원하는 서비스만)
 
 # Forward references 해결
 RecognizedIngredient.model_rebuild()
@@ -4,7 +4,8 @@
 동의어 사전 + 벡터 검색을 결합한 하이브리드 검색
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import asyncio
 import time
 from ..models.schemas import (
     SemanticSearchRequest,
@@ -13,15 +14,24 @@ from ..models.schemas import (
     IngredientSearchResult,
     RecipeIngredient
 )
-from ..clients.opensearch_client import OpenSearchClient
-from ..clients.openai_client import OpenAIClient
+from ..clients.opensearch_client import OpenSearchClient, opensearch_client as default_opensearch_client
+from ..clients.openai_client import OpenAIClient, openai_client as default_openai_client
 from ..utils.synonym_matcher import get_synonym_matcher
+from ..utils.concurrency import gather_branches
+from ..utils.vectors import vector_to_json
+from ..config.settings import get_settings
 
 class EnhancedSearchService:
-    def __init__(self):
-        self.opensearch_client = OpenSearchClient()
-        self.openai_client = OpenAIClient()
+    def __init__(
+        self,
+        opensearch_client: Optional[OpenSearchClient] = None,
+        openai_client: Optional[OpenAIClient] = None
+    ):
+        # 클라이언트를 주입받지 않으면 공용 싱글톤 사용 (연결 풀 공유)
+        self.opensearch_client = opensearch_client or default_opensearch_client
+        self.openai_client = openai_client or default_openai_client
         self.synonym_matcher = get_synonym_matcher()
+        self.settings = get_settings()
 
     async def semantic_search(
         self,
@@ -34,15 +44,15 @@ class EnhancedSearchService:
         """
         start_time = time.time()
         
-        results = {}
-        
+        # 재료/레시피 브랜치를 동시에 실행 (브랜치별 제한 시간 적용)
+        branches = {}
         if search_type in ["all", "ingredient"]:
-            ingredient_results = await self._search_ingredients_hybrid(query, limit)
-            results["ingredients"] = ingredient_results
+            branches["ingredients"] = self._search_ingredients_hybrid(query, limit)
             
         if search_type in ["all", "recipe"]:
-            recipe_results = await self._search_recipes_hybrid(query, limit)
-            results["recipes"] = recipe_results
+            branches["recipes"] = self._search_recipes_hybrid(query, limit)
+        
+        results = await gather_branches(branches, self.settings.search_branch_timeout)
         
         processing_time = time.time() - start_time
         
@@ -60,12 +70,12 @@ class EnhancedSearchService:
         # 1. 동의어 사전 검색
         synonym_results = self._search_ingredients_by_synonym(query)
         
-        # 2. 벡터 검색
-        vector_results = await self._search_ingredients_by_vector(query, limit)
-        
-        # 3. 텍스트 검색 (확장된 쿼리)
+        # 2. 벡터 검색 + 3. 텍스트 검색 (확장된 쿼리) 동시 실행
         expanded_queries = self.synonym_matcher.expand_ingredient_query(query)
-        text_results = await self._search_ingredients_by_text(expanded_queries, limit)
+        vector_results, text_results = await asyncio.gather(
+            self._search_ingredients_by_vector(query, limit),
+            self._search_ingredients_by_text(expanded_queries, limit)
+        )
         
         # 4. 결과 통합 및 점수 조정
         combined_results = self._combine_ingredient_results(
@@ -107,11 +117,8 @@ class EnhancedSearchService:
     async def _search_ingredients_by_vector(self, query: str, limit: int) -> List[Dict[str, Any]]:
         """벡터 기반 재료 검색 - knn 쿼리 사용"""
         try:
-            import numpy as np
-            # OpenAI 임베딩 생성
+            # OpenAI 임베딩 생성 (정규화된 float32 벡터, recipe-ai-project와 동일)
             query_vector = await self.openai_client.get_embedding(query)
-            # 벡터 정규화 (recipe-ai-project와 동일)
-            normalized_vector = np.array(query_vector) / np.linalg.norm(query_vector)
             
             # knn 쿼리 사용 (명시적인 _source 설정)
             search_body = {
@@ -119,7 +126,7 @@ class EnhancedSearchService:
                 "query": {
                     "knn": {
                         "embedding": {
-                            "vector": list(map(float, normalized_vector)),
+                            "vector": vector_to_json(query_vector),
                             "k": min(limit * 2, 50)
                         }
                     }
@@ -128,7 +135,7 @@ class EnhancedSearchService:
             }
             
             response = await self.opensearch_client.search(
-                index="ingredients",
+                index=self.opensearch_client.ingredients_index,
                 body=search_body
             )
             
@@ -139,16 +146,16 @@ class EnhancedSearchService:
 
     async def _search_ingredients_by_text(self, queries: List[str], limit: int) -> List[Dict[str, Any]]:
         """확장된 텍스트 검색"""
-        all_results = []
-        
-        for query in queries[:3]:  # 상위 3개 쿼리만 사용
+        async def search_one(query: str) -> List[Dict[str, Any]]:
             try:
-                results = await self.opensearch_client.search_ingredients_by_text(query, limit)
-                all_results.extend(results)
+                return await self.opensearch_client.search_ingredients_by_text(query, limit)
             except Exception as e:
                 print(f"텍스트 검색 오류: {e}")
+                return []
         
-        return all_results
+        # 상위 3개 쿼리만 사용 (동시 실행, 쿼리 순서대로 결과 병합)
+        results_per_query = await asyncio.gather(*(search_one(query) for query in queries[:3]))
+        return [result for results in results_per_query for result in results]
 
     def _combine_ingredient_results(
         self,
@@ -206,12 +213,22 @@ class EnhancedSearchService:
         # 쿼리에서 재료 추출 및 확장
         expanded_queries = self.synonym_matcher.expand_ingredient_query(query)
         
-        # 벡터 검색 - knn 쿼리 사용
+        # 벡터 검색과 확장된 텍스트 검색을 동시에 실행
+        vector_results, text_results = await asyncio.gather(
+            self._search_recipes_by_vector(query, limit),
+            self._search_recipes_by_text(expanded_queries, limit)
+        )
+        
+        # 결과 통합
+        combined_results = self._combine_recipe_results(vector_results, text_results)
+        
+        return sorted(combined_results, key=lambda x: x.score, reverse=True)[:limit]
+
+    async def _search_recipes_by_vector(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """벡터 기반 레시피 검색 - knn 쿼리 사용"""
         try:
-            import numpy as np
+            # 정규화된 float32 벡터 (recipe-ai-project와 동일)
             query_vector = await self.openai_client.get_embedding(query)
-            # 벡터 정규화 (recipe-ai-project와 동일)
-            normalized_vector = np.array(query_vector) / np.linalg.norm(query_vector)
             
             # knn 쿼리로 벡터 검색 (명시적인 _source 설정)
             search_body = {
@@ -219,7 +236,7 @@ class EnhancedSearchService:
                 "query": {
                     "knn": {
                         "embedding": {
-                            "vector": list(map(float, normalized_vector)),
+                            "vector": vector_to_json(query_vector),
                             "k": min(limit * 2, 50)
                         }
                     }
@@ -228,27 +245,25 @@ class EnhancedSearchService:
             }
             
             response = await self.opensearch_client.search(
-                index="recipes",
+                index=self.opensearch_client.recipes_index,
                 body=search_body
             )
-            vector_results = response["hits"]["hits"]
+            return response["hits"]["hits"]
         except Exception as e:
             print(f"레시피 벡터 검색 오류: {e}")
-            vector_results = []
-        
-        # 확장된 텍스트 검색
-        text_results = []
-        for expanded_query in expanded_queries[:3]:
+            return []
+
+    async def _search_recipes_by_text(self, queries: List[str], limit: int) -> List[Dict[str, Any]]:
+        """확장된 레시피 텍스트 검색"""
+        async def search_one(query: str) -> List[Dict[str, Any]]:
             try:
-                results = await self.opensearch_client.search_recipes_by_text(expanded_query, limit)
-                text_results.extend(results)
+                return await self.opensearch_client.search_recipes_by_text(query, limit)
             except Exception as e:
                 print(f"레시피 텍스트 검색 오류: {e}")
+                return []
         
-        # 결과 통합
-        combined_results = self._combine_recipe_results(vector_results, text_results)
-        
-        return sorted(combined_results, key=lambda x: x.score, reverse=True)[:limit]
+        results_per_query = await asyncio.gather(*(search_one(query) for query in queries[:3]))
+        return [result for results in results_per_query for result in results]
 
     def _combine_recipe_results(
         self,
@@ -4,7 +4,7 @@
 벡터 검색 + OpenAI 관련성 재평가 방식 사용
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import time
 from ..models.schemas import (
     SemanticSearchRequest,
@@ -13,21 +13,29 @@ from ..models.schemas import (
     IngredientSearchResult,
     RecipeIngredient
 )
-from ..clients.opensearch_client import OpenSearchClient
-from ..clients.openai_client import OpenAIClient
+from ..clients.opensearch_client import OpenSearchClient, opensearch_client as default_opensearch_client
+from ..clients.openai_client import OpenAIClient, openai_client as default_openai_client
 from ..utils.openai_relevance_scorer import AIEnhancedScoreCalculator
 from ..utils.score_normalizer import ScoreNormalizer
+from ..utils.concurrency import gather_branches
+from ..config.settings import get_settings
 
 def get_synonym_matcher():
     """동의어 매칭 대체 함수 - 추후 구현 예정"""
     return None  # 현재는 사용하지 않음
 
 class EnhancedSearchService:
-    def __init__(self):
-        self.opensearch_client = OpenSearchClient()
-        self.openai_client = OpenAIClient()
-        self.ai_scorer = AIEnhancedScoreCalculator(min_score_threshold=70.0)  # 70점 이상만 반환
+    def __init__(
+        self,
+        opensearch_client: Optional[OpenSearchClient] = None,
+        openai_client: Optional[OpenAIClient] = None
+    ):
+        # 클라이언트를 주입받지 않으면 공용 싱글톤 사용 (연결 풀 공유)
+        self.opensearch_client = opensearch_client or default_opensearch_client
+        self.openai_client = openai_client or default_openai_client
+        self.ai_scorer = AIEnhancedScoreCalculator(min_score_threshold=70.0, openai_client=self.openai_client)  # 70점 이상만 반환
         self.synonym_matcher = get_synonym_matcher()
+        self.settings = get_settings()
 
     async def semantic_search(
         self,
@@ -43,13 +51,15 @@ class EnhancedSearchService:
         results = {}
         
         try:
+            # 재료/레시피 브랜치를 동시에 실행 (브랜치별 제한 시간 적용)
+            branches = {}
             if search_type in ["all", "ingredient"]:
-                ingredient_results = await self._search_ingredients_script_score(query, limit)
-                results["ingredients"] = ingredient_results
+                branches["ingredients"] = self._search_ingredients_script_score(query, limit)
                 
             if search_type in ["all", "recipe"]:
-                recipe_results = await self._search_recipes_script_score(query, limit)
-                results["recipes"] = recipe_results
+                branches["recipes"] = self._search_recipes_script_score(query, limit)
+            
+            results = await gather_branches(branches, self.settings.search_branch_timeout)
         except Exception as e:
             print(f"검색 중 오류: {e}")
             import traceback
@@ -69,16 +79,13 @@ class EnhancedSearchService:
     async def _search_ingredients_script_score(self, query: str, limit: int) -> List[IngredientSearchResult]:
         """script_score를 사용한 재료 검색 (점수 정규화 적용)"""
         try:
-            # 1. OpenAI 임베딩 생성
-            query_vector = await self.openai_client.get_embedding(query)
-            
-            # 2. script_score 방식으로 벡터 검색
-            vector_results = await self.opensearch_client.vector_search_ingredients(
-                query_vector, limit
-            )
-            
-            # 3. 텍스트 검색과 결합
-            text_results = await self._text_search_ingredients(query, limit)
+            # 1~2. 임베딩 → script_score 벡터 검색, 3. 텍스트 검색을 동시에 실행
+            # (한쪽이 실패/시간 초과하면 빈 결과로 대체하고 나머지 결과는 그대로 사용)
+            branch_results = await gather_branches({
+                "벡터": self._vector_search_ingredients(query, limit),
+                "텍스트": self._text_search_ingredients(query, limit)
+            }, self.settings.search_branch_timeout)
+            vector_results, text_results = branch_results["벡터"], branch_results["텍스트"]
             
             # 4. 결과 통합 (점수 정규화 포함)
             combined_results = self._combine_ingredient_results_normalized(vector_results, text_results)
@@ -93,16 +100,13 @@ class EnhancedSearchService:
     async def _search_recipes_script_score(self, query: str, limit: int) -> List[RecipeSearchResult]:
         """script_score를 사용한 레시피 검색 + OpenAI 관련성 평가"""
         try:
-            # 1. OpenAI 임베딩 생성
-            query_vector = await self.openai_client.get_embedding(query)
-            
-            # 2. script_score 방식으로 벡터 검색
-            vector_results = await self.opensearch_client.search_recipes_by_ingredients(
-                [query_vector], limit
-            )
-            
-            # 3. 텍스트 검색
-            text_results = await self._text_search_recipes(query, limit)
+            # 1~2. 임베딩 → script_score 벡터 검색, 3. 텍스트 검색을 동시에 실행
+            # (한쪽이 실패/시간 초과하면 빈 결과로 대체하고 나머지 결과는 그대로 사용)
+            branch_results = await gather_branches({
+                "벡터": self._vector_search_recipes(query, limit),
+                "텍스트": self._text_search_recipes(query, limit)
+            }, self.settings.search_branch_timeout)
+            vector_results, text_results = branch_results["벡터"], branch_results["텍스트"]
             
             # 4. 결과 통합 (점수 정규화 포함)
             combined_results = self._combine_recipe_results_normalized(vector_results, text_results)
@@ -160,6 +164,16 @@ class EnhancedSearchService:
             # 벡터 검색 실패 시 텍스트 검색만 사용
             return await self._text_search_recipes_only(query, limit)
 
+    async def _vector_search_ingredients(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """임베딩 생성 후 script_score 재료 벡터 검색 (실패 시 예외 전파 → gather_branches가 빈 결과로 대체)"""
+        query_vector = await self.openai_client.get_embedding(query)
+        return await self.opensearch_client.vector_search_ingredients(query_vector, limit)
+
+    async def _vector_search_recipes(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """임베딩 생성 후 script_score 레시피 벡터 검색 (실패 시 예외 전파 → gather_branches가 빈 결과로 대체)"""
+        query_vector = await self.openai_client.get_embedding(query)
+        return await self.opensearch_client.search_recipes_by_ingredients([query_vector], limit)
+
     async def _text_search_ingredients(self, query: str, limit: int) -> List[Dict[str, Any]]:
         """재료 텍스트 검색"""
         try:
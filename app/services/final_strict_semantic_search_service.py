@@ -6,7 +6,8 @@
 - 동의어 지원 ✅
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+import asyncio
 import time
 from ..models.schemas import (
     SemanticSearchRequest,
@@ -15,20 +16,175 @@ from ..models.schemas import (
     IngredientSearchResult,
     RecipeIngredient
 )
-from ..clients.opensearch_client import OpenSearchClient
-from ..clients.openai_client import OpenAIClient
+from ..clients.opensearch_client import OpenSearchClient, opensearch_client as default_opensearch_client
+from ..clients.openai_client import OpenAIClient, openai_client as default_openai_client
 from ..utils.score_normalizer import ScoreNormalizer
-from ..utils.strict_openai_relevance_verifier import StrictOpenAIRelevanceVerifier
+from ..utils.openai_relevance_verifier import OpenAIRelevanceVerifier
 from ..utils.korean_spell_checker import spell_checker
+from ..utils.concurrency import gather_branches, run_with_timeout, record_error, track_errors
+from ..utils.search_result_cache import get_search_result_cache
+from ..config.settings import get_settings
+
+# 스트리밍 레시피 단계가 search_branch_timeout을 넘겼음을 나타내는 표식
+_STAGE_TIMED_OUT = object()
 
 class FinalStrictSemanticSearchService:
-    def __init__(self):
-        self.opensearch_client = OpenSearchClient()
-        self.openai_client = OpenAIClient()
-        self.relevance_verifier = StrictOpenAIRelevanceVerifier()
+    def __init__(
+        self,
+        opensearch_client: Optional[OpenSearchClient] = None,
+        openai_client: Optional[OpenAIClient] = None
+    ):
+        # 클라이언트를 주입받지 않으면 공용 싱글톤 사용 (연결 풀 공유)
+        self.opensearch_client = opensearch_client or default_opensearch_client
+        self.openai_client = openai_client or default_openai_client
+        self.relevance_verifier = OpenAIRelevanceVerifier(self.openai_client)
+        self.settings = get_settings()
+        self.result_cache = get_search_result_cache() if self.settings.search_cache_enabled else None
 
     async def semantic_search(self, query: str, search_type: str = "all", limit: int = 10) -> SemanticSearchResponse:
-        """최종 완성된 엄격한 시맨틱 검색"""
+        """최종 완성된 엄격한 시맨틱 검색 (결과 캐시 적용)"""
+        if not self.result_cache or not query or not query.strip():
+            return await self._semantic_search(query, search_type, limit)
+        
+        start_time = time.time()
+        cache_key = self._make_cache_key(query, search_type, limit)
+        response = await self.result_cache.get_or_compute(
+            cache_key, lambda: self._semantic_search(query, search_type, limit)
+        )
+        response.processing_time = time.time() - start_time
+        return response
+
+    async def semantic_search_stream(
+        self,
+        query: str,
+        search_type: str = "all",
+        limit: int = 10
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        단계별로 결과를 내보내는 스트리밍 시맨틱 검색 (/api/search/semantic/stream)
+        
+        이벤트 (SemanticSearchResponse 필드 + stage/final/corrected_query):
+        - text: 텍스트 검색 결과 (벡터 검색이 필요한 경우 가장 먼저 전송)
+        - final: 벡터 검색과 재료 검색까지 반영한 최종 결과 (semantic_search 응답과 동일, 캐시에 저장)
+        """
+        start_time = time.time()
+        if not query or not query.strip():
+            yield self._stream_event("final", [], [], start_time, query)
+            return
+        
+        # 캐시에 신선한 결과가 있으면 바로 최종 결과 전송
+        cache_key = None
+        if self.result_cache:
+            cache_key = self._make_cache_key(query, search_type, limit)
+            cached = await self.result_cache.get(cache_key)
+            if cached is not None:
+                corrected_query = cached.corrected_query or await spell_checker.correct_typo(query.strip())
+                yield self._stream_event("final", cached.recipes, cached.ingredients, start_time, corrected_query)
+                return
+        
+        with track_errors() as errors:
+            # 🔧 0단계: 오타 교정
+            original_query = query.strip()
+            query = await spell_checker.correct_typo(original_query)
+            if query != original_query:
+                print(f"\n🔧 오타 교정 적용: '{original_query}' → '{query}'")
+            
+            # 재료 검색은 레시피 단계와 동시에 실행
+            ingredient_task = None
+            if search_type in ["all", "ingredient"]:
+                ingredient_task = asyncio.create_task(run_with_timeout(
+                    self._search_ingredients_basic(query, limit), self.settings.search_branch_timeout, [], "ingredients"
+                ))
+            
+            recipes = []
+            try:
+                if search_type in ["all", "recipe"]:
+                    async for stage, recipes in self._timed_recipe_stages(query, limit):
+                        if stage == "text":
+                            yield self._stream_event(stage, recipes, [], start_time, query)
+                ingredients = await ingredient_task if ingredient_task else []
+            finally:
+                if ingredient_task and not ingredient_task.done():
+                    ingredient_task.cancel()
+        
+        response = SemanticSearchResponse(
+            recipes=recipes,
+            ingredients=ingredients,
+            total_matches=len(recipes) + len(ingredients),
+            processing_time=time.time() - start_time,
+            corrected_query=query
+        )
+        # 오류로 기본값을 쓴 결과는 캐시하지 않음 (장애를 "결과 없음"으로 내보내지 않도록)
+        if cache_key is not None and not errors:
+            self.result_cache.put(cache_key, response)
+        yield self._stream_event("final", recipes, ingredients, start_time, query)
+
+    async def _timed_recipe_stages(
+        self,
+        query: str,
+        limit: int
+    ) -> AsyncIterator[Tuple[str, List[RecipeSearchResult]]]:
+        """
+        스트리밍용 레시피 단계 검색 (/semantic과 같은 search_branch_timeout 적용)
+        
+        시간이 초과되면 남은 단계를 취소하고, 이미 보낸 텍스트 결과가 있으면 그것을 최종 결과로 사용합니다.
+        """
+        stages = self._final_strict_recipe_stages(query, limit, progressive=True)
+        deadline = time.monotonic() + self.settings.search_branch_timeout
+        
+        async def next_stage():
+            try:
+                return await stages.__anext__()
+            except StopAsyncIteration:
+                return None
+        
+        recipes: List[RecipeSearchResult] = []
+        try:
+            while True:
+                step = await run_with_timeout(
+                    next_stage(), max(0.0, deadline - time.monotonic()), _STAGE_TIMED_OUT, "recipes"
+                )
+                if step is None:
+                    return
+                if step is _STAGE_TIMED_OUT:
+                    yield "final", recipes
+                    return
+                recipes = step[1]
+                yield step
+        finally:
+            await stages.aclose()
+
+    def _stream_event(
+        self,
+        stage: str,
+        recipes: List[RecipeSearchResult],
+        ingredients: List[IngredientSearchResult],
+        start_time: float,
+        query: str
+    ) -> Dict[str, Any]:
+        """스트리밍 이벤트 (SemanticSearchResponse와 같은 필드 + 단계 정보)"""
+        response = SemanticSearchResponse(
+            recipes=recipes,
+            ingredients=ingredients,
+            total_matches=len(recipes) + len(ingredients),
+            processing_time=time.time() - start_time,
+            corrected_query=query
+        )
+        return {
+            "stage": stage,
+            "final": stage == "final",
+            **response.model_dump()
+        }
+
+    def _make_cache_key(self, query: str, search_type: str, limit: int) -> tuple:
+        """공백/대소문자와 '요리', '레시피' 같은 불용어를 정규화한 캐시 키"""
+        normalized = " ".join(query.lower().split())
+        is_ingredient_query = self._is_ingredient_query(normalized)
+        main_ingredient = " ".join(self._extract_main_ingredient(normalized).split())
+        return (main_ingredient or normalized, is_ingredient_query, search_type, limit)
+
+    async def _semantic_search(self, query: str, search_type: str = "all", limit: int = 10) -> SemanticSearchResponse:
+        """최종 완성된 엄격한 시맨틱 검색 (캐시 없이 실제 검색 수행)"""
         start_time = time.time()
         results = {}
         
@@ -48,16 +204,19 @@ class FinalStrictSemanticSearchService:
             else:
                 query = original_query
                 
+            # 레시피/재료 브랜치를 동시에 실행 (브랜치별 제한 시간 적용)
+            branches = {}
             if search_type in ["all", "recipe"]:
-                recipe_results = await self._final_strict_search_recipes(query, limit)
-                results["recipes"] = recipe_results
+                branches["recipes"] = self._final_strict_search_recipes(query, limit)
                 
             if search_type in ["all", "ingredient"]:
-                ingredient_results = await self._search_ingredients_basic(query, limit)
-                results["ingredients"] = ingredient_results
+                branches["ingredients"] = self._search_ingredients_basic(query, limit)
+            
+            results = await gather_branches(branches, self.settings.search_branch_timeout)
                 
         except Exception as e:
             print(f"최종 엄격한 시맨틱 검색 오류: {e}")
+            record_error("시맨틱 검색", e)
             import traceback
             print(f"오류 상세: {traceback.format_exc()}")
             results = {"recipes": [], "ingredients": []}
@@ -68,14 +227,38 @@ class FinalStrictSemanticSearchService:
             recipes=results.get("recipes", []),
             ingredients=results.get("ingredients", []),
             total_matches=len(results.get("recipes", [])) + len(results.get("ingredients", [])),
-            processing_time=processing_time
+            processing_time=processing_time,
+            corrected_query=query
         )
 
     async def _final_strict_search_recipes(self, query: str, limit: int) -> List[RecipeSearchResult]:
         """최종 완성된 엄격한 레시피 검색"""
+        final_results = []
+        async for _, final_results in self._final_strict_recipe_stages(query, limit):
+            pass
+        return final_results
+
+    async def _final_strict_recipe_stages(
+        self,
+        query: str,
+        limit: int,
+        progressive: bool = False
+    ) -> AsyncIterator[Tuple[str, List[RecipeSearchResult]]]:
+        """
+        최종 완성된 엄격한 레시피 검색을 단계별 (단계, 결과)로 yield
+        
+        - "text": 텍스트 검색 결과만 통합한 중간 결과 (progressive=True이고 벡터 검색을 할 때만)
+        - "final": 벡터 검색까지 통합한 최종 결과
+        - "fallback": 오류 시 텍스트 전용 검색 결과
+        """
+        vector_task = None
         try:
             print(f"🎯 최종 엄격한 시맨틱 레시피 검색: '{query}'")
             
+            # 추측 실행: 텍스트 검색과 동시에 임베딩 + 벡터 검색을 미리 시작
+            if self.settings.speculative_vector_search:
+                vector_task = asyncio.create_task(self._strict_vector_search(query, limit))
+            
             # 1단계: 완벽한 텍스트 검색
             text_results = await self._perfect_text_search(query, limit)
             print(f"1단계 완벽한 텍스트 검색: {len(text_results)}개")
@@ -83,13 +266,24 @@ class FinalStrictSemanticSearchService:
             # 2단계: 벡터 검색 (필요시)
             vector_results = []
             if len(text_results) < limit * 0.7:
-                print("📡 벡터 검색 실행")
+                if progressive:
+                    # 벡터 검색을 기다리는 동안 텍스트 결과를 먼저 내보냄
+                    yield "text", await self._final_combine_and_filter(query, text_results, [], limit)
+                
+                print("📡 벡터 검색 실행" + (" (추측 실행 결과 사용)" if vector_task else ""))
                 try:
-                    vector_results = await self._strict_vector_search(query, limit)
+                    if vector_task:
+                        vector_results = await vector_task
+                    else:
+                        vector_results = await self._strict_vector_search(query, limit)
                     print(f"2단계 벡터 검색: {len(vector_results)}개")
                 except Exception as e:
                     print(f"벡터 검색 실패: {e}")
+                    record_error("벡터 검색", e)
             else:
+                if vector_task:
+                    # 텍스트 결과가 충분하면 미리 시작한 벡터 검색은 취소
+                    vector_task.cancel()
                 print("📊 텍스트 결과 충분 → 벡터 검색 생략")
             
             # 3단계: 최종 통합 및 정렬
@@ -99,45 +293,57 @@ class FinalStrictSemanticSearchService:
             for i, recipe in enumerate(final_results, 1):
                 print(f"{i}. {recipe.rcp_nm} = {recipe.score:.1f}점 ({recipe.match_reason})")
             
-            return final_results
-            
         except Exception as e:
             print(f"최종 엄격한 검색 오류: {e}")
-            return await self._fallback_text_only(query, limit)
+            record_error("레시피 검색", e)
+            yield "fallback", await self._fallback_text_only(query, limit)
+            return
+        finally:
+            # 오류나 스트림 중단 시 미리 시작한 벡터 검색 정리
+            if vector_task and not vector_task.done():
+                vector_task.cancel()
+        
+        yield "final", final_results
 
     async def _perfect_text_search(self, query: str, limit: int) -> List[Dict]:
         """🎯 완벽한 텍스트 검색 로직"""
         all_results = {}
         
-        # 1. 정확한 구문 검색 우선
-        exact_results = await self._exact_phrase_search(query, limit)
-        for result in exact_results:
-            recipe_id = self._get_recipe_id(result)
-            if recipe_id:
-                all_results[recipe_id] = result
-        print(f"  정확한 구문 검색: {len(exact_results)}개")
-        
-        # 2. 스마트 키워드 검색
+        # 1. 정확한 구문 검색과 2. 스마트 키워드 검색은 서로 독립적이므로 동시에 실행
+        keyword_task = None
+        keyword_label = ""
         if self._is_ingredient_query(query):
             main_ingredient = self._extract_main_ingredient(query)
             if main_ingredient and main_ingredient != query:
                 print(f"  핵심 재료: '{main_ingredient}'")
-                
                 # 🎯 동의어 지원 재료 검색
-                ingredient_results = await self._smart_ingredient_search(main_ingredient, limit)
-                for result in ingredient_results:
-                    recipe_id = self._get_recipe_id(result)
-                    if recipe_id and recipe_id not in all_results:
-                        all_results[recipe_id] = result
-                print(f"  스마트 재료 검색: +{len(ingredient_results)}개")
+                keyword_task = self._smart_ingredient_search(main_ingredient, limit)
+                keyword_label = "스마트 재료 검색"
         else:
             # 일반 키워드 검색 (더 엄격하게)
-            keyword_results = await self._strict_keyword_search(query, limit)
+            keyword_task = self._strict_keyword_search(query, limit)
+            keyword_label = "엄격한 키워드 검색"
+        
+        if keyword_task is not None:
+            exact_results, keyword_results = await asyncio.gather(
+                self._exact_phrase_search(query, limit), keyword_task
+            )
+        else:
+            exact_results, keyword_results = await self._exact_phrase_search(query, limit), []
+        
+        # 정확한 구문 검색 결과 우선
+        for result in exact_results:
+            recipe_id = self._get_recipe_id(result)
+            if recipe_id:
+                all_results[recipe_id] = result
+        print(f"  정확한 구문 검색: {len(exact_results)}개")
+        
+        if keyword_task is not None:
             for result in keyword_results:
                 recipe_id = self._get_recipe_id(result)
                 if recipe_id and recipe_id not in all_results:
                     all_results[recipe_id] = result
-            print(f"  엄격한 키워드 검색: +{len(keyword_results)}개")
+            print(f"  {keyword_label}: +{len(keyword_results)}개")
         
         return list(all_results.values())
 
@@ -164,8 +370,8 @@ class FinalStrictSemanticSearchService:
             
             print(f"    검색 키워드: {search_terms}")
             
-            # 모든 키워드로 검색
-            all_results = {}
+            # 모든 키워드 검색을 한 번의 msearch로 실행
+            searches = []
             for term in search_terms:
                 search_body = {
                     "query": {
@@ -201,9 +407,12 @@ class FinalStrictSemanticSearchService:
                     },
                     "size": limit * 2  # 더 많이 가져와서 필터링
                 }
-                
-                response = await self.opensearch_client.search(index="recipes", body=search_body)
-                
+                searches.append((self.opensearch_client.recipes_index, search_body))
+            
+            responses = await self.opensearch_client.msearch(searches)
+            
+            all_results = {}
+            for term, response in zip(search_terms, responses):
                 for hit in response["hits"]["hits"]:
                     recipe_id = self._get_recipe_id(hit)
                     if recipe_id and recipe_id not in all_results:
@@ -227,6 +436,7 @@ class FinalStrictSemanticSearchService:
             
         except Exception as e:
             print(f"스마트 재료 검색 오류: {e}")
+            record_error("스마트 재료 검색", e)
             return []
 
     async def _exact_phrase_search(self, query: str, limit: int) -> List[Dict]:
@@ -245,7 +455,7 @@ class FinalStrictSemanticSearchService:
                 "size": limit
             }
             
-            response = await self.opensearch_client.search(index="recipes", body=search_body)
+            response = await self.opensearch_client.search(index=self.opensearch_client.recipes_index, body=search_body)
             
             results = []
             for hit in response["hits"]["hits"]:
@@ -256,6 +466,7 @@ class FinalStrictSemanticSearchService:
             
         except Exception as e:
             print(f"정확한 구문 검색 오류: {e}")
+            record_error("정확한 구문 검색", e)
             return []
 
     async def _strict_keyword_search(self, query: str, limit: int) -> List[Dict]:
@@ -287,7 +498,7 @@ class FinalStrictSemanticSearchService:
                 "size": limit
             }
             
-            response = await self.opensearch_client.search(index="recipes", body=search_body)
+            response = await self.opensearch_client.search(index=self.opensearch_client.recipes_index, body=search_body)
             
             results = []
             for hit in response["hits"]["hits"]:
@@ -298,6 +509,7 @@ class FinalStrictSemanticSearchService:
             
         except Exception as e:
             print(f"엄격한 키워드 검색 오류: {e}")
+            record_error("엄격한 키워드 검색", e)
             return []
 
     def _is_ingredient_query(self, query: str) -> bool:
@@ -311,23 +523,33 @@ class FinalStrictSemanticSearchService:
     async def _strict_vector_search(self, query: str, limit: int) -> List[Dict]:
         """엄격한 벡터 검색"""
         try:
-            query_vector = await self.openai_client.get_embedding(query)
-            results = await self.opensearch_client.search_recipes_by_ingredients([query_vector], limit * 2)
-            
+            main_ingredient = None
             if self._is_ingredient_query(query):
                 main_ingredient = self._extract_main_ingredient(query)
-                if main_ingredient != query:
-                    ingredient_vector = await self.openai_client.get_embedding(main_ingredient)
-                    ingredient_results = await self.opensearch_client.search_recipes_by_ingredients([ingredient_vector], limit)
-                    existing_ids = {self._get_recipe_id(r) for r in results}
-                    for result in ingredient_results:
-                        if self._get_recipe_id(result) not in existing_ids:
-                            results.append(result)
+                if not main_ingredient or main_ingredient == query:
+                    main_ingredient = None
+            
+            if main_ingredient is None:
+                query_vector = await self.openai_client.get_embedding(query)
+                return await self.opensearch_client.search_recipes_by_ingredients([query_vector], limit * 2)
+            
+            # 쿼리와 핵심 재료를 한 번의 요청으로 임베딩한 뒤 두 벡터 검색을 동시에 실행
+            query_vector, ingredient_vector = await self.openai_client.get_embeddings([query, main_ingredient])
+            results, ingredient_results = await asyncio.gather(
+                self.opensearch_client.search_recipes_by_ingredients([query_vector], limit * 2),
+                self.opensearch_client.search_recipes_by_ingredients([ingredient_vector], limit)
+            )
+            
+            existing_ids = {self._get_recipe_id(r) for r in results}
+            for result in ingredient_results:
+                if self._get_recipe_id(result) not in existing_ids:
+                    results.append(result)
             
             return results
             
         except Exception as e:
             print(f"벡터 검색 오류: {e}")
+            record_error("벡터 검색", e)
             return []
 
     async def _final_combine_and_filter(self, query: str, text_results: List[Dict], vector_results: List[Dict], limit: int) -> List[RecipeSearchResult]:
@@ -459,7 +681,7 @@ class FinalStrictSemanticSearchService:
             if query in synonyms:
                 search_terms.extend(synonyms[query])
             
-            all_results = {}
+            searches = []
             for term in search_terms:
                 search_body = {
                     "query": {
@@ -474,9 +696,12 @@ class FinalStrictSemanticSearchService:
                     },
                     "size": limit
                 }
-                
-                response = await self.opensearch_client.search(index="ingredients", body=search_body)
-                
+                searches.append((self.opensearch_client.ingredients_index, search_body))
+            
+            responses = await self.opensearch_client.msearch(searches)
+            
+            all_results = {}
+            for response in responses:
                 for hit in response["hits"]["hits"]:
                     source = hit["_source"]
                     ingredient_id = source.get("ingredient_id", 0)
@@ -509,6 +734,7 @@ class FinalStrictSemanticSearchService:
             
         except Exception as e:
             print(f"재료 검색 오류: {e}")
+            record_error("재료 검색", e)
             return []
 
     async def _fallback_text_only(self, query: str, limit: int) -> List[RecipeSearchResult]:
@@ -540,6 +766,7 @@ class FinalStrictSemanticSearchService:
             
         except Exception as e:
             print(f"폴백 검색 오류: {e}")
+            record_error("폴백 검색", e)
             return []
 
     def _extract_recipe_ingredients_safe(self, recipe_source: Dict[str, Any]) -> List[RecipeIngredient]:
@@ -0,0 +1,228 @@
+"""
+벌크 색인 서비스
+
+레시피/재료 레코드의 임베딩을 대량 배치로 생성하고 OpenSearch _bulk API로 색인합니다.
+
+파이프라인:
+1. 레코드를 embed_batch_size개씩 묶어 임베딩 생성 (동시 embed_concurrency개로 제한)
+2. 임베딩이 붙은 문서를 bulk_chunk_size개 단위로 크기 제한 큐에 넣음
+   (큐가 가득 차면 임베딩 단계가 대기 → 색인이 느릴 때 메모리가 늘지 않음)
+3. bulk_concurrency개의 워커가 큐에서 꺼내 _bulk 요청
+   (요청 실패나 429/5xx 항목은 Settings.vector_embedding_max_retries까지 지수 백오프로 재시도)
+
+임베딩 단계와 색인 워커는 하나의 TaskGroup으로 묶어, 어느 쪽이든 실패하면 나머지를 모두 취소합니다.
+(워커가 죽었는데 임베딩 단계가 가득 찬 큐에서 영원히 대기하는 일이 없도록)
+카탈로그 임베딩은 한 번 쓰고 마는 텍스트라 검색어용 디스크 임베딩 캐시를 거치지 않습니다.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.clients.opensearch_client import OpenSearchClient, opensearch_client as default_opensearch_client
+from app.clients.openai_client import OpenAIClient
+from app.config.settings import get_settings
+from app.utils.vectors import vector_to_json
+
+logger = logging.getLogger(__name__)
+
+# 레시피 임베딩 텍스트에 사용할 필드 (순서대로 이어 붙임)
+DEFAULT_RECIPE_TEXT_FIELDS = ["name", "category", "cooking_method", "ingredients"]
+
+# 재시도할 _bulk 항목 상태 코드 (요청 과다 / 서버 오류)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def build_embedding_text(record: Dict[str, Any], text_fields: List[str]) -> str:
+    """레코드의 지정 필드를 이어 붙여 임베딩 입력 텍스트를 만듦"""
+    parts = []
+    for field in text_fields:
+        value = record.get(field)
+        if not value:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = ", ".join(str(v) for v in value)
+        parts.append(str(value))
+    return " ".join(parts)
+
+
+class IngestStats:
+    def __init__(self):
+        self.start_time = time.time()
+        self.read = 0
+        self.embedded = 0
+        self.indexed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.retries = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = time.time() - self.start_time
+        return {
+            "read": self.read,
+            "embedded": self.embedded,
+            "indexed": self.indexed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "retries": self.retries,
+            "elapsed": round(elapsed, 2),
+            "docs_per_sec": round(self.indexed / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+
+class BulkIngestService:
+    def __init__(
+        self,
+        opensearch_client: Optional[OpenSearchClient] = None,
+        openai_client: Optional[OpenAIClient] = None,
+        embed_batch_size: int = 256,
+        embed_concurrency: int = 4,
+        bulk_chunk_size: int = 500,
+        bulk_concurrency: int = 4,
+        queue_size: int = 8
+    ):
+        self.settings = get_settings()
+        self.opensearch_client = opensearch_client or default_opensearch_client
+        # 검색어용 디스크 캐시를 카탈로그 임베딩으로 채우지 않도록 캐시 없는 클라이언트 사용
+        self.openai_client = openai_client or OpenAIClient(use_cache=False)
+
+        self.embed_batch_size = embed_batch_size
+        self.embed_concurrency = embed_concurrency
+        self.bulk_chunk_size = bulk_chunk_size
+        self.bulk_concurrency = bulk_concurrency
+        self.queue_size = queue_size
+
+        self.max_retries = self.settings.vector_embedding_max_retries
+        self.retry_delay = self.settings.vector_embedding_request_delay
+
+    async def ingest(
+        self,
+        records: Iterable[Dict[str, Any]],
+        index: str,
+        id_field: str,
+        text_fields: Optional[List[str]] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        레코드를 임베딩하여 index에 색인합니다.
+
+        Args:
+            records: 색인할 레코드 (dict) 이터러블
+            index: 대상 인덱스
+            id_field: 문서 ID로 사용할 필드 (예: recipe_id)
+            text_fields: 임베딩 텍스트로 이어 붙일 필드 목록
+            progress: 각 _bulk 요청 후 통계 dict를 받는 콜백
+
+        Returns:
+            처리 통계 (read/embedded/indexed/failed/skipped/retries/docs_per_sec)
+        """
+        text_fields = text_fields or DEFAULT_RECIPE_TEXT_FIELDS
+        stats = IngestStats()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        embed_semaphore = asyncio.Semaphore(self.embed_concurrency)
+
+        async def embed_batch(batch: List[Dict[str, Any]]):
+            async with embed_semaphore:
+                texts = [build_embedding_text(record, text_fields) for record in batch]
+                embeddings = await self.openai_client.get_embeddings(texts)
+
+            documents = []
+            for record, embedding in zip(batch, embeddings):
+                document = dict(record)
+                document["embedding"] = vector_to_json(embedding)
+                documents.append((str(record[id_field]), document))
+            stats.embedded += len(documents)
+
+            for i in range(0, len(documents), self.bulk_chunk_size):
+                # 큐가 가득 차면 여기서 대기 (백프레셔)
+                await queue.put(documents[i:i + self.bulk_chunk_size])
+
+        async def produce():
+            pending = set()
+            batch = []
+            try:
+                for record in records:
+                    stats.read += 1
+                    if record.get(id_field) in (None, "") or not build_embedding_text(record, text_fields):
+                        stats.skipped += 1
+                        continue
+                    batch.append(record)
+                    if len(batch) >= self.embed_batch_size:
+                        pending.add(asyncio.create_task(embed_batch(batch)))
+                        batch = []
+                        # 동시에 떠 있는 임베딩 배치 수 제한
+                        if len(pending) >= self.embed_concurrency:
+                            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                            for task in done:
+                                task.result()
+                if batch:
+                    pending.add(asyncio.create_task(embed_batch(batch)))
+                if pending:
+                    await asyncio.gather(*pending)
+            except BaseException:
+                for task in pending:
+                    task.cancel()
+                raise
+
+        async def consume():
+            while True:
+                chunk = await queue.get()
+                try:
+                    if chunk is None:
+                        return
+                    await self._bulk_with_retry(index, chunk, stats)
+                    if progress:
+                        progress(stats.as_dict())
+                finally:
+                    queue.task_done()
+
+        async def produce_and_finish():
+            await produce()
+            for _ in range(self.bulk_concurrency):
+                await queue.put(None)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for _ in range(self.bulk_concurrency):
+                    group.create_task(consume())
+                group.create_task(produce_and_finish())
+        except BaseExceptionGroup as group_error:
+            # 첫 번째 원인 예외를 그대로 전달 (호출 측은 ExceptionGroup을 몰라도 됨)
+            raise group_error.exceptions[0] from group_error
+
+        return stats.as_dict()
+
+    async def _bulk_with_retry(self, index: str, chunk: List[Tuple[str, dict]], stats: IngestStats):
+        """_bulk 요청 (요청 오류/재시도 가능한 항목만 다시 보냄)"""
+        documents = chunk
+        for attempt in range(self.max_retries + 1):
+            try:
+                failures = await self.opensearch_client.bulk(index, documents)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"_bulk 요청 실패 ({len(documents)}건): {str(e)}")
+                    stats.failed += len(documents)
+                    return
+                logger.warning(f"_bulk 재시도 {attempt + 1}/{self.max_retries}: {str(e)}")
+                stats.retries += 1
+                await asyncio.sleep(self.retry_delay * (2 ** attempt))
+                continue
+
+            retryable = [f for f in failures if f[2].get("status") in RETRYABLE_STATUS]
+            permanent = [f for f in failures if f[2].get("status") not in RETRYABLE_STATUS]
+            stats.indexed += len(documents) - len(failures)
+            stats.failed += len(permanent)
+            for doc_id, _, error in permanent[:3]:
+                logger.error(f"색인 실패 (id={doc_id}): {error}")
+
+            if not retryable:
+                return
+            if attempt == self.max_retries:
+                stats.failed += len(retryable)
+                logger.error(f"_bulk 항목 재시도 한도 초과: {len(retryable)}건")
+                return
+
+            documents = [(doc_id, document) for doc_id, document, _ in retryable]
+            stats.retries += 1
+            await asyncio.sleep(self.retry_delay * (2 ** attempt))
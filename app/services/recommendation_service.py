@@ -11,18 +11,25 @@ from app.models.schemas import (
     RecipeScore,
     RecipeIngredient
 )
-from app.clients.opensearch_client import OpenSearchClient
-from app.clients.openai_client import OpenAIClient
-from typing import List, Dict, Any, Tuple, Set
+from app.clients.opensearch_client import OpenSearchClient, opensearch_client as default_opensearch_client
+from app.clients.openai_client import OpenAIClient, openai_client as default_openai_client
+from app.utils.embedding_cache import normalize_embedding_text
+from app.utils.vectors import Vector
+from typing import List, Dict, Any, Tuple, Set, Optional
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
 class RecommendationService:
-    def __init__(self):
-        self.opensearch_client = OpenSearchClient()
-        self.openai_client = OpenAIClient()
+    def __init__(
+        self,
+        opensearch_client: Optional[OpenSearchClient] = None,
+        openai_client: Optional[OpenAIClient] = None
+    ):
+        # 클라이언트를 주입받지 않으면 공용 싱글톤 사용 (연결 풀 공유)
+        self.opensearch_client = opensearch_client or default_opensearch_client
+        self.openai_client = openai_client or default_openai_client
 
     async def get_recommendations(
         self,
@@ -96,12 +103,26 @@ class RecommendationService:
     async def _get_ingredient_embeddings(
         self,
         ingredients: List[str]
-    ) -> List[List[float]]:
+    ) -> List[Vector]:
         """
         재료 목록의 임베딩을 생성합니다.
+        
+        재료마다 따로 임베딩하므로 냉장고 재료가 하나 바뀌어도 나머지는 캐시에서 바로 꺼내고,
+        평균/정규화된 쿼리 벡터는 search_recipes_by_ingredients에서 로컬로 계산합니다.
+        (동의어 사전의 재료는 scripts/precompute_ingredient_embeddings.py로 미리 캐시 가능)
         """
+        # 정규화한 문자열은 중복 제거 키로만 쓰고, 임베딩은 처음 나온 원래 표기로 생성
+        # (같은 재료가 평균에 두 번 반영되지 않도록)
+        first_spellings: Dict[str, str] = {}
+        for ingredient in ingredients:
+            if ingredient and ingredient.strip():
+                first_spellings.setdefault(normalize_embedding_text(ingredient), ingredient.strip())
+        unique_ingredients = list(first_spellings.values())
+        if not unique_ingredients:
+            return []
+        
         try:
-            return await self.openai_client.get_embeddings(ingredients)
+            return await self.openai_client.get_embeddings(unique_ingredients)
         except Exception as e:
             logger.error(f"Error in _get_ingredient_embeddings: {str(e)}")
             # 임베딩 생성 실패 시 비어있는 리스트 반환
@@ -4,7 +4,7 @@
 텍스트 검색 우선 + 벡터 검색으로 의미적 확장 + 스마트 필터링
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import time
 from ..models.schemas import (
     SemanticSearchRequest,
@@ -13,14 +13,22 @@ from ..models.schemas import (
     IngredientSearchResult,
     RecipeIngredient
 )
-from ..clients.opensearch_client import OpenSearchClient
-from ..clients.openai_client import OpenAIClient
+from ..clients.opensearch_client import OpenSearchClient, opensearch_client as default_opensearch_client
+from ..clients.openai_client import OpenAIClient, openai_client as default_openai_client
 from ..utils.score_normalizer import ScoreNormalizer
+from ..utils.concurrency import gather_branches
+from ..config.settings import get_settings
 
 class SmartHybridSearchService:
-    def __init__(self):
-        self.opensearch_client = OpenSearchClient()
-        self.openai_client = OpenAIClient()
+    def __init__(
+        self,
+        opensearch_client: Optional[OpenSearchClient] = None,
+        openai_client: Optional[OpenAIClient] = None
+    ):
+        # 클라이언트를 주입받지 않으면 공용 싱글톤 사용 (연결 풀 공유)
+        self.opensearch_client = opensearch_client or default_opensearch_client
+        self.openai_client = openai_client or default_openai_client
+        self.settings = get_settings()
 
     async def semantic_search(
         self,
@@ -36,13 +44,15 @@ class SmartHybridSearchService:
         results = {}
         
         try:
+            # 재료/레시피 브랜치를 동시에 실행 (브랜치별 제한 시간 적용)
+            branches = {}
             if search_type in ["all", "ingredient"]:
-                ingredient_results = await self._search_ingredients_hybrid(query, limit)
-                results["ingredients"] = ingredient_results
+                branches["ingredients"] = self._search_ingredients_hybrid(query, limit)
                 
             if search_type in ["all", "recipe"]:
-                recipe_results = await self._search_recipes_hybrid(query, limit)
-                results["recipes"] = recipe_results
+                branches["recipes"] = self._search_recipes_hybrid(query, limit)
+            
+            results = await gather_branches(branches, self.settings.search_branch_timeout)
         except Exception as e:
             print(f"검색 중 오류: {e}")
             import traceback
@@ -0,0 +1,100 @@
+"""
+BK-tree 기반 유사 이름 검색
+
+레시피명/재료명(자모 분해 형태)을 편집 거리 거리공간의 BK-tree로 색인해
+입력과 거리 k 이내인 모든 이름을 찾습니다. ("혹시 이것을 찾으셨나요?" 후보 목록용)
+
+- 각 노드의 자식은 부모와의 거리로 구분 → 삼각 부등식으로 |d - k| 범위 밖의 자식은 건너뜀
+- 거리는 자모 단위 Levenshtein (jamo_distance.JamoPattern, 질의 마스크는 한 번만 계산)
+- 삽입/검색 모두 재귀 없이 반복문으로 처리 (긴 사전에서도 재귀 한도 문제 없음)
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import hangul
+from .jamo_distance import JamoPattern, jamo_distance
+
+
+class _Node:
+    __slots__ = ("key", "name", "count", "children")
+
+    def __init__(self, key: str, name: str):
+        self.key = key
+        self.name = name
+        self.count = 1
+        self.children: Dict[int, "_Node"] = {}
+
+
+class BKTree:
+    def __init__(self, decompose: Callable[[str], str] = hangul.decompose):
+        self.decompose = decompose
+        self._root: Optional[_Node] = None
+        self._size = 0
+        self.build_time = 0.0
+
+    def _key(self, text: str) -> str:
+        return self.decompose(text.strip().lower())
+
+    def build(self, names: Iterable[str]):
+        """이름 목록으로 트리를 새로 만들고 한 번에 교체 (조회 중에도 안전)"""
+        start_time = time.perf_counter()
+        root: Optional[_Node] = None
+        size = 0
+        for name in names:
+            if not name or not name.strip():
+                continue
+            key = self._key(name)
+            if root is None:
+                root = _Node(key, name.strip())
+                size = 1
+                continue
+
+            node = root
+            while True:
+                distance = jamo_distance(key, node.key)
+                if distance == 0:
+                    node.count += 1  # 같은 이름은 빈도만 증가
+                    break
+                child = node.children.get(distance)
+                if child is None:
+                    node.children[distance] = _Node(key, name.strip())
+                    size += 1
+                    break
+                node = child
+
+        self._root, self._size = root, size
+        self.build_time = time.perf_counter() - start_time
+
+    def search(self, text: str, max_distance: int) -> List[Tuple[str, int, int]]:
+        """
+        text와 자모 편집 거리 max_distance 이내의 모든 이름
+
+        Returns:
+            [(이름, 거리, 빈도)] 거리 오름차순, 같은 거리면 빈도 높은 순 → 짧은 이름 순
+        """
+        root = self._root
+        if root is None:
+            return []
+
+        pattern = JamoPattern(self._key(text))
+        results = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            distance = pattern.distance(node.key)
+            if distance <= max_distance:
+                results.append((node.name, distance, node.count))
+            low, high = distance - max_distance, distance + max_distance
+            for child_distance, child in node.children.items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+
+        results.sort(key=lambda item: (item[1], -item[2], len(item[0]), item[0]))
+        return results
+
+    def stats(self) -> Dict[str, float]:
+        return {"names": self._size, "build_ms": round(self.build_time * 1000, 1)}
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,80 @@
+"""
+비동기 동시 실행 유틸리티
+
+검색 서비스의 독립적인 단계(레시피/재료 브랜치 등)를 동시에 실행하고,
+브랜치별 제한 시간을 넘기거나 실패한 경우 기본값으로 대체합니다.
+
+기본값으로 대체된 오류는 track_errors() 범위 안에서 기록되므로, 호출하는 쪽은
+"정상적으로 0건"인 결과와 "장애로 비어 있는" 결과를 구분할 수 있습니다. (검색 결과 캐시에서 사용)
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+_tracked_errors: ContextVar[Optional[List[str]]] = ContextVar("tracked_errors", default=None)
+
+
+@contextmanager
+def track_errors() -> Iterator[List[str]]:
+    """
+    범위 안에서 record_error()로 기록된 오류 목록을 모읍니다.
+    범위 안에서 만든 태스크도 같은 목록에 기록합니다. (태스크 생성 시 컨텍스트 복사)
+    """
+    errors: List[str] = []
+    token = _tracked_errors.set(errors)
+    try:
+        yield errors
+    finally:
+        try:
+            _tracked_errors.reset(token)
+        except ValueError:
+            # 비동기 제너레이터가 다른 컨텍스트에서 정리되는 경우
+            pass
+
+
+def record_error(label: str, error: Any):
+    """오류를 삼키고 기본값으로 대체할 때 호출 (track_errors 범위 밖이면 아무것도 하지 않음)"""
+    errors = _tracked_errors.get()
+    if errors is not None:
+        errors.append(f"{label}: {error}")
+
+
+async def run_with_timeout(
+    coro: Awaitable[Any],
+    timeout: float,
+    default: Any = None,
+    label: str = "작업"
+) -> Any:
+    """
+    코루틴을 제한 시간 안에 실행하고, 시간 초과나 오류 시 기본값을 반환합니다.
+    """
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        print(f"⏱️ {label} 시간 초과 ({timeout:.1f}초) → 기본값 사용")
+        record_error(label, "시간 초과")
+        return default
+    except Exception as e:
+        print(f"{label} 오류: {e}")
+        record_error(label, e)
+        return default
+
+
+async def gather_branches(
+    branches: Dict[str, Awaitable[Any]],
+    timeout: float,
+    default_factory: Callable[[], Any] = list
+) -> Dict[str, Any]:
+    """
+    이름이 붙은 브랜치들을 동시에 실행하고 {이름: 결과} 딕셔너리를 반환합니다.
+
+    전체 소요 시간은 브랜치 시간의 합이 아니라 최댓값(최대 timeout)이 됩니다.
+    """
+    names = list(branches)
+    results = await asyncio.gather(*(
+        run_with_timeout(branches[name], timeout, default_factory(), label=f"{name} 검색")
+        for name in names
+    ))
+    return dict(zip(names, results))
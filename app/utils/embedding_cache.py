@@ -0,0 +1,281 @@
+"""
+디스크 기반 임베딩 캐시
+
+(모델, 정규화된 텍스트) → float32 임베딩 벡터를 메모리 맵 파일에 저장합니다.
+서버 재시작 후에도 유지되며, 여러 uvicorn 워커가 같은 파일을 공유합니다.
+
+파일 구성 (차원별로 분리):
+- embeddings_{dim}.f32 : float32 벡터를 행 단위로 이어 붙인 파일 (np.memmap으로 읽음)
+- embeddings_{dim}.idx : "키\\t행번호" 한 줄씩 추가되는 인덱스 파일
+
+쓰기는 파일 잠금(fcntl) 아래에서 append만 하므로, 다른 워커는
+인덱스 파일의 새 줄만 읽어 들이면 최신 상태를 공유할 수 있습니다.
+
+조회(get/get_many)는 메모리의 인덱스와 메모리 맵만 사용하고 파일을 열지 않습니다.
+새 임베딩은 stage()로 메모리에 먼저 올려 바로 조회되게 하고, 디스크 기록(append/잠금/fsync)과
+다른 워커가 추가한 인덱스 꼬리 읽기는 flush()/refresh()에서 처리합니다.
+조회 미스가 나면 OpenAIClient가 maybe_refresh()로 refresh_interval마다 한 번씩
+인덱스 꼬리를 읽어 다른 워커가 기록한 임베딩을 다시 찾습니다.
+(OpenAIClient는 flush/maybe_refresh를 asyncio.to_thread로 실행하므로 이벤트 루프를 막지 않음)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.utils.vectors import Vector, normalize
+
+try:
+    import fcntl
+except ImportError:  # Windows: 워커 간 잠금 없이 동작
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_embedding_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (유니코드 NFC, 소문자, 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+class EmbeddingCache:
+    def __init__(self, cache_dir: str, model: str, dimension: int, refresh_interval: float = 1.0):
+        self.cache_dir = cache_dir
+        self.model = model
+        self.dimension = dimension
+        self.row_bytes = dimension * 4
+        # 미스 시 디스크 재확인 최소 간격 (초)
+        self.refresh_interval = refresh_interval
+        self._last_refresh = 0.0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.vectors_path = os.path.join(cache_dir, f"embeddings_{dimension}.f32")
+        self.index_path = os.path.join(cache_dir, f"embeddings_{dimension}.idx")
+        self.lock_path = os.path.join(cache_dir, f"embeddings_{dimension}.lock")
+
+        self._index: Dict[str, int] = {}
+        self._index_offset = 0
+        self._vectors: Optional[np.memmap] = None
+        # 아직 디스크에 쓰지 않은 임베딩 (키 → 정규화된 벡터)
+        self._unflushed: Dict[str, Vector] = {}
+        # _lock: 메모리 상태만 짧게 보호 (파일 I/O 중에는 잡지 않음), _io_lock: 파일 읽기/쓰기 직렬화
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self.refresh()
+        logger.info(f"임베딩 캐시 로드: {self.vectors_path} ({len(self._index)}개)")
+
+    def _make_key(self, text: str) -> str:
+        raw = f"{self.model}\x00{normalize_embedding_text(text)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _read_index_tail(self) -> Dict[str, int]:
+        """인덱스 파일에서 마지막으로 읽은 위치 이후의 줄만 읽음 (_io_lock 안에서 호출)"""
+        entries: Dict[str, int] = {}
+        if not os.path.exists(self.index_path):
+            return entries
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_offset)
+            while True:
+                line = f.readline()
+                # 쓰는 중인 마지막 줄(개행 없음)은 다음 갱신 때 읽음
+                if not line or not line.endswith(b"\n"):
+                    break
+                key, row = line.decode("utf-8").rstrip("\n").split("\t")
+                entries[key] = int(row)
+                self._index_offset = f.tell()
+        return entries
+
+    def _refresh_locked(self):
+        """다른 워커가 추가한 인덱스 줄과 늘어난 벡터 파일을 반영 (_io_lock 안에서 호출)"""
+        entries = self._read_index_tail()
+        rows = self._rows_on_disk()
+        vectors = self._vectors
+        if rows and (vectors is None or rows > vectors.shape[0]):
+            vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dimension))
+        with self._lock:
+            # 인덱스는 벡터 파일에 실제로 있는 행만 반영 (쓰다 끊긴 행 무시)
+            self._index.update({key: row for key, row in entries.items() if row < rows})
+            self._vectors = vectors
+            self._last_refresh = time.monotonic()
+
+    def refresh(self):
+        """다른 워커가 디스크에 추가한 항목을 읽어 들임 (파일 I/O, 이벤트 루프에서는 to_thread로 호출)"""
+        with self._io_lock:
+            self._refresh_locked()
+
+    def refresh_due(self) -> bool:
+        """마지막 갱신 후 refresh_interval이 지났는지 (파일을 열지 않음)"""
+        return time.monotonic() - self._last_refresh >= self.refresh_interval
+
+    def maybe_refresh(self) -> bool:
+        """
+        조회 미스 시 호출: refresh_interval이 지났으면 refresh (파일 I/O, 이벤트 루프에서는 to_thread로 호출)
+        
+        Returns:
+            갱신했으면 True
+        """
+        with self._lock:
+            if not self.refresh_due():
+                return False
+            # 동시에 들어온 다른 미스가 중복 갱신하지 않도록 먼저 기록
+            self._last_refresh = time.monotonic()
+        self.refresh()
+        return True
+
+    def _rows_on_disk(self) -> int:
+        if not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // self.row_bytes
+
+    def _lookup_locked(self, text: str) -> Optional[Vector]:
+        """메모리 맵/미기록 임베딩에서 조회 (_lock 안에서 호출, 통계 미반영)"""
+        key = self._make_key(text)
+        row = self._index.get(key)
+        if row is not None and self._vectors is not None and row < self._vectors.shape[0]:
+            # 메모리 맵에서 분리된 float32 배열로 복사 (저장 시 이미 정규화됨)
+            return np.array(self._vectors[row])
+
+        vector = self._unflushed.get(key)
+        if vector is not None:
+            return vector.copy()
+        return None
+
+    def get(self, text: str) -> Optional[Vector]:
+        """캐시에서 임베딩 조회 (없으면 None, 파일을 열지 않음)"""
+        with self._lock:
+            vector = self._lookup_locked(text)
+            if vector is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return vector
+
+    def get_many(self, texts: List[str]) -> List[Optional[Vector]]:
+        return [self.get(text) for text in texts]
+
+    def recheck_misses(self, texts: List[str], embeddings: List[Optional[Vector]]) -> List[Optional[Vector]]:
+        """refresh 후 미스였던 항목을 다시 조회 (찾은 항목은 미스에서 적중으로 옮겨 집계)"""
+        with self._lock:
+            result = []
+            for text, embedding in zip(texts, embeddings):
+                if embedding is None:
+                    embedding = self._lookup_locked(text)
+                    if embedding is not None:
+                        self.misses -= 1
+                        self.hits += 1
+                result.append(embedding)
+            return result
+
+    def find_missing(self, texts: List[str]) -> List[str]:
+        """캐시에 없는 텍스트 목록 (적중/미스 통계에 반영하지 않음, 최신 상태가 필요하면 먼저 refresh)"""
+        with self._lock:
+            return [
+                text for text in texts
+                if (key := self._make_key(text)) not in self._index and key not in self._unflushed
+            ]
+
+    def stage(self, texts: List[str], embeddings: Sequence[Sequence[float]]) -> int:
+        """
+        임베딩을 메모리에 추가해 바로 조회되게 합니다. (디스크 기록은 flush)
+        
+        Returns:
+            새로 추가된 개수 (이미 있는 키는 건너뜀)
+        """
+        staged = 0
+        with self._lock:
+            for text, embedding in zip(texts, embeddings):
+                key = self._make_key(text)
+                if key in self._index or key in self._unflushed:
+                    continue
+                vector = normalize(embedding)
+                if vector.shape != (self.dimension,):
+                    logger.warning(f"임베딩 차원 불일치로 캐시 생략: {vector.shape}")
+                    continue
+                self._unflushed[key] = vector
+                staged += 1
+        return staged
+
+    def unflushed_count(self) -> int:
+        return len(self._unflushed)
+
+    def flush(self):
+        """메모리에만 있는 임베딩을 디스크에 기록 (파일 잠금 + fsync, 이벤트 루프에서는 to_thread로 호출)"""
+        with self._io_lock:
+            with self._lock:
+                pending = dict(self._unflushed)
+            if not pending:
+                self._refresh_locked()
+                return
+
+            with open(self.lock_path, "a") as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    # 잠금을 잡은 뒤 다른 워커가 추가한 키를 다시 반영
+                    self._refresh_locked()
+                    with self._lock:
+                        to_write = {k: v for k, v in pending.items() if k not in self._index}
+
+                    if to_write:
+                        start_row = self._rows_on_disk()
+                        with open(self.vectors_path, "ab") as vf:
+                            # 이전 쓰기가 중간에 끊긴 경우 행 경계로 맞춤
+                            vf.truncate(start_row * self.row_bytes)
+                            vf.write(np.stack(list(to_write.values())).tobytes())
+                            vf.flush()
+                            os.fsync(vf.fileno())
+
+                        with open(self.index_path, "a", encoding="utf-8") as idx:
+                            # 쓰다 끊긴 마지막 줄(개행 없음)은 지우고 이어 씀
+                            idx.truncate(self._index_offset)
+                            idx.write("".join(
+                                f"{key}\t{start_row + i}\n" for i, key in enumerate(to_write)
+                            ))
+
+                    self._refresh_locked()
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+            with self._lock:
+                for key in pending:
+                    if key in self._index:
+                        self._unflushed.pop(key, None)
+
+    def put_many(self, texts: List[str], embeddings: Sequence[Sequence[float]]):
+        """임베딩을 캐시에 추가하고 바로 디스크에 기록 (동기 API, 스크립트/스레드용)"""
+        self.stage(texts, embeddings)
+        self.flush()
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._index) + len(self._unflushed),
+            "unflushed": len(self._unflushed),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "dimension": self.dimension
+        }
+
+
+# 프로세스 전역 인스턴스 (같은 파일을 여러 OpenAIClient가 공유)
+_embedding_caches: Dict[tuple, EmbeddingCache] = {}
+
+
+def get_embedding_cache(cache_dir: str, model: str, dimension: int, refresh_interval: float = 1.0) -> EmbeddingCache:
+    """임베딩 캐시 싱글톤 인스턴스 반환"""
+    key = (os.path.abspath(cache_dir), model, dimension)
+    if key not in _embedding_caches:
+        _embedding_caches[key] = EmbeddingCache(cache_dir, model, dimension, refresh_interval)
+    return _embedding_caches[key]
@@ -0,0 +1,74 @@
+"""
+테이블 기반 한글 자모 코덱
+
+오타 교정, 자모 색인(SymSpell/BK-tree) 등이 공통으로 쓰는 한글 음절 ↔ 자모 변환입니다.
+
+- 분해: 완성형 11,172자 전체의 자모 문자열을 미리 만든 번역 테이블로 str.translate 한 번에 처리
+  (문자열 길이만큼 파이썬 함수를 호출하지 않음)
+- 조합: 초성/중성/종성 → 인덱스 dict 조회로 list.index 없이 조합, 결과는 리스트에 모아 한 번에 join
+- 배치 API: decompose_many / compose_many
+
+compose는 기존 KoreanSpellChecker.compose_hangul과 결과가 글자 하나까지 같아야 합니다.
+(초성 자리에 모음/기타 문자가 오면 'ㅇ', 중성 자리에 자음/기타 문자가 오면 'ㅡ'로 대체하고,
+ 다음 글자가 종성으로 쓸 수 있는 자음이면 무조건 종성으로 붙이는 방식 그대로)
+"""
+
+from typing import Dict, Iterable, List
+
+CHO = ('ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+JUNG = ('ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ')
+JONG = ('', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+
+SYLLABLE_BASE = 0xAC00
+SYLLABLE_COUNT = len(CHO) * len(JUNG) * len(JONG)  # 11,172
+
+_CHO_INDEX: Dict[str, int] = {char: i for i, char in enumerate(CHO)}
+_JUNG_INDEX: Dict[str, int] = {char: i for i, char in enumerate(JUNG)}
+_JONG_INDEX: Dict[str, int] = {char: i for i, char in enumerate(JONG) if char}
+
+# 음절 코드 → 자모 문자열 (str.translate용)
+_DECOMPOSE_TABLE: Dict[int, str] = {
+    SYLLABLE_BASE + code: CHO[code // 588] + JUNG[(code % 588) // 28] + JONG[code % 28]
+    for code in range(SYLLABLE_COUNT)
+}
+
+# 초성/중성 자리에 올 수 없는 문자는 'ㅇ'/'ㅡ'로 대체
+_DEFAULT_CHO = _CHO_INDEX['ㅇ']
+_DEFAULT_JUNG = _JUNG_INDEX['ㅡ']
+
+
+def decompose(text: str) -> str:
+    """문자열 전체를 자모로 분해 (한글 음절 외 문자는 그대로)"""
+    return text.translate(_DECOMPOSE_TABLE)
+
+
+def decompose_many(texts: Iterable[str]) -> List[str]:
+    """여러 문자열을 자모로 분해"""
+    table = _DECOMPOSE_TABLE
+    return [text.translate(table) for text in texts]
+
+
+def compose(jamo: str) -> str:
+    """자모를 한글로 조합 (KoreanSpellChecker.compose_hangul과 같은 규칙)"""
+    length = len(jamo)
+    if length < 2:
+        return jamo
+
+    cho_index, jung_index, jong_index = _CHO_INDEX, _JUNG_INDEX, _JONG_INDEX
+    result = []
+    append = result.append
+    i = 0
+    while i < length - 1:
+        cho = cho_index.get(jamo[i], _DEFAULT_CHO)
+        jung = jung_index.get(jamo[i + 1], _DEFAULT_JUNG)
+        jong = jong_index.get(jamo[i + 2], 0) if i + 2 < length else 0
+        append(chr(SYLLABLE_BASE + (cho * 21 + jung) * 28 + jong))
+        i += 3 if jong else 2
+    if i < length:
+        append(jamo[i])
+    return "".join(result)
+
+
+def compose_many(jamo_texts: Iterable[str]) -> List[str]:
+    """여러 자모 문자열을 한글로 조합"""
+    return [compose(text) for text in jamo_texts]
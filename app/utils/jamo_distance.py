@@ -0,0 +1,86 @@
+"""
+자모 편집 거리 엔진 (Myers / Hyyrö 비트 병렬 알고리즘)
+
+오타 교정 후보를 음절이 아닌 자모 단위로 비교합니다.
+('라먼' vs '라면'은 음절 거리 1이지만 실제로는 모음 하나만 다른 자모 거리 1,
+ '크면' vs '라면'은 음절 거리 1이지만 자모 거리 2)
+
+- 질의 문자열의 문자별 비트 마스크(Peq)를 한 번만 만들고, 후보 한 글자마다
+  파이썬 정수 비트 연산 몇 번으로 DP 한 열 전체를 갱신 → O(⌈m/w⌉·n), 파이썬 정수라 길이 제한 없음
+- JamoPattern은 질의를 미리 컴파일해 두고 수천 개 후보를 연속으로 채점하는 배치 API
+"""
+
+from typing import Dict, List, Sequence
+
+
+class JamoPattern:
+    """한 질의(자모 문자열)에 대해 미리 계산한 비트 마스크"""
+
+    __slots__ = ("text", "length", "_peq", "_mask", "_last")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.length = len(text)
+        peq: Dict[str, int] = {}
+        for i, char in enumerate(text):
+            peq[char] = peq.get(char, 0) | (1 << i)
+        self._peq = peq
+        self._mask = (1 << self.length) - 1
+        self._last = 1 << (self.length - 1) if self.length else 0
+
+    def distance(self, other: str) -> int:
+        """other와의 Levenshtein 거리 (삽입/삭제/치환 각 1)"""
+        m = self.length
+        if m == 0:
+            return len(other)
+        if not other:
+            return m
+
+        peq = self._peq
+        mask = self._mask
+        last = self._last
+        pv = mask   # 세로 방향 +1 비트
+        mv = 0      # 세로 방향 -1 비트
+        score = m
+
+        for char in other:
+            eq = peq.get(char, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | ~(xh | pv)
+            mh = pv & xh
+            if ph & last:
+                score += 1
+            elif mh & last:
+                score -= 1
+            # 첫 행은 D[0][j] = j (전역 정렬)이므로 가로 +1을 밀어 넣음
+            ph = (ph << 1) | 1
+            mh <<= 1
+            pv = (mh | ~(xv | ph)) & mask
+            mv = ph & xv
+
+        return score
+
+    def distances(self, candidates: Sequence[str]) -> List[int]:
+        """여러 후보와의 거리 (배치)"""
+        distance = self.distance
+        return [distance(candidate) for candidate in candidates]
+
+    def similarity(self, other: str) -> float:
+        """1 - 거리 / 긴 쪽 길이 (0.0 ~ 1.0)"""
+        longest = max(self.length, len(other))
+        if longest == 0:
+            return 1.0
+        return 1.0 - self.distance(other) / longest
+
+
+def jamo_distance(a: str, b: str) -> int:
+    """두 자모 문자열의 편집 거리 (짧은 쪽을 패턴으로 사용)"""
+    if len(a) > len(b):
+        a, b = b, a
+    return JamoPattern(a).distance(b)
+
+
+def batch_jamo_distances(query: str, candidates: Sequence[str]) -> List[int]:
+    """질의 하나와 후보 여러 개의 편집 거리 (질의 마스크를 한 번만 계산)"""
+    return JamoPattern(query).distances(candidates)
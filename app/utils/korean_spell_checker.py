@@ -1,10 +1,19 @@
 import re
 import asyncio
-from typing import Dict, List, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional
 from app.clients.opensearch_client import opensearch_client
+from app.config.settings import get_settings
+from app.utils.symspell_index import SymSpellIndex
+from app.utils.bk_tree import BKTree
+from app.utils.concurrency import track_errors, record_error
+from app.utils.jamo_distance import JamoPattern, jamo_distance
+from app.utils import hangul
 
 class KoreanSpellChecker:
     def __init__(self):
+        self.settings = get_settings()
+        
         # 한글 자모 매핑
         self.cho = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
         self.jung = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ']
@@ -26,72 +35,153 @@ class KoreanSpellChecker:
             'ㄷ': ['ㅅ', 'ㄱ'],
             'ㄱ': ['ㄷ', 'ㅂ']
         }
+        
+        # 레시피명/재료명 자모 삭제 변형 색인 (오타 교정을 네트워크 없이 처리, 없으면 OpenSearch 조회)
+        self.local_index = SymSpellIndex(self.to_jamo, max_distance=self.settings.spell_index_max_distance)
+        # 같은 이름 목록의 BK-tree (거리 k 이내 후보 전체를 순위대로 반환, 추천 후보용)
+        self.name_tree = BKTree(self.to_jamo)
+        self._index_fingerprint = None
+        self.local_hits = 0
+        self.opensearch_lookups = 0
+        self.opensearch_errors = 0
+        
+        # 교정 결과 LRU 캐시 (입력 → 교정 결과, 교정 불필요도 그대로 저장). 색인 갱신 시 비움
+        self.correction_cache: "OrderedDict[str, str]" = OrderedDict()
+        self.correction_cache_hits = 0
+        self.correction_cache_misses = 0
     
     def decompose_hangul(self, char):
         """한글 자모 분해"""
-        if not ('가' <= char <= '힣'):
-            return char
-            
-        code = ord(char) - ord('가')
-        cho_idx = code // (21 * 28)
-        jung_idx = (code % (21 * 28)) // 28
-        jong_idx = code % 28
-        
-        return self.cho[cho_idx] + self.jung[jung_idx] + (self.jong[jong_idx] if jong_idx else '')
+        return hangul.decompose(char)
+    
+    def to_jamo(self, text: str) -> str:
+        """문자열 전체를 자모로 분해 (한글 외 문자는 그대로)"""
+        return hangul.decompose(text)
     
     def compose_hangul(self, jamo_str):
         """자모를 한글로 조합"""
-        if len(jamo_str) < 2:
-            return jamo_str
-            
-        result = ""
-        i = 0
-        while i < len(jamo_str):
-            if i + 1 < len(jamo_str):
-                cho = jamo_str[i] if jamo_str[i] in self.cho else 'ㅇ'
-                jung = jamo_str[i+1] if jamo_str[i+1] in self.jung else 'ㅡ'
-                jong = jamo_str[i+2] if i+2 < len(jamo_str) and jamo_str[i+2] in self.jong[1:] else ''
-                
-                try:
-                    cho_idx = self.cho.index(cho)
-                    jung_idx = self.jung.index(jung)
-                    jong_idx = self.jong.index(jong) if jong else 0
-                    
-                    code = ord('가') + (cho_idx * 21 + jung_idx) * 28 + jong_idx
-                    result += chr(code)
-                    
-                    i += 3 if jong else 2
-                except ValueError:
-                    result += jamo_str[i]
-                    i += 1
-            else:
-                result += jamo_str[i]
-                i += 1
-                
-        return result
+        return hangul.compose(jamo_str)
     
     async def correct_typo(self, text: str) -> str:
-        """오타 교정 메인 함수"""
+        """오타 교정 메인 함수 (같은 입력은 LRU 캐시에서 바로 반환)"""
         original_text = text.strip()
         
         if not original_text:
             return original_text
         
+        cached = self.correction_cache.get(original_text)
+        if cached is not None:
+            self.correction_cache.move_to_end(original_text)
+            self.correction_cache_hits += 1
+            return cached
+        self.correction_cache_misses += 1
+        
+        with track_errors() as errors:
+            corrected = await self._correct_typo(original_text)
+        
+        # 조회 실패(msearch가 빈 결과로 대체한 경우 포함)로 얻은 결과는 캐시하지 않음
+        if not errors:
+            self.correction_cache[original_text] = corrected
+            self.correction_cache.move_to_end(original_text)
+            while len(self.correction_cache) > self.settings.spell_correction_cache_size:
+                self.correction_cache.popitem(last=False)
+        
+        return corrected
+    
+    async def _correct_typo(self, original_text: str) -> str:
+        """캐시를 거치지 않는 실제 교정"""
         # 1. 자모 분리된 텍스트 처리 (ㄹㅏ면 → 라면)
         if re.match(r'^[ㄱ-ㅎㅏ-ㅣ\s]+$', original_text):
             composed = self.compose_hangul(original_text.replace(' ', ''))
             if composed != original_text:
                 print(f"🔧 자모 조합: '{original_text}' → '{composed}'")
-                return await self.find_similar_word_opensearch(composed)
+                return await self.find_similar_word(composed)
         
-        # 2. OpenSearch에서 유사한 단어 검색
-        corrected = await self.find_similar_word_opensearch(original_text)
+        # 2. 로컬 색인 → (없으면) OpenSearch에서 유사한 단어 검색
+        corrected = await self.find_similar_word(original_text)
         
         if corrected != original_text:
             print(f"🔧 오타 교정: '{original_text}' → '{corrected}'")
         
         return corrected
     
+    async def find_similar_word(self, word: str) -> str:
+        """로컬 자모 색인에서 먼저 찾고, 허용 거리 안에 후보가 없을 때만 OpenSearch 조회"""
+        match = self.local_index.lookup(word)
+        if match is not None:
+            self.local_hits += 1
+            return match[0]
+        
+        self.opensearch_lookups += 1
+        return await self.find_similar_word_opensearch(word)
+    
+    async def refresh_index(self, force: bool = False) -> bool:
+        """
+        레시피/재료 인덱스의 이름으로 로컬 오타 교정 색인을 다시 만듭니다.
+        인덱스 지문(문서 수/색인 횟수)이 바뀌지 않았으면 건너뜀
+        
+        Returns:
+            색인을 다시 만들었으면 True
+        """
+        try:
+            fingerprint = await opensearch_client.get_index_fingerprint()
+        except Exception as e:
+            print(f"⚠️ 오타 교정 색인 지문 조회 실패: {e}")
+            fingerprint = None
+        
+        if not force and len(self.local_index) and fingerprint is not None and fingerprint == self._index_fingerprint:
+            return False
+        
+        recipe_names, ingredient_names = await asyncio.gather(
+            self._collect_names(opensearch_client.recipes_index, "recipe_id"),
+            self._collect_names(opensearch_client.ingredients_index, "ingredient_id")
+        )
+        names = recipe_names + ingredient_names
+        self.local_index.build(names)
+        self.name_tree.build(names)
+        self._index_fingerprint = fingerprint
+        # 이름 목록이 바뀌었으므로 이전 교정 결과는 버림
+        self.correction_cache.clear()
+        
+        stats = self.local_index.stats()
+        tree_stats = self.name_tree.stats()
+        print(
+            f"🔤 오타 교정 색인 갱신: 이름 {stats['words']}개, 삭제 변형 {stats['delete_variants']}개 ({stats['build_ms']}ms), "
+            f"BK-tree {tree_stats['names']}개 ({tree_stats['build_ms']}ms)"
+        )
+        return True
+    
+    async def _collect_names(self, index_name: str, sort_field: str) -> List[str]:
+        """로컬 벡터 스냅샷이 있으면 스냅샷의 이름을, 없으면 OpenSearch에서 이름 필드 전체를 가져옴"""
+        local_index = opensearch_client.local_indexes.get(index_name)
+        if local_index is not None:
+            return [str(name) for name in local_index.values("name")]
+        return await opensearch_client.fetch_field_values(index_name, "name", sort_field)
+    
+    async def run_index_refresh(self, interval: float):
+        """interval초마다 로컬 오타 교정 색인 갱신 (서버 수명 동안 백그라운드 실행)"""
+        while True:
+            try:
+                await self.refresh_index()
+            except Exception as e:
+                print(f"⚠️ 오타 교정 색인 갱신 실패 (OpenSearch 교정으로 동작): {e}")
+            await asyncio.sleep(interval)
+    
+    def index_stats(self) -> Dict[str, float]:
+        """로컬 오타 교정 색인 정보 및 적중 통계"""
+        return {
+            **self.local_index.stats(),
+            "bk_tree": self.name_tree.stats(),
+            "local_hits": self.local_hits,
+            "opensearch_lookups": self.opensearch_lookups,
+            "opensearch_errors": self.opensearch_errors,
+            "correction_cache": {
+                "entries": len(self.correction_cache),
+                "hits": self.correction_cache_hits,
+                "misses": self.correction_cache_misses
+            }
+        }
+    
     async def find_similar_word_opensearch(self, word: str) -> str:
         """OpenSearch에서 유사한 단어 찾기"""
         try:
@@ -135,29 +225,26 @@ class KoreanSpellChecker:
                 "_source": ["name", "category"]
             }
             
-            # 레시피와 재료 모두에서 검색
-            recipe_response = await opensearch_client.search(index="recipes", body=search_body)
-            ingredient_response = await opensearch_client.search(index="ingredients", body=search_body)
+            # 레시피와 재료 모두에서 검색 (한 번의 msearch 왕복)
+            recipe_response, ingredient_response = await opensearch_client.msearch([
+                (opensearch_client.recipes_index, search_body),
+                (opensearch_client.ingredients_index, search_body)
+            ])
             
-            candidates = []
+            # 레시피명/재료명 후보를 모아 자모 유사도를 한 번에 계산
+            hits = [
+                (hit["_source"].get("name", ""), hit["_score"], "recipe")
+                for hit in recipe_response["hits"]["hits"]
+            ] + [
+                (hit["_source"].get("name", ""), hit["_score"], "ingredient")
+                for hit in ingredient_response["hits"]["hits"]
+            ]
+            similarities = self.batch_similarity(word, [name for name, _, _ in hits])
             
-            # 레시피명에서 후보 수집
-            for hit in recipe_response["hits"]["hits"]:
-                name = hit["_source"].get("name", "")
-                score = hit["_score"]
-                similarity = self.calculate_similarity(word, name)
-                
+            candidates = []
+            for (name, score, source), similarity in zip(hits, similarities):
                 if similarity > 0.5:  # 유사도 임계값
-                    candidates.append((name, score * similarity, "recipe"))
-            
-            # 재료명에서 후보 수집
-            for hit in ingredient_response["hits"]["hits"]:
-                name = hit["_source"].get("name", "")
-                score = hit["_score"]
-                similarity = self.calculate_similarity(word, name)
-                
-                if similarity > 0.5:
-                    candidates.append((name, score * similarity, "ingredient"))
+                    candidates.append((name, score * similarity, source))
             
             # 점수순 정렬
             candidates.sort(key=lambda x: x[1], reverse=True)
@@ -173,40 +260,67 @@ class KoreanSpellChecker:
             return word
             
         except Exception as e:
+            self.opensearch_errors += 1
+            record_error("OpenSearch 오타 교정", e)
             print(f"OpenSearch 오타 교정 실패: {e}")
             return word
     
     def calculate_similarity(self, word1: str, word2: str) -> float:
-        """Levenshtein distance 기반 유사도 계산"""
-        if len(word1) == 0 or len(word2) == 0:
-            return 0
-            
-        # 길이 차이가 너무 크면 유사도 낮음
-        if abs(len(word1) - len(word2)) > max(len(word1), len(word2)) // 2:
-            return 0
-            
-        matrix = [[0] * (len(word2) + 1) for _ in range(len(word1) + 1)]
+        """자모 단위 편집 거리 기반 유사도 (한 음절 안의 자모 하나 오타는 거리 1)"""
+        return self.batch_similarity(word1, [word2])[0]
+    
+    def batch_similarity(self, word: str, candidates: List[str]) -> List[float]:
+        """한 단어와 여러 후보의 자모 유사도 (질의 비트 마스크를 한 번만 계산)"""
+        jamo = self.to_jamo(word)
+        pattern = JamoPattern(jamo)
+        similarities = []
+        for other in hangul.decompose_many(candidates):
+            longest = max(len(jamo), len(other))
+            # 비어 있거나 길이 차이가 너무 크면 유사도 낮음
+            if not jamo or not other or abs(len(jamo) - len(other)) > longest // 2:
+                similarities.append(0)
+                continue
+            similarities.append(1 - pattern.distance(other) / longest)
+        return similarities
+    
+    def jamo_distance(self, word1: str, word2: str) -> int:
+        """두 단어의 자모 편집 거리"""
+        return jamo_distance(self.to_jamo(word1), self.to_jamo(word2))
+    
+    def suggest(self, word: str, max_distance: Optional[int] = None, limit: int = 5) -> List[Dict[str, object]]:
+        """
+        레시피명/재료명 중 word와 자모 편집 거리 max_distance 이내인 후보 (BK-tree)
         
-        for i in range(len(word1) + 1):
-            matrix[i][0] = i
-        for j in range(len(word2) + 1):
-            matrix[0][j] = j
-            
-        for i in range(1, len(word1) + 1):
-            for j in range(1, len(word2) + 1):
-                cost = 0 if word1[i-1] == word2[j-1] else 1
-                matrix[i][j] = min(
-                    matrix[i-1][j] + 1,      # deletion
-                    matrix[i][j-1] + 1,      # insertion
-                    matrix[i-1][j-1] + cost  # substitution
-                )
-        
-        distance = matrix[len(word1)][len(word2)]
-        max_len = max(len(word1), len(word2))
-        return 1 - (distance / max_len)
+        Args:
+            max_distance: None이면 단어 길이에 따른 기본 허용 거리 (짧은 단어는 0~1)
+        
+        Returns:
+            [{"name", "distance", "similarity"}] 거리 → 빈도 → 길이 순 (입력과 같은 이름은 제외)
+        """
+        word = word.strip()
+        if not word or not len(self.name_tree):
+            return []
+        
+        jamo = self.to_jamo(word.lower())
+        if max_distance is None:
+            max_distance = self.local_index.allowed_distance(len(jamo))
+        
+        suggestions = []
+        for name, distance, _ in self.name_tree.search(word, max_distance):
+            if distance == 0 and name.lower() == word.lower():
+                continue
+            longest = max(len(jamo), len(self.to_jamo(name.lower())))
+            suggestions.append({
+                "name": name,
+                "distance": distance,
+                "similarity": round(1 - distance / longest, 4) if longest else 1.0
+            })
+            if len(suggestions) >= limit:
+                break
+        return suggestions
     
     def get_typo_suggestions(self, word: str) -> List[str]:
-        """오타 교정 후보들 반환"""
+        """오타 교정 후보들 반환 (실제 레시피명/재료명 우선, 색인이 없을 때만 키보드 인접 키 치환)"""
         suggestions = []
         
         # 자모 분리된 경우
@@ -214,6 +328,14 @@ class KoreanSpellChecker:
             composed = self.compose_hangul(word.replace(' ', ''))
             if composed != word:
                 suggestions.append(composed)
+                word = composed
+        
+        # BK-tree에서 거리순 후보
+        if len(self.name_tree):
+            for candidate in self.suggest(word, limit=5):
+                if candidate["name"] not in suggestions:
+                    suggestions.append(candidate["name"])
+            return suggestions[:5]
         
         # 키보드 인접 키 오타 교정
         for i, char in enumerate(word):
@@ -0,0 +1,162 @@
+"""
+로컬 경량 재정렬기
+
+검색 후보를 OpenAI 호출 없이 간단한 특징만으로 0-100점으로 다시 매깁니다.
+(후보 수십 개 기준 수백 마이크로초)
+
+특징:
+- 검색 점수 (텍스트/벡터 통합 정규화 점수, 0-100)
+- 텍스트 + 벡터 검색에 모두 잡혔는지
+- 정확 매칭 보너스 (OpenAIRelevanceScorer._calculate_exact_match_bonus와 동일)
+- 관련성 보너스 (검색어 단어가 레시피명/재료에 포함, FinalStrict의 _calculate_relevance_bonus와 같은 가중치)
+- 동의어 적중 수 (동의어 사전으로 확장한 검색어가 레시피명/재료에 포함)
+
+RERANK_MODE=hybrid이면 로컬 점수가 통과 기준 ± RERANK_UNCERTAINTY_MARGIN 안에 있는
+애매한 후보만 LLM으로 재평가합니다. (llm: 전부 LLM, 기본값 / local: LLM 호출 없음)
+
+통계의 llm_calls는 관련성 캐시에 없어 실제로 보낸 OpenAI 요청 수이고,
+캐시로 답한 후보는 cache_hits로 따로 셉니다. llm_calls_saved는 로컬 재정렬로 줄인 호출 수만 셉니다.
+"""
+
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .synonym_matcher import get_synonym_matcher
+
+RERANK_MODES = ("llm", "hybrid", "local")
+DEFAULT_RERANK_MODE = "llm"
+
+
+class RerankStats:
+    """재정렬 누적 통계 (LLM 호출 절감량 보고용)"""
+
+    def __init__(self):
+        self.queries = 0
+        self.candidates = 0
+        self.escalated = 0
+        self.llm_calls = 0
+        self.llm_calls_saved = 0
+        self.cache_hits = 0
+        self.local_time = 0.0
+
+    def record(self, candidates: int, escalated: int, batch_size: int, local_time: float) -> int:
+        """로컬 재정렬 한 번 기록, 로컬 재정렬로 줄인 LLM 호출 수 반환"""
+        full_calls = math.ceil(candidates / batch_size) if candidates else 0
+        calls = math.ceil(escalated / batch_size) if escalated else 0
+        self.queries += 1
+        self.candidates += candidates
+        self.escalated += escalated
+        self.llm_calls_saved += full_calls - calls
+        self.local_time += local_time
+        return full_calls - calls
+
+    def record_llm(self, calls: int, cache_hits: int):
+        """LLM 평가 한 번 기록 (실제 OpenAI 요청 수, 관련성 캐시로 답한 후보 수)"""
+        self.llm_calls += calls
+        self.cache_hits += cache_hits
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "queries": self.queries,
+            "candidates": self.candidates,
+            "escalated": self.escalated,
+            "escalation_rate": round(self.escalated / self.candidates, 4) if self.candidates else 0.0,
+            "llm_calls": self.llm_calls,
+            "llm_calls_saved": self.llm_calls_saved,
+            "cache_hits": self.cache_hits,
+            "avg_local_us": round(self.local_time / self.queries * 1e6, 1) if self.queries else 0.0
+        }
+
+
+_rerank_stats = RerankStats()
+
+
+def get_rerank_stats() -> RerankStats:
+    """프로세스 전역 재정렬 통계"""
+    return _rerank_stats
+
+
+class LocalReranker:
+    def __init__(self, exact_match_bonus: Callable[[str, str], float]):
+        self.exact_match_bonus = exact_match_bonus
+        self.synonym_matcher = get_synonym_matcher()
+
+    def score(self, query: str, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        후보마다 local_score(0-100)를 계산하고 score를 로컬 점수로 바꿉니다. (원본 점수는 original_vector_score에 보관)
+        """
+        terms = [term for term in query.lower().split() if term]
+        # 검색어 단어별 동의어는 후보마다가 아니라 한 번만 확장
+        synonyms = {
+            synonym.lower()
+            for term in terms
+            for synonym in self.synonym_matcher.expand_ingredient_query(term)
+            if synonym.lower() != term
+        }
+
+        for candidate in candidates:
+            name = candidate.get('rcp_nm', candidate.get('name', ''))
+            ingredients = self._ingredients_text(candidate).lower()
+            name_lower = name.lower()
+            search_score = float(candidate.get('score', 0) or 0)
+
+            exact_bonus = self.exact_match_bonus(query, name)
+            relevance_bonus = self._relevance_bonus(terms, name_lower, ingredients)
+            synonym_hits = sum(
+                1 for synonym in synonyms if synonym in name_lower or synonym in ingredients
+            )
+            match_reason = candidate.get('match_reason', '')
+            both_sources = "벡터" in match_reason and "텍스트" in match_reason
+
+            local_score = (
+                0.5 * min(search_score, 100.0)
+                + exact_bonus
+                + 0.4 * min(relevance_bonus, 50.0)
+                + min(synonym_hits, 2) * 5.0
+                + (10.0 if both_sources else 0.0)
+            )
+            local_score = round(max(0.0, min(local_score, 100.0)), 2)
+
+            candidate['original_vector_score'] = candidate.get('score', 0)
+            candidate['local_score'] = local_score
+            candidate['exact_match_bonus'] = exact_bonus
+            candidate['score'] = local_score
+
+        return candidates
+
+    def uncertain(
+        self,
+        candidates: List[Dict[str, Any]],
+        threshold: float,
+        margin: float
+    ) -> List[Dict[str, Any]]:
+        """로컬 점수가 통과 기준 근처(threshold ± margin)라 LLM 판단이 필요한 후보"""
+        return [
+            candidate for candidate in candidates
+            if abs(candidate.get('local_score', 0.0) - threshold) <= margin
+        ]
+
+    def _relevance_bonus(self, terms: List[str], name_lower: str, ingredients_lower: str) -> float:
+        """검색어 단어가 레시피명(+30)/재료(+20)에 포함되면 보너스"""
+        bonus = 0.0
+        for term in terms:
+            if term in name_lower:
+                bonus += 30.0
+            if term in ingredients_lower:
+                bonus += 20.0
+        return bonus
+
+    def _ingredients_text(self, candidate: Dict[str, Any]) -> str:
+        ingredients = candidate.get('ingredients', [])
+        if isinstance(ingredients, str):
+            return ingredients
+        names = []
+        for ingredient in ingredients or []:
+            names.append(ingredient.get('name', '') if isinstance(ingredient, dict) else str(ingredient))
+        return ", ".join(names)
+
+
+def rerank_mode(mode: Optional[str]) -> str:
+    """잘못된 RERANK_MODE 값은 기본값(llm)으로 처리"""
+    return mode if mode in RERANK_MODES else DEFAULT_RERANK_MODE
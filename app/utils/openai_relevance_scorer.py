@@ -5,27 +5,43 @@ OpenAI 기반 관련성 점수 계산기
 """
 
 import asyncio
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional
 import json
-from ..clients.openai_client import OpenAIClient
+from ..clients.openai_client import OpenAIClient, openai_client as default_openai_client
+from ..config.settings import get_settings
+from .relevance_cache import get_relevance_cache
+from .local_reranker import LocalReranker, get_rerank_stats, rerank_mode
+
+# 점수 프롬프트를 바꾸면 버전을 올려서 캐시된 이전 점수를 무시
+SCORING_PROMPT_VERSION = "scorer-v1"
 
 class OpenAIRelevanceScorer:
-    def __init__(self):
-        self.openai_client = OpenAIClient()
+    def __init__(self, openai_client: Optional[OpenAIClient] = None):
+        self.openai_client = openai_client or default_openai_client
+        self.settings = get_settings()
+        # 프로세스 전체 공유 관련성 캐시 (비활성화 시 None)
+        self.cache = get_relevance_cache()
+        self.max_concurrency = self.settings.relevance_scoring_concurrency
+        self.timeout = self.settings.relevance_scoring_timeout
     
     async def score_recipes_relevance(
         self, 
         query: str, 
         recipes: List[Dict[str, Any]], 
-        batch_size: int = 5
+        batch_size: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         OpenAI를 사용해 레시피들의 관련성을 평가
         
+        이전에 평가한 (검색어, 레시피)는 관련성 캐시의 점수를 그대로 사용하고 나머지만 OpenAI로 평가합니다.
+        배치들은 최대 max_concurrency개까지 동시에 요청하고, 전체 마감 시간(timeout)이 지나면
+        남은 배치를 취소합니다. 평가되지 못한 레시피는 원래 점수를 유지합니다.
+        
         Args:
             query: 사용자 검색어 (예: "과일 파이")
             recipes: 평가할 레시피 리스트
-            batch_size: 한 번에 평가할 레시피 수
+            batch_size: 한 번에 평가할 레시피 수 (기본값: Settings.relevance_scoring_batch_size)
         
         Returns:
             관련성 점수가 추가된 레시피 리스트
@@ -33,13 +49,53 @@ class OpenAIRelevanceScorer:
         if not recipes:
             return recipes
         
-        scored_recipes = []
+        # 캐시에 있는 레시피는 바로 점수 적용
+        uncached = []
+        for recipe in recipes:
+            ai_score = self._get_cached_score(query, recipe)
+            if ai_score is None:
+                uncached.append(recipe)
+            else:
+                self._apply_ai_score(query, recipe, ai_score)
+        if len(uncached) < len(recipes):
+            print(f"AI 관련성 캐시 적중: {len(recipes) - len(uncached)}/{len(recipes)}개")
+        
+        batch_size = batch_size or self.settings.relevance_scoring_batch_size
+        batches = [uncached[i:i + batch_size] for i in range(0, len(uncached), batch_size)]
+        get_rerank_stats().record_llm(len(batches), len(recipes) - len(uncached))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        start_time = time.time()
+        
+        async def score_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._score_batch(query, batch)
+        
+        # 배치 단위로 동시 처리 (OpenAI API 효율성, 동시 요청 수 제한)
+        tasks = [asyncio.create_task(score_batch(batch)) for batch in batches]
+        pending = set()
+        if tasks:
+            try:
+                _, pending = await asyncio.wait(tasks, timeout=self.timeout)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+        
+        if pending:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            
+            # 마감 시간 초과: 평가되지 못한 레시피는 원래 점수 유지
+            unscored = 0
+            for task, batch in zip(tasks, batches):
+                if task in pending:
+                    self._keep_original_scores(batch)
+                    unscored += len(batch)
+            print(f"⏱️ AI 관련성 평가 마감 시간 초과 ({self.timeout}초): {unscored}개는 원래 점수 유지")
         
-        # 배치 단위로 처리 (OpenAI API 효율성)
-        for i in range(0, len(recipes), batch_size):
-            batch = recipes[i:i + batch_size]
-            batch_scores = await self._score_batch(query, batch)
-            scored_recipes.extend(batch_scores)
+        scored_recipes = list(recipes)
+        print(f"AI 관련성 평가: {len(batches)}개 배치, {time.time() - start_time:.2f}초")
         
         # 점수순 정렬
         scored_recipes.sort(key=lambda x: x.get('ai_relevance_score', 0), reverse=True)
@@ -75,32 +131,61 @@ class OpenAIRelevanceScorer:
             
             # 결과에 점수 추가
             for i, recipe in enumerate(recipe_batch):
-                recipe_name = recipe.get('rcp_nm', recipe.get('name', ''))
-                ai_score = scores.get(str(i+1), 50.0)  # 기본값 50점
-                original_score = recipe.get('score', 0)
-                
-                # 정확한 매칭 보너스 계산
-                exact_match_bonus = self._calculate_exact_match_bonus(query, recipe_name)
-                
-                # 최종 점수 계산: AI 점수 + 정확 매칭 보너스
-                final_score = min(ai_score + exact_match_bonus, 100.0)
-                
-                recipe['ai_relevance_score'] = ai_score
-                recipe['exact_match_bonus'] = exact_match_bonus
-                recipe['original_vector_score'] = original_score
-                recipe['score'] = round(final_score, 2)
-                
-                print(f"  - {recipe_name}: AI={ai_score:.1f}, 보너스={exact_match_bonus:.1f}, 최종={final_score:.1f}")
+                if str(i+1) in scores:
+                    ai_score = scores[str(i+1)]
+                    self._store_cached_score(query, recipe, ai_score)
+                else:
+                    ai_score = 50.0  # 기본값 50점 (캐시하지 않음)
+                self._apply_ai_score(query, recipe, ai_score)
             
             return recipe_batch
             
         except Exception as e:
             print(f"OpenAI 관련성 평가 오류: {e}")
             # 오류 시 원본 점수 유지
-            for recipe in recipe_batch:
-                recipe['ai_relevance_score'] = recipe.get('score', 50.0)
+            self._keep_original_scores(recipe_batch)
             return recipe_batch
     
+    def _apply_ai_score(self, query: str, recipe: Dict[str, Any], ai_score: float):
+        """AI 점수 + 정확 매칭 보너스로 최종 점수 계산"""
+        recipe_name = recipe.get('rcp_nm', recipe.get('name', ''))
+        original_score = recipe.get('score', 0)
+        
+        # 정확한 매칭 보너스 계산
+        exact_match_bonus = self._calculate_exact_match_bonus(query, recipe_name)
+        
+        # 최종 점수 계산: AI 점수 + 정확 매칭 보너스
+        final_score = min(ai_score + exact_match_bonus, 100.0)
+        
+        recipe['ai_relevance_score'] = ai_score
+        recipe['exact_match_bonus'] = exact_match_bonus
+        # 로컬 재순위를 거친 후보는 원본 점수가 이미 보관되어 있고, 현재 점수는 local_score에 있음
+        recipe.setdefault('original_vector_score', original_score)
+        recipe['score'] = round(final_score, 2)
+        
+        print(f"  - {recipe_name}: AI={ai_score:.1f}, 보너스={exact_match_bonus:.1f}, 최종={final_score:.1f}")
+    
+    def _recipe_cache_id(self, recipe: Dict[str, Any]) -> str:
+        """캐시 키용 레시피 ID (ID가 없으면 레시피명)"""
+        recipe_id = recipe.get('rcp_seq') or recipe.get('recipe_id')
+        if recipe_id:
+            return str(recipe_id)
+        return "name:" + recipe.get('rcp_nm', recipe.get('name', ''))
+    
+    def _get_cached_score(self, query: str, recipe: Dict[str, Any]) -> Optional[float]:
+        if self.cache is None:
+            return None
+        return self.cache.get(query, self._recipe_cache_id(recipe), SCORING_PROMPT_VERSION)
+    
+    def _store_cached_score(self, query: str, recipe: Dict[str, Any], ai_score: float):
+        if self.cache is not None:
+            self.cache.put(query, self._recipe_cache_id(recipe), SCORING_PROMPT_VERSION, ai_score)
+    
+    def _keep_original_scores(self, recipe_batch: List[Dict[str, Any]]):
+        """평가하지 못한 레시피는 원본 점수를 AI 점수로 사용"""
+        for recipe in recipe_batch:
+            recipe['ai_relevance_score'] = recipe.get('score', 50.0)
+    
     def _create_scoring_prompt(self, query: str, recipe_texts: List[str]) -> str:
         """고품질 OpenAI 점수 평가 프롬프트 생성"""
         
@@ -141,7 +226,7 @@ class OpenAIRelevanceScorer:
     async def _call_openai_for_scoring(self, prompt: str) -> str:
         """OpenAI API 호출"""
         try:
-            response = await self.openai_client.client.chat.completions.create(
+            response = await self.openai_client.chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {
@@ -181,8 +266,8 @@ class OpenAIRelevanceScorer:
             
         except json.JSONDecodeError:
             print(f"OpenAI 응답 파싱 실패: {response}")
-            # 파싱 실패 시 기본 점수 반환
-            return {"1": 50.0, "2": 50.0, "3": 50.0, "4": 50.0, "5": 50.0}
+            # 파싱 실패 시 빈 결과 → 모든 레시피 기본 점수 (캐시하지 않음)
+            return {}
     
     def _extract_ingredients_text(self, recipe: Dict[str, Any]) -> str:
         """레시피에서 재료 텍스트 추출"""
@@ -244,9 +329,11 @@ class OpenAIRelevanceScorer:
 
 # 기존 SmartScoreCalculator를 대체하는 간단한 래퍼
 class AIEnhancedScoreCalculator:
-    def __init__(self, min_score_threshold: float = 40.0):
-        self.ai_scorer = OpenAIRelevanceScorer()
+    def __init__(self, min_score_threshold: float = 40.0, openai_client: Optional[OpenAIClient] = None):
+        self.ai_scorer = OpenAIRelevanceScorer(openai_client)
         self.min_score_threshold = min_score_threshold
+        self.reranker = LocalReranker(self.ai_scorer._calculate_exact_match_bonus)
+        self.settings = self.ai_scorer.settings
     
     async def enhance_search_results(
         self, 
@@ -257,11 +344,20 @@ class AIEnhancedScoreCalculator:
         검색 결과를 OpenAI로 재평가 및 점수 기준 필터링
         
         기존 SmartScoreCalculator.adjust_search_scores()를 대체
+        
+        RERANK_MODE에 따라:
+        - llm (기본값): 모든 후보를 OpenAI로 평가
+        - hybrid: 로컬 재정렬 후 통과 기준 근처의 애매한 후보만 OpenAI로 재평가
+        - local: 로컬 재정렬만 (OpenAI 호출 없음)
         """
-        print(f"AI 기반 관련성 평가 시작: {len(search_results)}개 결과")
+        mode = rerank_mode(self.settings.rerank_mode)
+        print(f"AI 기반 관련성 평가 시작: {len(search_results)}개 결과 (모드: {mode})")
         
-        # OpenAI로 관련성 평가
-        enhanced_results = await self.ai_scorer.score_recipes_relevance(query, search_results)
+        if mode == "llm":
+            # OpenAI로 관련성 평가
+            enhanced_results = await self.ai_scorer.score_recipes_relevance(query, search_results)
+        else:
+            enhanced_results = await self._rerank_locally(query, search_results, mode)
         
         # 점수 기준으로 필터링
         filtered_results = [
@@ -272,3 +368,34 @@ class AIEnhancedScoreCalculator:
         print(f"AI 기반 관련성 평가 완료: {len(enhanced_results)}개 → {len(filtered_results)}개 (기준: {self.min_score_threshold}점 이상)")
         
         return filtered_results
+    
+    async def _rerank_locally(
+        self,
+        query: str,
+        search_results: List[Dict[str, Any]],
+        mode: str
+    ) -> List[Dict[str, Any]]:
+        """로컬 재정렬 + (hybrid) 애매한 후보만 OpenAI 재평가"""
+        start_time = time.perf_counter()
+        self.reranker.score(query, search_results)
+        local_time = time.perf_counter() - start_time
+        
+        uncertain = []
+        if mode == "hybrid":
+            uncertain = self.reranker.uncertain(
+                search_results, self.min_score_threshold, self.settings.rerank_uncertainty_margin
+            )
+        
+        stats = get_rerank_stats()
+        batch_size = self.settings.relevance_scoring_batch_size
+        saved_calls = stats.record(len(search_results), len(uncertain), batch_size, local_time)
+        print(
+            f"로컬 재정렬: {len(search_results)}개 {local_time * 1e6:.0f}μs, "
+            f"LLM 재평가 {len(uncertain)}개 (절감한 LLM 호출 {saved_calls}회)"
+        )
+        
+        if uncertain:
+            # 평가 결과(또는 마감 시간 초과 시 로컬 점수)가 후보 dict에 바로 반영됨
+            await self.ai_scorer.score_recipes_relevance(query, uncertain)
+        
+        return sorted(search_results, key=lambda x: x.get('score', 0), reverse=True)
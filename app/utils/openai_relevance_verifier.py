@@ -4,21 +4,33 @@ OpenAI 기반 실시간 관련성 검증기
 하드코딩 없는 동적 관련성 판단
 """
 
-from typing import Dict, List, Any, Tuple
-from ..clients.openai_client import OpenAIClient
+from typing import Dict, List, Any, Tuple, Optional
+from ..clients.openai_client import OpenAIClient, openai_client as default_openai_client
+from .relevance_cache import get_relevance_cache
 import json
 import asyncio
 
+# 검증 프롬프트를 바꾸면 버전을 올려서 캐시된 이전 판단을 무시
+VERIFY_PROMPT_VERSION = "verifier-v1"
+
 class OpenAIRelevanceVerifier:
-    def __init__(self):
-        self.openai_client = OpenAIClient()
-        # 캐시로 반복 호출 최소화
-        self._relevance_cache = {}
+    def __init__(self, openai_client: Optional[OpenAIClient] = None):
+        self.openai_client = openai_client or default_openai_client
+        # 프로세스 전체 공유 관련성 캐시로 반복 호출 최소화 (비활성화 시 None)
+        self._relevance_cache = get_relevance_cache()
         
-    async def verify_relevance(self, query: str, recipe_name: str, ingredients: str = "") -> Dict[str, Any]:
+    async def verify_relevance(
+        self,
+        query: str,
+        recipe_name: str,
+        ingredients: str = "",
+        recipe_id: Optional[Any] = None
+    ) -> Dict[str, Any]:
         """
         OpenAI로 검색어와 레시피의 관련성 실시간 검증
         
+        recipe_id가 없으면 레시피명을 캐시 키로 사용합니다.
+        
         Returns:
         {
             "relevance_score": 0.0-1.0,
@@ -30,9 +42,11 @@ class OpenAIRelevanceVerifier:
         """
         
         # 캐시 확인
-        cache_key = f"{query.lower()}:{recipe_name.lower()}"
-        if cache_key in self._relevance_cache:
-            return self._relevance_cache[cache_key]
+        cache_id = str(recipe_id) if recipe_id else f"name:{recipe_name.lower()}"
+        if self._relevance_cache is not None:
+            cached = self._relevance_cache.get(query, cache_id, VERIFY_PROMPT_VERSION)
+            if cached is not None:
+                return cached
         
         prompt = f"""
 다음 검색어와 레시피의 관련성을 분석해주세요:
@@ -101,7 +115,8 @@ JSON 형식으로 답변:
             result = json.loads(content)
             
             # 캐시 저장
-            self._relevance_cache[cache_key] = result
+            if self._relevance_cache is not None:
+                self._relevance_cache.put(query, cache_id, VERIFY_PROMPT_VERSION, result)
             
             return result
             
@@ -146,8 +161,9 @@ JSON 형식으로 답변:
             source = recipe if isinstance(recipe, dict) and "_source" not in recipe else recipe.get("_source", recipe)
             recipe_name = source.get("name", "")
             ingredients = source.get("ingredients", "")
+            recipe_id = source.get("recipe_id") or recipe.get("_id")
             
-            task = self.verify_relevance(query, recipe_name, ingredients)
+            task = self.verify_relevance(query, recipe_name, ingredients, recipe_id)
             tasks.append(task)
         
         # 동시 실행으로 성능 향상
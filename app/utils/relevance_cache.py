@@ -0,0 +1,202 @@
+"""
+LLM 관련성 판단 캐시
+
+OpenAI로 평가한 (검색어, 레시피) 관련성 점수를 프로세스 전체에서 공유하고 디스크에 보관합니다.
+같은 검색어가 다시 들어오면 이미 평가한 레시피는 LLM을 다시 호출하지 않습니다.
+
+- 키: (정규화된 검색어, 레시피 ID, 프롬프트 버전)
+  → 프롬프트를 바꾸면 버전만 올려서 이전 판단을 자동으로 무시
+- 크기 제한 LRU + TTL (판단 기준이 바뀌는 것을 고려해 오래된 항목은 만료)
+- JSON 파일로 저장 (임시 파일에 쓴 뒤 교체하므로 중간에 끊겨도 파일이 깨지지 않음)
+  저장 시 다른 워커가 저장한 항목도 합쳐서 기록
+- put은 메모리만 갱신하고, 파일 저장은 run_periodic_save가 save_interval마다
+  스레드에서 수행 (이벤트 루프에서 파일 읽기/병합/쓰기를 하지 않음). 종료 시에도 한 번 저장
+- get은 복사본을 반환하므로 호출 측이 결과를 고쳐도 캐시는 바뀌지 않음
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from ..config.settings import get_settings
+from .embedding_cache import normalize_embedding_text
+
+logger = logging.getLogger(__name__)
+
+_KEY_SEPARATOR = "\x1f"
+
+
+class RelevanceCache:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 20000,
+        ttl: float = 7 * 24 * 3600,
+        save_interval: float = 30.0
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.save_interval = save_interval
+
+        # 키 → (판단 결과, 저장 시각). 재시작 후에도 TTL을 유지하도록 벽시계 시각 사용
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._dirty = False
+        # 메모리 상태 보호용 (저장은 스레드에서 실행되므로). 파일 I/O 중에는 잡지 않음
+        self._lock = threading.Lock()
+        # 저장이 겹치지 않도록 (주기 저장과 종료 시 저장)
+        self._save_lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            self._load()
+
+    @staticmethod
+    def make_key(query: str, recipe_id: Any, prompt_version: str) -> str:
+        return _KEY_SEPARATOR.join([prompt_version, normalize_embedding_text(query), str(recipe_id)])
+
+    def get(self, query: str, recipe_id: Any, prompt_version: str) -> Optional[Any]:
+        """캐시된 판단 결과 (없거나 만료되면 None)"""
+        key = self.make_key(query, recipe_id, prompt_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() - entry[1] >= self.ttl:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry[0])
+
+    def put(self, query: str, recipe_id: Any, prompt_version: str, value: Any):
+        """판단 결과 저장 (JSON으로 직렬화 가능한 값). 메모리만 갱신하고 파일 저장은 주기 저장에 맡김"""
+        key = self.make_key(query, recipe_id, prompt_version)
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    async def run_periodic_save(self):
+        """save_interval초마다 변경분을 스레드에서 저장 (서버 수명 동안 백그라운드 실행)"""
+        while True:
+            await asyncio.sleep(self.save_interval)
+            if self._dirty:
+                await asyncio.to_thread(self.save)
+
+    def save(self):
+        """디스크에 저장 (변경이 없으면 생략). 파일 I/O가 있으므로 이벤트 루프에서는 스레드로 호출"""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = OrderedDict(self._entries)
+                self._dirty = False
+            try:
+                self._write_merged(snapshot)
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                logger.warning(f"관련성 캐시 저장 실패: {str(e)}")
+
+    def _write_merged(self, snapshot: "OrderedDict[str, tuple]"):
+        # 다른 워커가 저장한 항목 중 메모리에 없는 것을 오래된 순서로 앞에 합침
+        from_file = OrderedDict(
+            (key, entry) for key, entry in self._read_file().items() if key not in snapshot
+        )
+        merged = OrderedDict(from_file)
+        merged.update(snapshot)
+        while len(merged) > self.max_entries:
+            merged.popitem(last=False)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"entries": [[key, value, created_at] for key, (value, created_at) in merged.items()]},
+                f,
+                ensure_ascii=False
+            )
+        os.replace(tmp_path, self.path)
+
+        # 저장하는 동안 들어온 항목은 그대로 두고, 다른 워커의 항목만 오래된 쪽(앞)에 추가
+        with self._lock:
+            for key in reversed(from_file):
+                if key not in self._entries:
+                    self._entries[key] = from_file[key]
+                    self._entries.move_to_end(key, last=False)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _read_file(self) -> "OrderedDict[str, tuple]":
+        entries: "OrderedDict[str, tuple]" = OrderedDict()
+        if not self.path or not os.path.exists(self.path):
+            return entries
+        now = time.time()
+        with open(self.path, encoding="utf-8") as f:
+            for key, value, created_at in json.load(f).get("entries", []):
+                if now - created_at < self.ttl:
+                    entries[key] = (value, created_at)
+        return entries
+
+    def _load(self):
+        try:
+            self._entries = self._read_file()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            logger.info(f"관련성 캐시 로드: {self.path} ({len(self._entries)}개)")
+        except Exception as e:
+            logger.warning(f"관련성 캐시 로드 실패, 빈 캐시로 시작: {str(e)}")
+            self._entries = OrderedDict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "path": self.path
+        }
+
+
+_relevance_cache: Optional[RelevanceCache] = None
+
+
+def get_relevance_cache() -> Optional[RelevanceCache]:
+    """관련성 캐시 싱글톤 인스턴스 반환 (RELEVANCE_CACHE_ENABLED=false면 None)"""
+    global _relevance_cache
+    settings = get_settings()
+    if not settings.relevance_cache_enabled:
+        return None
+    if _relevance_cache is None:
+        _relevance_cache = RelevanceCache(
+            path=settings.relevance_cache_path,
+            max_entries=settings.relevance_cache_max_entries,
+            ttl=settings.relevance_cache_ttl
+        )
+    return _relevance_cache
@@ -0,0 +1,228 @@
+"""
+시맨틱 검색 결과 캐시
+
+같은 검색어가 반복될 때 텍스트 검색, 임베딩, 벡터 검색, 결과 통합을 다시 하지 않도록
+SemanticSearchResponse를 메모리에 보관합니다.
+
+- 크기 제한 LRU (가장 오래 사용하지 않은 항목부터 제거)
+- TTL: 신선한 동안은 캐시 결과를 그대로 반환
+- stale-while-revalidate: TTL이 지났지만 stale 기간 안이면 캐시 결과를 반환하고 백그라운드에서 갱신
+- 부정 캐시: 결과가 0건인 검색은 짧은 TTL로 보관
+  (계산 중 OpenSearch/OpenAI 오류로 기본값을 쓴 결과는 0건이든 아니든 저장하지 않음)
+- 인덱스 지문(문서 수/색인 횟수)이 바뀌면 전체 무효화
+- 같은 키의 동시 요청은 한 번만 계산 (요청 병합)
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from ..models.schemas import SemanticSearchResponse
+from ..config.settings import get_settings
+from .concurrency import track_errors
+
+
+class _CacheEntry:
+    __slots__ = ("value", "created_at", "ttl")
+
+    def __init__(self, value: SemanticSearchResponse, created_at: float, ttl: float):
+        self.value = value
+        self.created_at = created_at
+        self.ttl = ttl
+
+
+class SearchResultCache:
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl: float = 300.0,
+        stale_ttl: float = 600.0,
+        negative_ttl: float = 30.0,
+        fingerprint_interval: float = 30.0,
+        fingerprint_func: Optional[Callable[[], Awaitable[Optional[Hashable]]]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.fingerprint_interval = fingerprint_interval
+        self.fingerprint_func = fingerprint_func
+
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._refreshing = set()
+        self._fingerprint: Optional[Hashable] = None
+        self._fingerprint_checked_at = 0.0
+        self._fingerprint_lock = asyncio.Lock()
+
+        # 통계
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.skipped_stores = 0
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[SemanticSearchResponse]]
+    ) -> SemanticSearchResponse:
+        """캐시된 결과를 반환하거나, 없으면 compute()로 계산해 저장합니다."""
+        await self._check_fingerprint()
+
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = now - entry.created_at
+            if age < entry.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._copy(entry.value)
+            if age < entry.ttl + self.stale_ttl and entry.value.total_matches > 0:
+                # 오래된 결과를 먼저 돌려주고 백그라운드에서 갱신
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                self._schedule_refresh(key, compute)
+                return self._copy(entry.value)
+            del self._entries[key]
+
+        self.misses += 1
+        return self._copy(await self._compute_once(key, compute))
+
+    async def get(self, key: Hashable) -> Optional[SemanticSearchResponse]:
+        """신선한(TTL 이내) 캐시 결과만 반환, 없으면 None (계산하지 않음)"""
+        await self._check_fingerprint()
+
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.created_at >= entry.ttl:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._copy(entry.value)
+
+    def put(self, key: Hashable, value: SemanticSearchResponse):
+        """외부에서 계산한 결과 저장 (스트리밍 검색의 최종 결과 등, 오류 없이 끝난 결과만 넘길 것)"""
+        self._store(key, self._copy(value))
+
+    async def _compute_once(self, key: Hashable, compute) -> SemanticSearchResponse:
+        """
+        같은 키를 동시에 계산하지 않도록 진행 중인 계산을 공유
+        
+        계산은 별도 태스크로 실행하고 모든 호출자가 shield로 기다리므로,
+        먼저 요청한 클라이언트가 연결을 끊어도(취소) 함께 기다리던 요청은 영향을 받지 않습니다.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute_and_store(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish_inflight(key, done))
+        return await asyncio.shield(task)
+
+    async def _compute_and_store(self, key: Hashable, compute) -> SemanticSearchResponse:
+        with track_errors() as errors:
+            value = await compute()
+        if errors:
+            # 장애로 비었거나 일부가 빠진 결과를 캐시에서 계속 내보내지 않도록 저장 생략
+            self.skipped_stores += 1
+            print(f"⚠️ 검색 중 오류 {len(errors)}건 → 결과 캐시 저장 생략 ({errors[0]})")
+            return value
+        self._store(key, value)
+        return value
+
+    def _finish_inflight(self, key: Hashable, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 기다리는 호출자가 모두 취소된 경우 "Task exception was never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    def _schedule_refresh(self, key: Hashable, compute):
+        if key in self._refreshing or key in self._inflight:
+            return
+        self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                await self._compute_once(key, compute)
+            except Exception as e:
+                print(f"검색 캐시 갱신 실패: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        asyncio.ensure_future(refresh())
+
+    def _store(self, key: Hashable, value: SemanticSearchResponse):
+        ttl = self.ttl if value.total_matches > 0 else self.negative_ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = _CacheEntry(value, time.monotonic(), ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _check_fingerprint(self):
+        """인덱스 문서 수/버전이 바뀌었으면 캐시 전체를 비움 (fingerprint_interval마다 확인)"""
+        if self.fingerprint_func is None:
+            return
+        if time.monotonic() - self._fingerprint_checked_at < self.fingerprint_interval:
+            return
+
+        async with self._fingerprint_lock:
+            if time.monotonic() - self._fingerprint_checked_at < self.fingerprint_interval:
+                return
+            self._fingerprint_checked_at = time.monotonic()
+            try:
+                fingerprint = await self.fingerprint_func()
+            except Exception as e:
+                print(f"검색 캐시 인덱스 지문 조회 실패: {e}")
+                return
+            if fingerprint is None:
+                return
+            if self._fingerprint is not None and fingerprint != self._fingerprint:
+                print("🔄 인덱스 변경 감지 → 검색 결과 캐시 무효화")
+                self.clear()
+                self.invalidations += 1
+            self._fingerprint = fingerprint
+
+    def _copy(self, value: SemanticSearchResponse) -> SemanticSearchResponse:
+        # 호출자가 결과를 수정해도 캐시 항목에 영향이 없도록 복사본 반환
+        return value.model_copy(deep=True)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / total, 4) if total else 0.0,
+            "invalidations": self.invalidations,
+            "skipped_stores": self.skipped_stores
+        }
+
+
+_search_result_cache: Optional[SearchResultCache] = None
+
+
+def get_search_result_cache() -> SearchResultCache:
+    """검색 결과 캐시 싱글톤 인스턴스 반환 (인덱스 지문은 공용 OpenSearch 클라이언트로 조회)"""
+    global _search_result_cache
+    if _search_result_cache is None:
+        from ..clients.opensearch_client import opensearch_client
+
+        settings = get_settings()
+        _search_result_cache = SearchResultCache(
+            max_entries=settings.search_cache_max_entries,
+            ttl=settings.search_cache_ttl,
+            stale_ttl=settings.search_cache_stale_ttl,
+            negative_ttl=settings.search_cache_negative_ttl,
+            fingerprint_interval=settings.search_cache_fingerprint_interval,
+            fingerprint_func=opensearch_client.get_index_fingerprint
+        )
+    return _search_result_cache
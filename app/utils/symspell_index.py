@@ -0,0 +1,137 @@
+"""
+SymSpell 방식 로컬 오타 교정 인덱스
+
+레시피명/재료명을 자모로 분해한 형태에서 최대 max_distance개 문자를 지운 모든 변형(삭제 변형)을
+미리 색인해 둡니다. 조회 시 입력의 삭제 변형만 만들어 사전을 찾으면 되므로
+후보 수가 사전 크기와 무관하고 네트워크 요청이 필요 없습니다.
+
+- 자모 단위로 비교하므로 '라먼' → '라면' 같은 한 글자 안의 오타도 거리 1
+- 색인 크기를 줄이기 위해 앞 prefix_length 자모만 삭제 변형을 만들고,
+  후보는 전체 문자열의 자모 편집 거리(비트 병렬, jamo_distance.py)로 다시 검증 (SymSpell의 prefix 방식)
+- 거리 같은 후보가 여럿이면 더 자주 등장한 이름(레시피+재료 빈도), 그다음 짧은 이름 우선
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from . import hangul
+from .jamo_distance import JamoPattern
+
+
+class SymSpellIndex:
+    def __init__(
+        self,
+        decompose: Callable[[str], str] = hangul.decompose,
+        max_distance: int = 2,
+        prefix_length: int = 12
+    ):
+        self.decompose = decompose
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+
+        # 자모 형태 → (원래 이름, 빈도)
+        self._words: Dict[str, Tuple[str, int]] = {}
+        # 삭제 변형 → 자모 형태 목록
+        self._deletes: Dict[str, List[str]] = {}
+
+        self.built_at = 0.0
+        self.build_time = 0.0
+
+    def _key(self, text: str) -> str:
+        return self.decompose(text.strip().lower())
+
+    def build(self, names: Iterable[str]):
+        """이름 목록으로 색인을 새로 만들고 한 번에 교체 (조회 중에도 안전)"""
+        start_time = time.perf_counter()
+        words: Dict[str, Tuple[str, int]] = {}
+        for name in names:
+            if not name or not name.strip():
+                continue
+            key = self._key(name)
+            original, count = words.get(key, (name.strip(), 0))
+            words[key] = (original, count + 1)
+
+        deletes: Dict[str, List[str]] = {}
+        for key in words:
+            for variant in self._delete_variants(key[:self.prefix_length]):
+                deletes.setdefault(variant, []).append(key)
+
+        self._words, self._deletes = words, deletes
+        self.built_at = time.time()
+        self.build_time = time.perf_counter() - start_time
+
+    def _delete_variants(self, word: str) -> Set[str]:
+        """word에서 최대 max_distance개 문자를 지운 모든 변형 (word 자신 포함)"""
+        variants = {word}
+        frontier = {word}
+        for _ in range(self.max_distance):
+            next_frontier = set()
+            for item in frontier:
+                if len(item) <= 1:
+                    continue
+                for i in range(len(item)):
+                    variant = item[:i] + item[i + 1:]
+                    if variant not in variants:
+                        variants.add(variant)
+                        next_frontier.add(variant)
+            frontier = next_frontier
+        return variants
+
+    def allowed_distance(self, jamo_length: int) -> int:
+        """짧은 단어일수록 허용 거리를 줄여 엉뚱한 교정 방지"""
+        if jamo_length <= 2:
+            return 0
+        if jamo_length <= 4:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def lookup(self, text: str) -> Optional[Tuple[str, int]]:
+        """
+        가장 가까운 이름과 자모 편집 거리 (허용 거리 안에 없으면 None)
+        """
+        if not self._words:
+            return None
+        key = self._key(text)
+        if key in self._words:
+            return self._words[key][0], 0
+
+        max_distance = self.allowed_distance(len(key))
+        if max_distance == 0:
+            return None
+
+        words, deletes = self._words, self._deletes
+        pattern = JamoPattern(key)
+        best: Optional[Tuple[int, int, int, str]] = None
+        checked = set()
+        for variant in self._delete_variants(key[:self.prefix_length]):
+            for candidate in deletes.get(variant, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                limit = best[0] if best else max_distance
+                if abs(len(candidate) - len(key)) > limit:
+                    continue
+                distance = pattern.distance(candidate)
+                if distance > limit:
+                    continue
+                name, count = words[candidate]
+                rank = (distance, -count, len(candidate), name)
+                if best is None or rank < best:
+                    best = rank
+
+        if best is None:
+            return None
+        return best[3], best[0]
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "words": len(self._words),
+            "delete_variants": len(self._deletes),
+            "max_distance": self.max_distance,
+            "prefix_length": self.prefix_length,
+            "build_ms": round(self.build_time * 1000, 1),
+            "built_at": self.built_at
+        }
+
+    def __len__(self) -> int:
+        return len(self._words)
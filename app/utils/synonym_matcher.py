@@ -42,6 +42,16 @@ class SynonymMatcher:
         
         return reverse_dict
     
+    def all_ingredient_names(self) -> List[str]:
+        """사전의 모든 표준명과 동의어 (중복 제거, 사전 순서 유지)"""
+        names = {}
+        for ingredients in self.synonym_dict.values():
+            for standard_name, synonyms in ingredients.items():
+                names.setdefault(standard_name.strip(), None)
+                for synonym in synonyms:
+                    names.setdefault(synonym.strip(), None)
+        return [name for name in names if name]
+    
     def find_standard_ingredient(self, user_input: str) -> Optional[Tuple[str, str, float]]:
         """
         사용자 입력을 표준 재료명으로 매핑
@@ -0,0 +1,246 @@
+"""
+로컬 벡터 스냅샷 / 인프로세스 벡터 인덱스
+
+OpenSearch 인덱스의 임베딩을 로컬 파일로 내려받아(scripts/export_snapshot.py)
+서버 프로세스 안에서 NumPy로 정확한 코사인 top-k를 계산합니다.
+카탈로그 규모(수천~수만 건)에서는 script_score 네트워크 왕복보다 훨씬 빠릅니다.
+
+스냅샷 디렉터리 구성 (인덱스별, 모든 파일을 np.load(mmap_mode="r")로 메모리 맵):
+- {snapshot_dir}/{index}/embeddings.npy                 : 정규화된 float32 행렬 [문서 수, 차원]
+- {snapshot_dir}/{index}/columns/{필드}.offsets.npy     : int64 [문서 수 + 1], 행 i의 값은 data[offsets[i]:offsets[i+1]]
+- {snapshot_dir}/{index}/columns/{필드}.data.npy        : uint8, 값들의 UTF-8 JSON을 이어 붙인 버퍼 (값이 없으면 길이 0)
+- {snapshot_dir}/{index}/meta.json                      : 인덱스명, 문서 수, 차원, 컬럼 목록, 생성 시각
+
+컬럼은 문서 ID(_id)와 _source의 모든 필드(id/name/category/ingredients 등, embedding 제외)입니다.
+검색 시에는 top-k 행만 디코딩하므로 문서 수와 무관하게 메모리에는 필요한 부분만 올라옵니다.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 2
+EMBEDDINGS_FILE = "embeddings.npy"
+COLUMNS_DIR = "columns"
+META_FILE = "meta.json"
+ID_COLUMN = "_id"
+
+_MISSING = object()
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (0 벡터는 그대로 둠)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _column_stem(position: int, field: str) -> str:
+    """필드명을 파일명으로 (파일명에 쓸 수 없는 문자는 _로 바꾸고 순번을 붙여 충돌 방지)"""
+    return f"{position:03d}_{re.sub(r'[^0-9A-Za-z_-]', '_', field)}"
+
+
+def _write_column(columns_dir: str, stem: str, values: List[Any]):
+    encoded = [b"" if value is _MISSING else json.dumps(value, ensure_ascii=False).encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    np.save(os.path.join(columns_dir, f"{stem}.offsets.npy"), offsets)
+    np.save(os.path.join(columns_dir, f"{stem}.data.npy"), np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+
+class SnapshotColumn:
+    """메모리 맵 가변 길이 JSON 컬럼 (행 단위로 필요할 때만 디코딩)"""
+
+    def __init__(self, columns_dir: str, stem: str):
+        self.offsets: np.ndarray = np.load(os.path.join(columns_dir, f"{stem}.offsets.npy"), mmap_mode="r")
+        self.data: np.ndarray = np.load(os.path.join(columns_dir, f"{stem}.data.npy"), mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def get(self, row: int, default: Any = None) -> Any:
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        if start == end:
+            return default
+        return json.loads(self.data[start:end].tobytes().decode("utf-8"))
+
+
+def write_snapshot(
+    index_dir: str,
+    index_name: str,
+    ids: List[str],
+    sources: List[Dict[str, Any]],
+    embeddings: np.ndarray
+) -> Dict[str, Any]:
+    """
+    스냅샷 파일을 기록
+    
+    새 파일을 임시 이름으로 모두 쓴 뒤 교체하고 meta.json을 마지막에 바꾸므로,
+    읽는 쪽은 meta.json이 가리키는 완전한 스냅샷만 봅니다.
+    """
+    embeddings = normalize_rows(embeddings)
+    if embeddings.shape[0] != len(ids) or len(ids) != len(sources):
+        raise ValueError(f"스냅샷 행 수 불일치: ids={len(ids)}, sources={len(sources)}, embeddings={embeddings.shape[0]}")
+
+    os.makedirs(index_dir, exist_ok=True)
+
+    embeddings_tmp = os.path.join(index_dir, EMBEDDINGS_FILE + ".tmp")
+    with open(embeddings_tmp, "wb") as f:
+        np.save(f, embeddings)
+
+    # _source 필드 전체를 처음 등장한 순서대로 컬럼화 (문서에 없는 필드는 빈 값)
+    fields = list(dict.fromkeys(field for source in sources for field in source))
+    columns = [{"field": ID_COLUMN, "file": _column_stem(0, ID_COLUMN)}] + [
+        {"field": field, "file": _column_stem(position, field)} for position, field in enumerate(fields, 1)
+    ]
+    columns_tmp = os.path.join(index_dir, COLUMNS_DIR + ".tmp")
+    shutil.rmtree(columns_tmp, ignore_errors=True)
+    os.makedirs(columns_tmp)
+    _write_column(columns_tmp, columns[0]["file"], list(ids))
+    for column in columns[1:]:
+        field = column["field"]
+        _write_column(columns_tmp, column["file"], [source.get(field, _MISSING) for source in sources])
+
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "index": index_name,
+        "count": len(ids),
+        "dimension": int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+        "columns": columns,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    meta_tmp = os.path.join(index_dir, META_FILE + ".tmp")
+    with open(meta_tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    columns_dir = os.path.join(index_dir, COLUMNS_DIR)
+    columns_old = os.path.join(index_dir, COLUMNS_DIR + ".old")
+    shutil.rmtree(columns_old, ignore_errors=True)
+    if os.path.exists(columns_dir):
+        os.replace(columns_dir, columns_old)
+    os.replace(columns_tmp, columns_dir)
+    os.replace(embeddings_tmp, os.path.join(index_dir, EMBEDDINGS_FILE))
+    os.replace(meta_tmp, os.path.join(index_dir, META_FILE))
+    shutil.rmtree(columns_old, ignore_errors=True)
+    return meta
+
+
+class LocalVectorIndex:
+    """
+    메모리 맵 스냅샷 기반 정확한 코사인 top-k 검색
+
+    점수는 script_score(cosineSimilarity + 1.0)와 같은 1 + cos 스케일로 반환합니다.
+    (knn(cosinesimil)의 원시 점수는 1 / (2 - cos)라 스케일이 다르며,
+     OpenSearchClient가 knn 결과를 1 + cos로 변환하므로 어느 경로든 같은 점수 범위가 됩니다)
+    """
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+
+        with open(os.path.join(index_dir, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"지원하지 않는 스냅샷 형식: {index_dir} (scripts/export_snapshot.py로 다시 내보내기 필요)")
+
+        self.embeddings: np.ndarray = np.load(os.path.join(index_dir, EMBEDDINGS_FILE), mmap_mode="r")
+
+        columns_dir = os.path.join(index_dir, COLUMNS_DIR)
+        self.columns: Dict[str, SnapshotColumn] = {
+            column["field"]: SnapshotColumn(columns_dir, column["file"]) for column in self.meta["columns"]
+        }
+        self.ids = self.columns.pop(ID_COLUMN)
+
+        for field, column in [(ID_COLUMN, self.ids), *self.columns.items()]:
+            if len(column) != self.embeddings.shape[0]:
+                raise ValueError(
+                    f"스냅샷 손상: {index_dir} (embeddings={self.embeddings.shape[0]}, {field}={len(column)})"
+                )
+
+    def source(self, row: int) -> Dict[str, Any]:
+        """행 하나의 _source (스냅샷에 저장된 필드만)"""
+        source = {}
+        for field, column in self.columns.items():
+            value = column.get(row, _MISSING)
+            if value is not _MISSING:
+                source[field] = value
+        return source
+
+    def values(self, field: str) -> List[Any]:
+        """필드 하나의 전체 값 (없는 필드면 빈 목록, 값이 없는 행은 제외)"""
+        column = self.columns.get(field)
+        if column is None:
+            return []
+        values = (column.get(row) for row in range(len(column)))
+        return [value for value in values if value is not None]
+
+    @property
+    def size(self) -> int:
+        return int(self.embeddings.shape[0])
+
+    @property
+    def dimension(self) -> int:
+        return int(self.embeddings.shape[1])
+
+    def search(self, query_vector, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        쿼리 벡터와 가장 가까운 문서 limit개를 OpenSearchClient._parse_vector_results와 같은 형태(점수 1 + cos)로 반환
+        """
+        if self.size == 0 or limit <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        query = query / norm
+
+        # 행렬-벡터 곱 한 번으로 전체 코사인 유사도 계산
+        similarities = self.embeddings @ query
+
+        k = min(limit, self.size)
+        if k < self.size:
+            top = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            top = np.arange(self.size)
+        top = top[np.argsort(-similarities[top], kind="stable")]
+
+        results = []
+        for row in top:
+            result = self.source(int(row))
+            result["score"] = float(similarities[row]) + 1.0
+            result["_id"] = self.ids.get(int(row))
+            results.append(result)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "index": self.meta.get("index"),
+            "documents": self.size,
+            "dimension": self.dimension,
+            "columns": list(self.columns),
+            "created_at": self.meta.get("created_at")
+        }
+
+
+def load_local_vector_index(snapshot_dir: str, index_name: str) -> Optional[LocalVectorIndex]:
+    """스냅샷이 있으면 로드, 없거나 손상되었으면 None (OpenSearch 벡터 검색 사용)"""
+    index_dir = os.path.join(snapshot_dir, index_name)
+    if not os.path.exists(os.path.join(index_dir, META_FILE)):
+        logger.warning(f"로컬 벡터 스냅샷 없음: {index_dir} (scripts/export_snapshot.py로 생성)")
+        return None
+    try:
+        index = LocalVectorIndex(index_dir)
+        logger.info(f"✅ 로컬 벡터 인덱스 로드: {index_name} ({index.size}개, {index.dimension}차원)")
+        return index
+    except Exception as e:
+        logger.error(f"로컬 벡터 스냅샷 로드 실패 ({index_dir}): {str(e)}")
+        return None
@@ -0,0 +1,57 @@
+"""
+임베딩 벡터 유틸리티
+
+서비스 전체에서 임베딩을 하나의 형태로 다룹니다:
+C 연속(contiguous) float32 1차원 np.ndarray, 생성 시점에 한 번만 단위 길이로 정규화.
+
+- OpenAI 응답(base64)은 np.frombuffer로 바로 디코딩 (파이썬 float 리스트를 만들지 않음)
+- 임베딩 캐시도 같은 형태로 반환하므로 검색 경로에서 다시 정규화/복사하지 않음
+- OpenSearch 쿼리 body에 넣을 때만 vector_to_json으로 한 번 변환
+"""
+
+import base64
+from typing import Sequence, Union
+
+import numpy as np
+
+# 임베딩 벡터 타입 (float32, C 연속, 단위 길이)
+Vector = np.ndarray
+VectorLike = Union[np.ndarray, Sequence[float]]
+
+VECTOR_DTYPE = np.float32
+
+# 이미 정규화된 벡터로 볼 노름 오차 (float32 반올림 오차 허용)
+_NORM_TOLERANCE = 1e-4
+
+
+def as_vector(values: VectorLike) -> Vector:
+    """float32 C 연속 1차원 배열로 변환 (이미 그 형태면 복사하지 않음)"""
+    return np.ascontiguousarray(values, dtype=VECTOR_DTYPE).reshape(-1)
+
+
+def normalize(values: VectorLike) -> Vector:
+    """단위 길이 벡터로 정규화 (이미 정규화돼 있으면 그대로 반환, 영벡터도 그대로 반환)"""
+    vector = as_vector(values)
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0 or abs(norm - 1.0) <= _NORM_TOLERANCE:
+        return vector
+    return vector / VECTOR_DTYPE(norm)
+
+
+def decode_embedding(data: Union[str, VectorLike]) -> Vector:
+    """OpenAI 임베딩 응답 값(base64 문자열 또는 float 목록)을 정규화된 벡터로 변환"""
+    if isinstance(data, str):
+        return normalize(np.frombuffer(base64.b64decode(data), dtype="<f4"))
+    return normalize(data)
+
+
+def compose_query_vector(vectors: Sequence[VectorLike]) -> Vector:
+    """여러 임베딩의 평균을 정규화한 쿼리 벡터 (하나면 정규화만)"""
+    if len(vectors) == 1:
+        return normalize(vectors[0])
+    return normalize(np.mean(np.stack([as_vector(v) for v in vectors]), axis=0))
+
+
+def vector_to_json(vector: VectorLike) -> list:
+    """쿼리 body용 직렬화 (ndarray.tolist는 C 루프로 한 번에 변환)"""
+    return as_vector(vector).tolist()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+한글 자모 코덱 마이크로벤치마크
+
+기존 KoreanSpellChecker의 글자 단위 분해/list.index 조합 방식과
+app/utils/hangul.py의 테이블 기반 코덱을 같은 입력으로 비교합니다.
+측정 전에 무작위 입력(완성형/자모/영문/공백 혼합)으로 두 구현의 결과가 같은지 먼저 검증합니다.
+
+사용법:
+    python scripts/benchmark_hangul.py
+    python scripts/benchmark_hangul.py --count 50000 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils import hangul
+
+CHO, JUNG, JONG = list(hangul.CHO), list(hangul.JUNG), list(hangul.JONG)
+
+
+def legacy_decompose_hangul(char):
+    """기존 구현: 글자 하나씩 분해"""
+    if not ('가' <= char <= '힣'):
+        return char
+    code = ord(char) - ord('가')
+    cho_idx = code // (21 * 28)
+    jung_idx = (code % (21 * 28)) // 28
+    jong_idx = code % 28
+    return CHO[cho_idx] + JUNG[jung_idx] + (JONG[jong_idx] if jong_idx else '')
+
+
+def legacy_decompose(text):
+    return "".join(legacy_decompose_hangul(char) for char in text)
+
+
+def legacy_compose(jamo_str):
+    """기존 구현: list.index + 문자열 덧붙이기"""
+    if len(jamo_str) < 2:
+        return jamo_str
+    result = ""
+    i = 0
+    while i < len(jamo_str):
+        if i + 1 < len(jamo_str):
+            cho = jamo_str[i] if jamo_str[i] in CHO else 'ㅇ'
+            jung = jamo_str[i+1] if jamo_str[i+1] in JUNG else 'ㅡ'
+            jong = jamo_str[i+2] if i+2 < len(jamo_str) and jamo_str[i+2] in JONG[1:] else ''
+            try:
+                cho_idx = CHO.index(cho)
+                jung_idx = JUNG.index(jung)
+                jong_idx = JONG.index(jong) if jong else 0
+                result += chr(ord('가') + (cho_idx * 21 + jung_idx) * 28 + jong_idx)
+                i += 3 if jong else 2
+            except ValueError:
+                result += jamo_str[i]
+                i += 1
+        else:
+            result += jamo_str[i]
+            i += 1
+    return result
+
+
+def make_inputs(count: int, seed: int):
+    """레시피명 길이(2~12자)의 무작위 문자열과 그 자모 분해(+잡음) 문자열"""
+    rng = random.Random(seed)
+    alphabet = [chr(0xAC00 + rng.randrange(hangul.SYLLABLE_COUNT)) for _ in range(2000)] + list("abc 12")
+    texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(2, 12))) for _ in range(count)]
+    noise = CHO + JUNG + [j for j in JONG if j] + list("a 1")
+    jamo_texts = [
+        "".join(char if rng.random() > 0.1 else rng.choice(noise) for char in legacy_decompose(text))
+        for text in texts
+    ]
+    return texts, jamo_texts
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='한글 자모 코덱 벤치마크')
+    parser.add_argument('--count', type=int, default=20000, help='입력 문자열 수')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최솟값 사용)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    texts, jamo_texts = make_inputs(args.count, args.seed)
+
+    # 결과 동일성 검증
+    assert hangul.decompose_many(texts) == [legacy_decompose(text) for text in texts], "분해 결과 불일치"
+    assert hangul.compose_many(jamo_texts) == [legacy_compose(text) for text in jamo_texts], "조합 결과 불일치"
+    print(f"✅ 결과 동일성 검증 완료 ({args.count}개 x 분해/조합)")
+
+    cases = [
+        ("분해", lambda: [legacy_decompose(text) for text in texts], lambda: hangul.decompose_many(texts)),
+        ("조합", lambda: [legacy_compose(text) for text in jamo_texts], lambda: hangul.compose_many(jamo_texts)),
+    ]
+    print(f"\n{'작업':<6}{'기존(ms)':>12}{'테이블(ms)':>14}{'개당(µs)':>12}{'배속':>8}")
+    for name, legacy_fn, table_fn in cases:
+        legacy_time = timed(legacy_fn, args.repeat)
+        table_time = timed(table_fn, args.repeat)
+        print(
+            f"{name:<6}{legacy_time * 1000:>12.1f}{table_time * 1000:>14.1f}"
+            f"{table_time / args.count * 1e6:>12.2f}{legacy_time / table_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+레시피/재료 벌크 색인 스크립트
+
+JSON 배열 또는 JSON Lines 파일의 레코드를 읽어 임베딩을 생성하고
+OpenSearch _bulk API로 색인합니다. (app/services/ingest_service.py 참고)
+
+사용법:
+    python scripts/bulk_ingest.py data/recipes.jsonl                                  # recipes 인덱스, recipe_id 기준
+    python scripts/bulk_ingest.py data/ingredients.json --index ingredients \\
+        --id-field ingredient_id --text-fields name,aliases                           # 재료 색인
+    python scripts/bulk_ingest.py data/recipes.jsonl --embed-concurrency 8 --bulk-concurrency 8
+    python scripts/bulk_ingest.py data/recipes.jsonl --limit 100                      # 앞 100개만 (테스트)
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.clients.opensearch_client import opensearch_client
+from app.services.ingest_service import BulkIngestService, DEFAULT_RECIPE_TEXT_FIELDS
+
+
+def read_records(path: str):
+    """JSON 배열 또는 JSON Lines 파일에서 레코드를 하나씩 읽음"""
+    with open(path, encoding="utf-8") as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        if first == "[":
+            yield from json.load(f)
+            return
+
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def print_progress(stats: dict):
+    print(
+        f"   색인 {stats['indexed']}개 / 임베딩 {stats['embedded']}개 / 읽음 {stats['read']}개 "
+        f"(실패 {stats['failed']}, 재시도 {stats['retries']}) {stats['docs_per_sec']:.0f} docs/s"
+    )
+
+
+async def run(args) -> dict:
+    service = BulkIngestService(
+        embed_batch_size=args.embed_batch_size,
+        embed_concurrency=args.embed_concurrency,
+        bulk_chunk_size=args.bulk_chunk_size,
+        bulk_concurrency=args.bulk_concurrency,
+        queue_size=args.queue_size
+    )
+
+    records = read_records(args.input)
+    if args.limit:
+        records = itertools.islice(records, args.limit)
+
+    try:
+        stats = await service.ingest(
+            records,
+            index=args.index,
+            id_field=args.id_field,
+            text_fields=args.text_fields.split(",") if args.text_fields else DEFAULT_RECIPE_TEXT_FIELDS,
+            progress=print_progress
+        )
+        if args.refresh:
+            await opensearch_client.async_client.indices.refresh(index=args.index)
+        return stats
+    finally:
+        await opensearch_client.aclose()
+        await service.openai_client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='레시피/재료 임베딩 생성 + _bulk 색인')
+    parser.add_argument('input', help='레코드 파일 (JSON 배열 또는 JSON Lines)')
+    parser.add_argument('--index', default='recipes', help='대상 인덱스')
+    parser.add_argument('--id-field', default='recipe_id', help='문서 ID로 사용할 필드')
+    parser.add_argument('--text-fields', help=f'임베딩 텍스트 필드 (쉼표 구분, 기본: {",".join(DEFAULT_RECIPE_TEXT_FIELDS)})')
+    parser.add_argument('--embed-batch-size', type=int, default=256, help='임베딩 API 한 번에 보낼 텍스트 수')
+    parser.add_argument('--embed-concurrency', type=int, default=4, help='동시 임베딩 요청 수')
+    parser.add_argument('--bulk-chunk-size', type=int, default=500, help='_bulk 요청당 문서 수')
+    parser.add_argument('--bulk-concurrency', type=int, default=4, help='동시 _bulk 요청 수')
+    parser.add_argument('--queue-size', type=int, default=8, help='색인 대기 청크 수 (초과 시 임베딩 단계 대기)')
+    parser.add_argument('--limit', type=int, help='앞에서부터 N개만 처리')
+    parser.add_argument('--refresh', action='store_true', help='완료 후 인덱스 refresh')
+
+    args = parser.parse_args()
+
+    print(f"📥 벌크 색인: {args.input} → {args.index}")
+    print("=" * 50)
+
+    try:
+        stats = asyncio.run(run(args))
+    except Exception as e:
+        print(f"❌ 벌크 색인 오류: {e}")
+        sys.exit(1)
+
+    print(f"\n✅ 완료: {stats['indexed']}개 색인, {stats['failed']}개 실패, {stats['skipped']}개 건너뜀 "
+          f"({stats['elapsed']:.1f}초, {stats['docs_per_sec']:.0f} docs/s)")
+    if stats['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+임베딩 차원별 recall/지연 시간 비교 리포트
+
+1536차원 로컬 스냅샷(scripts/export_snapshot.py)을 기준으로, 임베딩을 앞 N차원으로 잘라
+재정규화했을 때(text-embedding-3의 dimensions 파라미터와 같은 방식) 검색 결과가
+얼마나 유지되는지와 검색 비용이 얼마나 줄어드는지 비교합니다.
+
+측정 항목 (차원별):
+- recall@k: 1536차원 top-k 대비 축소 차원 top-k의 겹치는 비율
+- 쿼리당 검색 시간: NumPy 행렬-벡터 곱 + argpartition (로컬 벡터 인덱스와 동일)
+- 인덱스 메모리: float32 행렬 크기
+- 쿼리 JSON 크기: OpenSearch 쿼리에 실리는 벡터 직렬화 크기
+
+사용법:
+    python scripts/compare_embedding_dimensions.py                                   # 문서 임베딩 200개를 쿼리로 사용 (API 호출 없음)
+    python scripts/compare_embedding_dimensions.py --queries "피망 요리,김치찌개,닭가슴살"  # 실제 검색어를 1536차원으로 임베딩해 사용
+    python scripts/compare_embedding_dimensions.py --dimensions 128,256,512,1024 --k 20
+    python scripts/compare_embedding_dimensions.py --output report.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.config.settings import get_settings
+from app.utils.vector_snapshot import LocalVectorIndex, normalize_rows
+from app.utils.vectors import vector_to_json
+
+
+def truncate(matrix: np.ndarray, dimension: int) -> np.ndarray:
+    """앞 dimension개 차원만 남기고 재정규화"""
+    return np.ascontiguousarray(normalize_rows(matrix[:, :dimension]))
+
+
+def top_k(matrix: np.ndarray, queries: np.ndarray, k: int):
+    """쿼리별 top-k 행 번호와 쿼리당 평균 검색 시간(ms)"""
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        similarities = matrix @ query
+        top = np.argpartition(-similarities, k - 1)[:k]
+        results.append(set(top[np.argsort(-similarities[top])].tolist()))
+    elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    return results, elapsed_ms
+
+
+def query_json_bytes(query: np.ndarray) -> int:
+    return len(json.dumps(vector_to_json(query)).encode("utf-8"))
+
+
+async def embed_queries(queries):
+    from app.clients.openai_client import OpenAIClient, NATIVE_EMBEDDING_DIMENSION
+
+    # 기준 임베딩은 항상 원본 차원으로 생성
+    # 서버용 디스크 캐시는 EMBEDDING_DIMENSIONS 기준이라 다른 차원의 벡터가 섞일 수 있으므로 사용하지 않음
+    client = OpenAIClient(dimensions=NATIVE_EMBEDDING_DIMENSION, use_cache=False)
+    try:
+        return await client.get_embeddings(queries)
+    finally:
+        await client.aclose()
+
+
+def main():
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description='임베딩 차원별 recall/지연 시간 비교')
+    parser.add_argument('--snapshot', default=os.path.join(settings.vector_snapshot_dir, settings.recipes_index),
+                        help='1536차원 스냅샷 디렉터리 (기본: VECTOR_SNAPSHOT_DIR/RECIPES_INDEX)')
+    parser.add_argument('--dimensions', default='256,512,1024', help='비교할 차원 (쉼표 구분)')
+    parser.add_argument('--k', type=int, default=10, help='recall@k의 k')
+    parser.add_argument('--queries', help='검색어 목록 (쉼표 구분, OpenAI로 임베딩)')
+    parser.add_argument('--sample', type=int, default=200, help='--queries가 없을 때 쿼리로 쓸 문서 임베딩 수')
+    parser.add_argument('--seed', type=int, default=42, help='문서 샘플링 시드')
+    parser.add_argument('--output', help='결과를 JSON으로 저장할 경로')
+
+    args = parser.parse_args()
+
+    index = LocalVectorIndex(args.snapshot)
+    base = np.ascontiguousarray(index.embeddings, dtype=np.float32)
+    full_dimension = base.shape[1]
+    k = min(args.k, index.size)
+
+    if args.queries:
+        texts = [q.strip() for q in args.queries.split(",") if q.strip()]
+        queries = normalize_rows(np.asarray(asyncio.run(embed_queries(texts)), dtype=np.float32))
+        query_source = f"검색어 {len(texts)}개"
+    else:
+        rng = np.random.default_rng(args.seed)
+        rows = rng.choice(index.size, size=min(args.sample, index.size), replace=False)
+        queries = base[rows]
+        query_source = f"문서 임베딩 샘플 {len(rows)}개"
+
+    print(f"📐 임베딩 차원 비교: {args.snapshot} ({index.size}개 문서, {full_dimension}차원, 쿼리: {query_source})")
+    print("=" * 78)
+
+    baseline, baseline_ms = top_k(base, queries, k)
+
+    report = [{
+        "dimension": full_dimension,
+        f"recall@{k}": 1.0,
+        "search_ms": round(baseline_ms, 3),
+        "index_mb": round(base.nbytes / (1024 * 1024), 2),
+        "query_json_bytes": query_json_bytes(queries[0])
+    }]
+
+    for dimension in sorted({int(d) for d in args.dimensions.split(",")}):
+        if dimension >= full_dimension:
+            continue
+        matrix = truncate(base, dimension)
+        reduced_queries = truncate(queries, dimension)
+        results, search_ms = top_k(matrix, reduced_queries, k)
+        recall = float(np.mean([len(r & b) / k for r, b in zip(results, baseline)]))
+        report.append({
+            "dimension": dimension,
+            f"recall@{k}": round(recall, 4),
+            "search_ms": round(search_ms, 3),
+            "index_mb": round(matrix.nbytes / (1024 * 1024), 2),
+            "query_json_bytes": query_json_bytes(reduced_queries[0])
+        })
+
+    print(f"{'차원':>6} | {f'recall@{k}':>10} | {'검색(ms)':>9} | {'속도':>6} | {'인덱스(MB)':>10} | {'쿼리 JSON(B)':>12}")
+    print("-" * 78)
+    for row in sorted(report, key=lambda r: r["dimension"]):
+        speedup = baseline_ms / row["search_ms"] if row["search_ms"] else 0.0
+        print(f"{row['dimension']:>6} | {row[f'recall@{k}']:>10.4f} | {row['search_ms']:>9.3f} | "
+              f"{speedup:>5.1f}x | {row['index_mb']:>10.2f} | {row['query_json_bytes']:>12}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"snapshot": args.snapshot, "documents": index.size, "k": k,
+                       "queries": query_source, "results": report}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+
+    print("\n💡 축소 차원 적용: EMBEDDING_DIMENSIONS=<차원> + scripts/create_knn_index.py --dimension <차원> --suffix _<차원>,")
+    print("   RECIPES_INDEX/INGREDIENTS_INDEX를 새 인덱스로 지정")
+
+
+if __name__ == "__main__":
+    main()
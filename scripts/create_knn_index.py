@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+HNSW k-NN 인덱스 생성/마이그레이션 스크립트
+
+기존 recipes/ingredients 인덱스(embedding 필드가 일반 벡터 필드)를
+knn_vector(HNSW) 매핑을 가진 새 인덱스로 재색인합니다.
+
+사용법:
+    python scripts/create_knn_index.py                     # recipes, ingredients 모두 recipes_knn, ingredients_knn으로 재색인
+    python scripts/create_knn_index.py --index recipes     # recipes만 (RECIPES_INDEX/INGREDIENTS_INDEX 설정값 중 선택)
+    python scripts/create_knn_index.py --recreate          # 대상 인덱스가 이미 있으면 삭제 후 재생성 (없으면 오류로 종료)
+    python scripts/create_knn_index.py --swap              # 재색인 후 원본 인덱스를 삭제하고 같은 이름의 alias로 교체
+    python scripts/create_knn_index.py --dry-run           # 생성할 인덱스 body만 출력
+    python scripts/create_knn_index.py --dimension 256 --suffix _256
+                                                           # 임베딩을 앞 256차원으로 잘라 축소 차원 인덱스 생성
+                                                           # (text-embedding-3의 dimensions 파라미터와 같은 방식, EMBEDDING_DIMENSIONS=256과 함께 사용)
+
+마이그레이션 후 .env에 VECTOR_SEARCH_MODE=knn 을 설정하면 knn 쿼리를 사용합니다.
+(--swap 없이 사용할 경우 인덱스명이 달라지므로 검색 대상 인덱스를 직접 지정해야 합니다)
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.clients.opensearch_client import opensearch_client
+from app.clients.openai_client import NATIVE_EMBEDDING_DIMENSION
+from app.config.settings import get_settings
+
+
+def create_knn_index(source_index: str, target_index: str, recreate: bool, dry_run: bool, dimension: int = None) -> bool:
+    """원본 인덱스 매핑을 복사해 knn_vector 매핑의 새 인덱스를 생성"""
+    client = opensearch_client.client
+
+    mapping = client.indices.get_mapping(index=source_index)
+    # alias로 조회한 경우에도 실제 인덱스의 매핑을 사용
+    source_properties = next(iter(mapping.values()))["mappings"].get("properties", {})
+
+    body = opensearch_client.build_knn_index_body(source_properties, dimension)
+
+    if dry_run:
+        print(f"📄 {target_index} 생성 body:")
+        print(json.dumps(body, ensure_ascii=False, indent=2))
+        return False
+
+    if client.indices.exists(index=target_index):
+        if not recreate:
+            # 기존 인덱스에 다시 재색인하면 문서가 덮어써지거나 섞이므로 중단
+            print(f"❌ {target_index} 인덱스가 이미 존재합니다 (--recreate로 재생성)")
+            sys.exit(1)
+        print(f"🗑️ 기존 {target_index} 삭제")
+        client.indices.delete(index=target_index)
+
+    client.indices.create(index=target_index, body=body)
+    embedding_mapping = body['mappings']['properties']['embedding']
+    print(f"✅ {target_index} 인덱스 생성 (HNSW m={embedding_mapping['method']['parameters']['m']}, {embedding_mapping['dimension']}차원)")
+    return True
+
+
+def reindex(source_index: str, target_index: str, poll_interval: float, dimension: int = None) -> bool:
+    """_reindex를 비동기 태스크로 실행하고 진행률을 출력"""
+    client = opensearch_client.client
+
+    body = {
+        "source": {"index": source_index},
+        "dest": {"index": target_index}
+    }
+    if dimension and dimension < NATIVE_EMBEDDING_DIMENSION:
+        # text-embedding-3 임베딩은 앞쪽 차원만 잘라 써도 되도록 학습됨 (코사인 유사도라 재정규화 불필요)
+        body["script"] = {
+            "lang": "painless",
+            "source": "if (ctx._source.embedding != null && ctx._source.embedding.size() > params.dim) "
+                      "{ ctx._source.embedding = new ArrayList(ctx._source.embedding.subList(0, params.dim)); }",
+            "params": {"dim": dimension}
+        }
+
+    task = client.reindex(body=body, wait_for_completion=False)
+    task_id = task["task"]
+    print(f"🔄 재색인 시작: {source_index} → {target_index} (task: {task_id})")
+
+    start_time = time.time()
+    while True:
+        status = client.tasks.get(task_id=task_id)
+        progress = status["task"]["status"]
+        done = progress.get("created", 0) + progress.get("updated", 0)
+        total = progress.get("total", 0)
+        elapsed = time.time() - start_time
+        rate = done / elapsed if elapsed > 0 else 0.0
+        print(f"   {done}/{total} 문서 ({rate:.0f} docs/s)")
+
+        if status.get("completed"):
+            failures = status.get("response", {}).get("failures", [])
+            if failures:
+                print(f"❌ 재색인 실패: {len(failures)}건 (첫 오류: {failures[0]})")
+                return False
+            print(f"✅ 재색인 완료: {elapsed:.1f}초")
+            return True
+
+        time.sleep(poll_interval)
+
+
+def swap_alias(source_index: str, target_index: str) -> bool:
+    """문서 수 확인 후 원본 인덱스를 삭제하고 같은 이름의 alias를 새 인덱스에 연결"""
+    client = opensearch_client.client
+
+    client.indices.refresh(index=target_index)
+    source_count = client.count(index=source_index)["count"]
+    target_count = client.count(index=target_index)["count"]
+
+    if source_count != target_count:
+        print(f"❌ 문서 수 불일치: {source_index}={source_count}, {target_index}={target_count} → 교체 중단")
+        return False
+
+    client.indices.delete(index=source_index)
+    client.indices.put_alias(index=target_index, name=source_index)
+    print(f"✅ alias 교체 완료: {source_index} → {target_index} ({target_count}개 문서)")
+    return True
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description='HNSW k-NN 인덱스 생성/마이그레이션')
+    parser.add_argument(
+        '--index',
+        choices=[settings.recipes_index, settings.ingredients_index, 'all'],
+        default='all',
+        help='마이그레이션할 인덱스'
+    )
+    parser.add_argument('--suffix', default='_knn', help='새 인덱스 이름 접미사')
+    parser.add_argument('--recreate', action='store_true', help='대상 인덱스가 있으면 삭제 후 재생성')
+    parser.add_argument('--swap', action='store_true', help='재색인 후 원본을 삭제하고 alias로 교체')
+    parser.add_argument('--dry-run', action='store_true', help='인덱스 body만 출력')
+    parser.add_argument('--poll-interval', type=float, default=5.0, help='재색인 진행률 확인 간격(초)')
+    parser.add_argument('--dimension', type=int, help='임베딩을 앞 N차원으로 잘라 색인 (기본: EMBEDDING_DIMENSIONS)')
+
+    args = parser.parse_args()
+    dimension = args.dimension or settings.vector_dimension
+
+    if args.index == 'all':
+        source_indices = [settings.recipes_index, settings.ingredients_index]
+    else:
+        source_indices = [args.index]
+
+    print("🔧 HNSW k-NN 인덱스 마이그레이션")
+    print("=" * 50)
+
+    for source_index in source_indices:
+        target_index = f"{source_index}{args.suffix}"
+
+        try:
+            if not create_knn_index(source_index, target_index, args.recreate, args.dry_run, dimension):
+                continue
+            if not reindex(source_index, target_index, args.poll_interval, dimension):
+                sys.exit(1)
+            if args.swap and not swap_alias(source_index, target_index):
+                sys.exit(1)
+        except Exception as e:
+            print(f"❌ {source_index} 마이그레이션 오류: {e}")
+            sys.exit(1)
+
+    if not args.dry_run:
+        print("\n💡 .env에 VECTOR_SEARCH_MODE=knn 을 설정하면 k-NN 쿼리를 사용합니다")
+
+
+if __name__ == "__main__":
+    main()
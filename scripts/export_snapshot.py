@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+OpenSearch 인덱스 → 로컬 벡터 스냅샷 내보내기 스크립트
+
+recipes/ingredients 인덱스를 search_after로 페이지 단위 스트리밍하여
+embedding 필드를 float32 행렬로, 문서 ID와 나머지 필드(name/category/ingredients 등)를
+메모리 맵 가능한 컬럼 파일로 저장합니다.
+(형식은 app/utils/vector_snapshot.py 참고, VECTOR_BACKEND=local 및 오프라인 벤치마크에서 사용)
+
+search_after 정렬 필드는 문서마다 고유하고 매핑상 정렬 가능한(keyword/숫자) 필드여야 합니다.
+text 필드면 keyword 하위 필드를 사용하고, 둘 다 없으면 --sort-field로 지정하라고 안내한 뒤 종료합니다.
+
+중간에 끊겨도 같은 명령으로 다시 실행하면 마지막으로 저장한 페이지 다음부터 이어서 받습니다.
+
+사용법:
+    python scripts/export_snapshot.py                          # recipes, ingredients 모두 data/vector_snapshot/에 저장
+    python scripts/export_snapshot.py --index recipes          # recipes만
+    python scripts/export_snapshot.py --output /tmp/snapshot   # 출력 디렉터리 지정
+    python scripts/export_snapshot.py --restart                # 진행 상황을 무시하고 처음부터
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.clients.opensearch_client import opensearch_client
+from app.config.settings import get_settings
+from app.utils.vector_snapshot import write_snapshot
+
+# 인덱스별 search_after 정렬 기준 (문서마다 고유한 필드, 매핑 확인 후 사용)
+SORT_FIELDS = {
+    opensearch_client.recipes_index: "recipe_id",
+    opensearch_client.ingredients_index: "ingredient_id",
+}
+
+PARTS_DIR = "_parts"
+PROGRESS_FILE = "progress.json"
+
+
+def load_progress(parts_dir: str) -> dict:
+    path = os.path.join(parts_dir, PROGRESS_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {"search_after": None, "sort_field": None, "parts": 0, "exported": 0, "skipped": 0}
+
+
+def save_progress(parts_dir: str, progress: dict):
+    """진행 상황을 임시 파일에 쓴 뒤 교체 (중간에 끊겨도 파일이 깨지지 않음)"""
+    path = os.path.join(parts_dir, PROGRESS_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(progress, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+def write_part(parts_dir: str, part_no: int, ids: list, sources: list, embeddings: list):
+    """한 페이지를 part 파일로 저장 (documents → embeddings 순서로 쓰고 progress는 마지막에 갱신)"""
+    with open(os.path.join(parts_dir, f"part-{part_no:05d}.jsonl"), "w", encoding="utf-8") as f:
+        for doc_id, source in zip(ids, sources):
+            f.write(json.dumps({"_id": doc_id, "_source": source}, ensure_ascii=False) + "\n")
+    np.save(os.path.join(parts_dir, f"part-{part_no:05d}.npy"), np.asarray(embeddings, dtype=np.float32))
+
+
+def resolve_sort_field(index_name: str, field: str) -> str:
+    """매핑을 확인해 search_after에 쓸 수 있는 정렬 필드명을 반환 (정렬 불가면 SystemExit)"""
+    mapping = opensearch_client.client.indices.get_mapping(index=index_name)
+    properties = next(iter(mapping.values()))["mappings"].get("properties", {})
+    sort_field = opensearch_client.sortable_field(properties, field)
+    if sort_field is None:
+        field_type = properties.get(field, {}).get("type", "매핑 없음")
+        print(f"❌ {index_name}: '{field}' 필드({field_type})로는 정렬할 수 없습니다")
+        print("💡 문서마다 고유한 keyword/숫자 필드를 --sort-field로 지정하세요")
+        sys.exit(1)
+    return sort_field
+
+
+def export_index(index_name: str, output_dir: str, sort_field: str, batch_size: int, restart: bool) -> bool:
+    client = opensearch_client.client
+    index_dir = os.path.join(output_dir, index_name)
+    parts_dir = os.path.join(index_dir, PARTS_DIR)
+
+    if restart and os.path.exists(parts_dir):
+        shutil.rmtree(parts_dir)
+    os.makedirs(parts_dir, exist_ok=True)
+
+    progress = load_progress(parts_dir)
+    if progress["exported"] and progress.get("sort_field") not in (None, sort_field):
+        print(f"❌ {index_name}: 이전 실행은 '{progress['sort_field']}' 기준으로 정렬했습니다 (--restart로 처음부터 다시 실행)")
+        return False
+    progress["sort_field"] = sort_field
+    total = client.count(index=index_name)["count"]
+    if progress["exported"]:
+        print(f"↩️ {index_name}: {progress['exported']}/{total}개부터 이어서 내보내기")
+    else:
+        print(f"📦 {index_name}: {total}개 문서 내보내기 시작 (정렬: {sort_field})")
+
+    start_time = time.time()
+    exported_this_run = 0
+
+    while True:
+        body = {
+            "size": batch_size,
+            "query": {"match_all": {}},
+            "sort": [{sort_field: "asc"}],
+        }
+        if progress["search_after"] is not None:
+            body["search_after"] = progress["search_after"]
+
+        response = client.search(index=index_name, body=body)
+        hits = response["hits"]["hits"]
+        if not hits:
+            break
+
+        ids, sources, embeddings = [], [], []
+        for hit in hits:
+            source = hit["_source"]
+            embedding = source.pop("embedding", None)
+            if not embedding:
+                progress["skipped"] += 1
+                continue
+            ids.append(hit["_id"])
+            sources.append(source)
+            embeddings.append(embedding)
+
+        if ids:
+            write_part(parts_dir, progress["parts"], ids, sources, embeddings)
+            progress["parts"] += 1
+
+        progress["exported"] += len(ids)
+        progress["search_after"] = hits[-1]["sort"]
+        save_progress(parts_dir, progress)
+
+        exported_this_run += len(ids)
+        elapsed = time.time() - start_time
+        rate = exported_this_run / elapsed if elapsed > 0 else 0.0
+        print(f"   {progress['exported']}/{total} 문서 ({rate:.0f} docs/s)")
+
+        if len(hits) < batch_size:
+            break
+
+    if progress["skipped"]:
+        print(f"⚠️ embedding 없는 문서 {progress['skipped']}개 제외")
+
+    return finalize(index_name, index_dir, parts_dir, progress)
+
+
+def finalize(index_name: str, index_dir: str, parts_dir: str, progress: dict) -> bool:
+    """part 파일들을 하나의 스냅샷으로 합치고 part 디렉터리 삭제"""
+    if progress["parts"] == 0:
+        print(f"❌ {index_name}: 내보낼 임베딩이 없습니다")
+        return False
+
+    ids, sources, matrices = [], [], []
+    for part_no in range(progress["parts"]):
+        with open(os.path.join(parts_dir, f"part-{part_no:05d}.jsonl"), encoding="utf-8") as f:
+            for line in f:
+                doc = json.loads(line)
+                ids.append(doc["_id"])
+                sources.append(doc["_source"])
+        matrices.append(np.load(os.path.join(parts_dir, f"part-{part_no:05d}.npy")))
+
+    meta = write_snapshot(index_dir, index_name, ids, sources, np.concatenate(matrices))
+    shutil.rmtree(parts_dir)
+
+    size_mb = os.path.getsize(os.path.join(index_dir, "embeddings.npy")) / (1024 * 1024)
+    print(
+        f"✅ {index_name} 스냅샷 완료: {meta['count']}개, {meta['dimension']}차원, {size_mb:.1f}MB, "
+        f"컬럼 {len(meta['columns'])}개 → {index_dir}"
+    )
+    return True
+
+
+def main():
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description='OpenSearch 인덱스를 로컬 벡터 스냅샷으로 내보내기')
+    parser.add_argument('--index', default='all', help='내보낼 인덱스 (기본: 레시피/재료 인덱스 모두)')
+    parser.add_argument('--output', default=settings.vector_snapshot_dir, help='스냅샷 디렉터리')
+    parser.add_argument('--batch-size', type=int, default=500, help='페이지당 문서 수')
+    parser.add_argument('--sort-field', help='search_after 정렬 필드 (기본: recipe_id / ingredient_id)')
+    parser.add_argument('--restart', action='store_true', help='진행 상황을 지우고 처음부터 다시 내보내기')
+
+    args = parser.parse_args()
+
+    if args.index == 'all':
+        index_names = [opensearch_client.recipes_index, opensearch_client.ingredients_index]
+    else:
+        index_names = [args.index]
+
+    print("📤 벡터 스냅샷 내보내기")
+    print("=" * 50)
+
+    for index_name in index_names:
+        try:
+            sort_field = resolve_sort_field(index_name, args.sort_field or SORT_FIELDS.get(index_name, "_id"))
+            if not export_index(index_name, args.output, sort_field, args.batch_size, args.restart):
+                sys.exit(1)
+        except Exception as e:
+            print(f"❌ {index_name} 내보내기 오류: {e}")
+            print("💡 같은 명령으로 다시 실행하면 마지막 페이지 다음부터 이어서 받습니다")
+            sys.exit(1)
+
+    print(f"\n💡 .env에 VECTOR_BACKEND=local, VECTOR_SNAPSHOT_DIR={args.output} 을 설정하면 로컬 벡터 인덱스를 사용합니다")
+
+
+if __name__ == "__main__":
+    main()
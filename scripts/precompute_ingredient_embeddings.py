@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+재료 임베딩 사전 계산 스크립트
+
+data/synonym_dictionary.json의 모든 표준 재료명과 동의어 임베딩을 미리 만들어
+디스크 임베딩 캐시(EMBEDDING_CACHE_DIR)에 저장합니다.
+이후 레시피 추천은 재료별 임베딩을 캐시에서 꺼내 로컬에서 평균만 계산하므로
+사전에 있는 재료라면 OpenAI 호출 없이 처리됩니다.
+
+이미 캐시된 재료는 건너뛰므로 사전을 수정한 뒤 다시 실행하면 추가된 재료만 임베딩합니다.
+
+사용법:
+    python scripts/precompute_ingredient_embeddings.py
+    python scripts/precompute_ingredient_embeddings.py --batch-size 512
+    python scripts/precompute_ingredient_embeddings.py --dry-run      # 임베딩할 재료 수만 확인
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.clients.openai_client import openai_client
+from app.utils.synonym_matcher import get_synonym_matcher
+
+
+async def run(batch_size: int, dry_run: bool) -> dict:
+    names = get_synonym_matcher().all_ingredient_names()
+    print(f"📖 동의어 사전 재료: {len(names)}개 (표준명 + 동의어)")
+
+    if dry_run:
+        missing = openai_client.cache.find_missing(names)
+        print(f"   캐시됨 {len(names) - len(missing)}개 / 임베딩 필요 {len(missing)}개")
+        return {}
+
+    try:
+        return await openai_client.warm_cache(names, batch_size=batch_size)
+    finally:
+        await openai_client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='동의어 사전 재료 임베딩 사전 계산')
+    parser.add_argument('--batch-size', type=int, default=256, help='임베딩 API 한 번에 보낼 재료 수')
+    parser.add_argument('--dry-run', action='store_true', help='임베딩 없이 캐시 현황만 출력')
+
+    args = parser.parse_args()
+
+    if not openai_client.cache:
+        print("❌ 임베딩 캐시가 비활성화되어 있습니다 (EMBEDDING_CACHE_ENABLED=true 필요)")
+        sys.exit(1)
+
+    print("🔥 재료 임베딩 사전 계산")
+    print("=" * 50)
+
+    start_time = time.time()
+    try:
+        result = asyncio.run(run(args.batch_size, args.dry_run))
+    except Exception as e:
+        print(f"❌ 임베딩 사전 계산 오류: {e}")
+        print("💡 다시 실행하면 이미 저장된 재료는 건너뜁니다")
+        sys.exit(1)
+
+    if result:
+        elapsed = time.time() - start_time
+        print(f"✅ 완료: 새로 임베딩 {result['embedded']}개, 기존 캐시 {result['cached']}개 ({elapsed:.1f}초)")
+        print(f"   캐시 위치: {openai_client.cache.cache_dir} ({openai_client.cache.stats()['entries']}개 항목)")
+
+
+if __name__ == "__main__":
+    main()
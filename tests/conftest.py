@@ -0,0 +1,153 @@
+"""공용 테스트 픽스처 (외부 서비스 없이 캐시/배치 모듈을 검증하기 위한 대역)"""
+
+import asyncio
+
+import pytest
+
+from app.utils.concurrency import record_error
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    """캐시 파일을 둘 임시 디렉터리"""
+    return str(tmp_path / "cache")
+
+
+class FakeEmbeddingsAPI:
+    """embeddings.create 대역: 텍스트 길이를 1차원 벡터로 돌려주고 요청마다 텍스트 목록을 기록"""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None, drop_last: bool = False):
+        self.delay = delay
+        self.error = error
+        self.drop_last = drop_last
+        self.calls = []
+
+    async def call(self, texts):
+        self.calls.append(list(texts))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        data = [[float(len(text))] for text in texts]
+        return {"data": data[:-1] if self.drop_last else data}
+
+    @staticmethod
+    def parse(response):
+        return response["data"]
+
+
+@pytest.fixture
+def embeddings_api():
+    """FakeEmbeddingsAPI 생성 함수"""
+    return FakeEmbeddingsAPI
+
+
+@pytest.fixture
+def search_response():
+    """SemanticSearchResponse 생성 함수 (레시피/재료 없이 total_matches만 지정)"""
+    from app.models.schemas import SemanticSearchResponse
+
+    def make(total_matches: int, **fields):
+        return SemanticSearchResponse(
+            recipes=[], ingredients=[], total_matches=total_matches, processing_time=0.1, **fields
+        )
+
+    return make
+
+
+class CountingCompute:
+    """검색 계산 대역: 호출 횟수를 세고, release가 설정될 때까지 결과를 미룰 수 있음
+
+    fail_with를 주면 기본값으로 대체한 백엔드 오류를 record_error로 남긴 채 결과를 반환
+    """
+
+    def __init__(self, make_response, total_matches: int = 3, wait: bool = False, fail_with: str = None):
+        self.make_response = make_response
+        self.total_matches = total_matches
+        self.fail_with = fail_with
+        self.calls = 0
+        self.release = asyncio.Event()
+        if not wait:
+            self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.fail_with:
+            record_error("OpenSearch", self.fail_with)
+        return self.make_response(self.total_matches)
+
+
+@pytest.fixture
+def counting_compute(search_response):
+    """CountingCompute 생성 함수"""
+    return lambda **kwargs: CountingCompute(search_response, **kwargs)
+
+
+class FakeOpenSearchClient:
+    """OpenSearchClient 대역: 검색 종류와 상관없이 인덱스에 넣어 둔 문서를 모두 적중으로 돌려줌"""
+
+    recipes_index = "recipes"
+    ingredients_index = "ingredients"
+
+    def __init__(self, recipes=(), ingredients=()):
+        self.documents = {self.recipes_index: list(recipes), self.ingredients_index: list(ingredients)}
+        self.searches = []
+        self.vector_searches = 0
+
+    async def search(self, index, body):
+        self.searches.append((index, body))
+        hits = [
+            {"_id": str(i), "_score": 10.0, "_source": dict(document)}
+            for i, document in enumerate(self.documents.get(index, []))
+        ]
+        return {"hits": {"hits": hits}}
+
+    async def msearch(self, searches):
+        return [await self.search(index, body) for index, body in searches]
+
+    async def search_recipes_by_ingredients(self, vectors, limit):
+        self.vector_searches += 1
+        return [{**document, "score": 1.5} for document in self.documents[self.recipes_index][:limit]]
+
+    async def search_recipes_by_text(self, query, limit):
+        return [{**document, "score": 10.0} for document in self.documents[self.recipes_index][:limit]]
+
+    async def get_index_fingerprint(self):
+        return None
+
+    async def aclose(self):
+        pass
+
+
+class FakeOpenAIClient:
+    """OpenAIClient 대역: 임베딩 요청 텍스트를 기록하고 고정 벡터를 돌려줌"""
+
+    def __init__(self, dimension: int = 4):
+        self.dimension = dimension
+        self.embedded = []
+
+    def _vector(self):
+        return [1.0] + [0.0] * (self.dimension - 1)
+
+    async def get_embedding(self, text):
+        self.embedded.append(text)
+        return self._vector()
+
+    async def get_embeddings(self, texts):
+        self.embedded.extend(texts)
+        return [self._vector() for _ in texts]
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def fake_opensearch_client():
+    """FakeOpenSearchClient 생성 함수"""
+    return FakeOpenSearchClient
+
+
+@pytest.fixture
+def fake_openai_client():
+    return FakeOpenAIClient()
@@ -0,0 +1,73 @@
+"""임베딩 마이크로 배치: 묶음 전송, 중복 제거, 오류/취소 시 호출자가 멈추지 않는지"""
+
+import asyncio
+
+from app.clients.openai_client import EmbeddingBatcher
+
+
+def make_batcher(api, **kwargs) -> EmbeddingBatcher:
+    return EmbeddingBatcher(api.call, api.parse, **kwargs)
+
+
+async def test_concurrent_requests_share_one_call_and_dedupe(embeddings_api):
+    api = embeddings_api()
+    batcher = make_batcher(api, max_wait=0.01)
+
+    results = await asyncio.gather(*(batcher.embed(text) for text in ["양파", "당근", "양파", "소고기"]))
+
+    assert results == [[2.0], [2.0], [2.0], [3.0]]
+    assert api.calls == [["양파", "당근", "소고기"]]
+    assert batcher.stats()["requests"] == 4
+    assert batcher.stats()["batches"] == 1
+
+
+async def test_full_batch_is_sent_without_waiting(embeddings_api):
+    api = embeddings_api()
+    batcher = make_batcher(api, max_batch_size=2, max_wait=10.0)
+
+    results = await asyncio.wait_for(asyncio.gather(batcher.embed("a"), batcher.embed("bb")), timeout=1.0)
+
+    assert results == [[1.0], [2.0]]
+    assert api.calls == [["a", "bb"]]
+
+
+async def test_api_error_reaches_every_caller(embeddings_api):
+    batcher = make_batcher(embeddings_api(error=RuntimeError("rate limited")), max_wait=0.001)
+
+    results = await asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_cancelled_caller_does_not_break_others(embeddings_api):
+    batcher = make_batcher(embeddings_api(delay=0.02), max_wait=0.001)
+
+    cancelled = asyncio.ensure_future(batcher.embed("a"))
+    other = asyncio.ensure_future(batcher.embed("a"))
+    await asyncio.sleep(0.005)
+    cancelled.cancel()
+
+    assert await asyncio.wait_for(other, timeout=1.0) == [1.0]
+    assert cancelled.cancelled()
+
+
+async def test_response_count_mismatch_fails_the_batch(embeddings_api):
+    batcher = make_batcher(embeddings_api(drop_last=True), max_wait=0.001)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True), timeout=1.0
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_cancelled_batch_does_not_hang_callers(embeddings_api):
+    batcher = make_batcher(embeddings_api(delay=10.0), max_wait=0.001)
+
+    waiters = [asyncio.ensure_future(batcher.embed(text)) for text in ["a", "b"]]
+    await asyncio.sleep(0.01)
+    for task in list(batcher._tasks):
+        task.cancel()
+
+    results = await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), timeout=1.0)
+    assert all(isinstance(result, BaseException) for result in results)
@@ -0,0 +1,158 @@
+"""디스크 임베딩 캐시: 저장/조회, 키 정규화, 워커 간 공유(미스 시 갱신), 깨진 꼬리 처리"""
+
+import os
+
+import numpy as np
+
+from app.utils.embedding_cache import EmbeddingCache
+
+DIMENSION = 4
+MODEL = "text-embedding-3-small"
+
+
+def unit(index: int):
+    vector = [0.0] * DIMENSION
+    vector[index] = 1.0
+    return vector
+
+
+def test_put_and_get(cache_dir):
+    cache = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    cache.put_many(["김치", "두부"], [unit(0), unit(1)])
+
+    np.testing.assert_allclose(cache.get("김치"), unit(0))
+    np.testing.assert_allclose(cache.get("두부"), unit(1))
+    assert cache.get("라면") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_key_normalization(cache_dir):
+    cache = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    cache.put_many(["  Kimchi  Stew "], [unit(0)])
+
+    np.testing.assert_allclose(cache.get("kimchi stew"), unit(0))
+
+
+def test_dimension_mismatch_is_skipped(cache_dir):
+    cache = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    cache.put_many(["라면"], [[1.0, 0.0, 0.0]])
+
+    assert cache.get("라면") is None
+
+
+def test_entries_survive_reopen(cache_dir):
+    EmbeddingCache(cache_dir, MODEL, DIMENSION).put_many(["양파", "당근"], [unit(0), unit(1)])
+
+    reopened = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    assert reopened.stats()["entries"] == 2
+    np.testing.assert_allclose(reopened.get("당근"), unit(1))
+
+
+def test_instances_share_the_directory(cache_dir):
+    writer = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    reader = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+
+    writer.put_many(["마늘"], [unit(2)])
+    reader.refresh()
+
+    np.testing.assert_allclose(reader.get("마늘"), unit(2))
+
+
+def test_miss_refreshes_entries_written_by_another_instance(cache_dir):
+    writer = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    reader = EmbeddingCache(cache_dir, MODEL, DIMENSION, refresh_interval=0)
+
+    writer.put_many(["대파"], [unit(1)])
+    embeddings = reader.get_many(["대파"])
+    assert embeddings == [None]
+
+    assert reader.maybe_refresh()
+    embeddings = reader.recheck_misses(["대파"], embeddings)
+
+    np.testing.assert_allclose(embeddings[0], unit(1))
+    assert reader.stats()["hits"] == 1
+    assert reader.stats()["misses"] == 0
+
+
+def test_miss_refresh_is_rate_limited(cache_dir):
+    writer = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    reader = EmbeddingCache(cache_dir, MODEL, DIMENSION, refresh_interval=60)
+
+    writer.put_many(["부추"], [unit(3)])
+
+    assert not reader.refresh_due()
+    assert not reader.maybe_refresh()
+    assert reader.get("부추") is None
+
+
+def test_staged_entries_are_readable_before_flush(cache_dir):
+    cache = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+
+    assert cache.stage(["김치", "김치"], [unit(0), unit(1)]) == 1
+    assert cache.unflushed_count() == 1
+    assert not os.path.exists(cache.vectors_path)
+    np.testing.assert_allclose(cache.get("김치"), unit(0))
+
+    cache.flush()
+    assert cache.unflushed_count() == 0
+    assert os.path.getsize(cache.vectors_path) == DIMENSION * 4
+    np.testing.assert_allclose(cache.get("김치"), unit(0))
+
+
+def test_get_returns_copy(cache_dir):
+    cache = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    cache.stage(["두부"], [unit(0)])
+    cache.get("두부")[0] = 42.0
+    cache.flush()
+    cache.get("두부")[0] = 42.0
+
+    np.testing.assert_allclose(cache.get("두부"), unit(0))
+
+
+def test_existing_keys_are_not_rewritten(cache_dir):
+    first = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    second = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    first.put_many(["마늘"], [unit(0)])
+    second.put_many(["마늘"], [unit(2)])
+
+    assert os.path.getsize(first.vectors_path) == DIMENSION * 4
+    np.testing.assert_allclose(second.get("마늘"), unit(0))
+
+
+def test_partial_vector_row_is_overwritten(cache_dir):
+    cache = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    cache.put_many(["감자"], [unit(0)])
+    # 쓰다 끊긴 벡터 행
+    with open(cache.vectors_path, "ab") as f:
+        f.write(b"\x00" * 6)
+
+    reopened = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    reopened.put_many(["고구마"], [unit(1)])
+
+    assert os.path.getsize(cache.vectors_path) == 2 * DIMENSION * 4
+    np.testing.assert_allclose(reopened.get("고구마"), unit(1))
+    np.testing.assert_allclose(reopened.get("감자"), unit(0))
+
+
+def test_models_do_not_share_keys(cache_dir):
+    EmbeddingCache(cache_dir, MODEL, DIMENSION).put_many(["버섯"], [unit(0)])
+
+    assert EmbeddingCache(cache_dir, "other-model", DIMENSION).get("버섯") is None
+
+
+def test_torn_index_line_is_dropped_before_appending(cache_dir):
+    cache = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    cache.put_many(["감자"], [unit(0)])
+    # 쓰다 끊긴 인덱스 줄 (개행 없음)
+    with open(cache.index_path, "a", encoding="utf-8") as f:
+        f.write("deadbeef\t1")
+
+    reopened = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    assert reopened.stats()["entries"] == 1
+    reopened.put_many(["고구마"], [unit(1)])
+
+    again = EmbeddingCache(cache_dir, MODEL, DIMENSION)
+    assert again.stats()["entries"] == 2
+    np.testing.assert_allclose(again.get("고구마"), unit(1))
+    np.testing.assert_allclose(again.get("감자"), unit(0))
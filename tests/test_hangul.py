@@ -0,0 +1,36 @@
+"""테이블 기반 한글 코덱이 기존 글자 단위 구현과 같은 결과를 내는지 확인"""
+
+import pytest
+
+from app.utils import hangul
+from scripts.benchmark_hangul import legacy_compose, legacy_decompose, make_inputs
+
+
+@pytest.fixture(scope="module")
+def inputs():
+    return make_inputs(3000, seed=42)
+
+
+def test_decompose_matches_legacy(inputs):
+    texts, _ = inputs
+    assert hangul.decompose_many(texts) == [legacy_decompose(text) for text in texts]
+
+
+def test_compose_matches_legacy_on_noisy_jamo(inputs):
+    _, jamo_texts = inputs
+    assert hangul.compose_many(jamo_texts) == [legacy_compose(text) for text in jamo_texts]
+
+
+def test_every_syllable_round_trips():
+    syllables = "".join(chr(hangul.SYLLABLE_BASE + code) for code in range(hangul.SYLLABLE_COUNT))
+    assert hangul.decompose(syllables) == legacy_decompose(syllables)
+    for char in syllables:
+        assert hangul.compose(hangul.decompose(char)) == char
+
+
+@pytest.mark.parametrize("jamo", [
+    "", "ㄱ", "ㅏ", "a", "ㄱㄱ", "ㅏㅏ", "ㄹㅏㅁㅕㄴ", "ㄱㅏㄱ", "ㄱㅏㄳㅏ", "ㅇㅏ ㄴㅕㅇ", "ab", "ㄱㅏa", "ㄱㅏㄴ",
+])
+def test_edge_cases_match_legacy(jamo):
+    assert hangul.compose(jamo) == legacy_compose(jamo)
+    assert hangul.decompose(jamo) == legacy_decompose(jamo)
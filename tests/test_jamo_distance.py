@@ -0,0 +1,72 @@
+"""자모 편집 거리(비트 병렬)가 DP Levenshtein과 같은 값을 내는지 확인"""
+
+import random
+
+import pytest
+
+from app.utils.jamo_distance import JamoPattern, batch_jamo_distances, jamo_distance
+
+ALPHABET = list("ㄱㄴㄷㄹㅁㅂㅏㅓㅗㅜㅡㅣ") + list("ab ")
+
+
+def dp_levenshtein(a: str, b: str) -> int:
+    """기준 구현: 행 하나만 유지하는 O(mn) DP"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def random_texts(count: int, seed: int, max_length: int):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_length))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("", "", 0),
+    ("", "ㄹㅏ", 2),
+    ("ㄹㅏㅁㅕㄴ", "", 5),
+    ("ㄹㅏㅁㅓㄴ", "ㄹㅏㅁㅕㄴ", 1),  # 라먼 / 라면
+    ("ㅋㅡㅁㅕㄴ", "ㄹㅏㅁㅕㄴ", 2),  # 크면 / 라면
+    ("ㄱㅣㅁㅊㅣ", "ㄱㅣㅁㅊㅣ", 0),
+])
+def test_known_distances(a, b, expected):
+    assert jamo_distance(a, b) == expected
+    assert jamo_distance(b, a) == expected
+
+
+def test_matches_dp_on_random_pairs():
+    texts = random_texts(400, seed=7, max_length=20)
+    for a, b in zip(texts[::2], texts[1::2]):
+        assert JamoPattern(a).distance(b) == dp_levenshtein(a, b), (a, b)
+
+
+def test_long_patterns_beyond_machine_word():
+    # 파이썬 정수 비트 연산이라 64자 이상에서도 같아야 함
+    texts = random_texts(40, seed=11, max_length=150)
+    for a, b in zip(texts[::2], texts[1::2]):
+        assert jamo_distance(a, b) == dp_levenshtein(a, b)
+
+
+def test_batch_matches_single_distances():
+    query = "ㄷㅚㄴㅈㅏㅇㅉㅣㄱㅐ"
+    candidates = ["ㄷㅚㄴㅈㅏㅇㄱㅜㄱ", "ㄷㅚㄴㅈㅏㅇㅉㅣㄱㅔ", "ㄱㅣㅁㅊㅣㅉㅣㄱㅐ", "", query]
+    expected = [dp_levenshtein(query, candidate) for candidate in candidates]
+
+    assert batch_jamo_distances(query, candidates) == expected
+    assert JamoPattern(query).distances(candidates) == expected
+
+
+def test_similarity_range():
+    pattern = JamoPattern("ㄹㅏㅁㅕㄴ")
+
+    assert pattern.similarity("ㄹㅏㅁㅕㄴ") == 1.0
+    assert 0.0 <= pattern.similarity("ㄱㅣㅁㅊㅣㅂㅗㄲㅇㅡㅁㅂㅏㅂ") < 1.0
+    assert JamoPattern("").similarity("") == 1.0
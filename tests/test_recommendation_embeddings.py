@@ -0,0 +1,15 @@
+from app.services.recommendation_service import RecommendationService
+
+
+async def test_ingredients_are_deduped_but_embedded_with_original_spelling(
+    fake_opensearch_client, fake_openai_client
+):
+    service = RecommendationService(
+        opensearch_client=fake_opensearch_client(),
+        openai_client=fake_openai_client
+    )
+
+    embeddings = await service._get_ingredient_embeddings(["Spam", " spam ", "대파", "", "  "])
+
+    assert fake_openai_client.embedded == ["Spam", "대파"]
+    assert len(embeddings) == 2
@@ -0,0 +1,98 @@
+"""LLM 관련성 판단 캐시: 키 구성, LRU/TTL, 복사본 반환, 저장/로드, 워커 간 병합, 주기 저장"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from app.utils.relevance_cache import RelevanceCache
+
+VERSION = "v1"
+
+
+@pytest.fixture
+def cache_path(cache_dir):
+    return os.path.join(cache_dir, "relevance_cache.json")
+
+
+def test_key_uses_normalized_query_and_prompt_version():
+    cache = RelevanceCache()
+    cache.put("  김치 찌개 ", 1, VERSION, 80.0)
+
+    assert cache.get("김치 찌개", "1", VERSION) == 80.0
+    assert cache.get("김치 찌개", 1, "v2") is None
+
+
+def test_get_and_put_use_copies():
+    cache = RelevanceCache()
+    value = {"relevant": True}
+    cache.put("라면", 1, VERSION, value)
+    value["relevant"] = False
+    cache.get("라면", 1, VERSION)["relevant"] = False
+
+    assert cache.get("라면", 1, VERSION) == {"relevant": True}
+
+
+def test_lru_eviction():
+    cache = RelevanceCache(max_entries=2)
+    cache.put("q", 1, VERSION, 1.0)
+    cache.put("q", 2, VERSION, 2.0)
+    cache.get("q", 1, VERSION)
+    cache.put("q", 3, VERSION, 3.0)
+
+    assert cache.get("q", 2, VERSION) is None
+    assert cache.get("q", 1, VERSION) == 1.0
+
+
+def test_expired_entries_miss():
+    cache = RelevanceCache(ttl=0.0)
+    cache.put("q", 1, VERSION, 1.0)
+
+    assert cache.get("q", 1, VERSION) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_put_does_not_write_to_disk(cache_path):
+    cache = RelevanceCache(path=cache_path, save_interval=0.0)
+    cache.put("q", 1, VERSION, 1.0)
+
+    assert not os.path.exists(cache_path)
+
+
+def test_save_and_reload(cache_path):
+    cache = RelevanceCache(path=cache_path)
+    cache.put("q", 1, VERSION, {"relevant": True})
+    cache.save()
+
+    assert RelevanceCache(path=cache_path).get("q", 1, VERSION) == {"relevant": True}
+
+
+def test_save_merges_entries_from_other_workers(cache_path):
+    first = RelevanceCache(path=cache_path)
+    second = RelevanceCache(path=cache_path)
+    first.put("q", 1, VERSION, 1.0)
+    second.put("q", 2, VERSION, 2.0)
+
+    first.save()
+    second.save()
+
+    with open(cache_path, encoding="utf-8") as f:
+        assert len(json.load(f)["entries"]) == 2
+    assert second.get("q", 1, VERSION) == 1.0
+
+
+async def test_periodic_save_writes_changes(cache_path):
+    cache = RelevanceCache(path=cache_path, save_interval=0.01)
+    cache.put("q", 1, VERSION, 1.0)
+
+    task = asyncio.create_task(cache.run_periodic_save())
+    try:
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if os.path.exists(cache_path):
+                break
+    finally:
+        task.cancel()
+
+    assert RelevanceCache(path=cache_path).get("q", 1, VERSION) == 1.0
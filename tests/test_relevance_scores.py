@@ -0,0 +1,26 @@
+from app.utils.local_reranker import LocalReranker
+from app.utils.openai_relevance_scorer import OpenAIRelevanceScorer
+
+
+def test_ai_score_keeps_vector_score_set_by_local_reranker(fake_openai_client):
+    scorer = OpenAIRelevanceScorer(fake_openai_client)
+    reranker = LocalReranker(scorer._calculate_exact_match_bonus)
+    recipe = {"rcp_nm": "김치찌개", "score": 1.8, "match_reason": "벡터 유사도"}
+
+    reranker.score("김치찌개", [recipe])
+    local_score = recipe["local_score"]
+    scorer._apply_ai_score("김치찌개", recipe, 90.0)
+
+    assert recipe["original_vector_score"] == 1.8
+    assert recipe["local_score"] == local_score
+    assert recipe["ai_relevance_score"] == 90.0
+
+
+def test_ai_score_records_vector_score_without_local_rerank(fake_openai_client):
+    scorer = OpenAIRelevanceScorer(fake_openai_client)
+    recipe = {"rcp_nm": "된장국", "score": 1.5}
+
+    scorer._apply_ai_score("김치찌개", recipe, 30.0)
+
+    assert recipe["original_vector_score"] == 1.5
+    assert "local_score" not in recipe
@@ -0,0 +1,31 @@
+import asyncio
+
+from app.services.enhanced_search_service_script import EnhancedSearchService
+
+
+async def test_failed_vector_branch_keeps_text_results_and_leaves_no_task(
+    fake_opensearch_client, fake_openai_client
+):
+    opensearch = fake_opensearch_client()
+    text_calls = []
+
+    async def failing_vector_search(vector, limit):
+        raise RuntimeError("vector index unavailable")
+
+    async def slow_text_search(query, limit):
+        text_calls.append(query)
+        # 첫 호출만 느림: 형제 브랜치가 방치되면 반환 시점에 아직 실행 중
+        if len(text_calls) == 1:
+            await asyncio.sleep(0.05)
+        return [{"ingredient_id": 1, "name": "양파", "category": "채소", "score": 10.0}]
+
+    opensearch.vector_search_ingredients = failing_vector_search
+    opensearch.search_ingredients_by_text = slow_text_search
+    service = EnhancedSearchService(opensearch_client=opensearch, openai_client=fake_openai_client)
+
+    results = await service._search_ingredients_script_score("양파", 5)
+
+    assert [result.name for result in results] == ["양파"]
+    assert results[0].match_reason == "텍스트 매칭"
+    assert text_calls == ["양파"]
+    assert asyncio.all_tasks() == {asyncio.current_task()}
@@ -0,0 +1,120 @@
+"""검색 결과 캐시: 복사본 반환, 요청 병합, 부정 캐시, stale 갱신, LRU, 인덱스 변경 무효화"""
+
+import asyncio
+
+from app.utils.search_result_cache import SearchResultCache
+
+
+async def test_hit_returns_independent_copy(counting_compute):
+    cache = SearchResultCache()
+    compute = counting_compute()
+
+    first = await cache.get_or_compute("김치", compute)
+    first.total_matches = 99
+    second = await cache.get_or_compute("김치", compute)
+
+    assert compute.calls == 1
+    assert second.total_matches == 3
+    assert cache.stats()["hits"] == 1
+
+
+async def test_concurrent_requests_compute_once(counting_compute):
+    cache = SearchResultCache()
+    compute = counting_compute(wait=True)
+
+    waiters = [asyncio.ensure_future(cache.get_or_compute("라면", compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    compute.release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert compute.calls == 1
+    assert all(result.total_matches == 3 for result in results)
+
+
+async def test_empty_results_use_negative_ttl(counting_compute):
+    cache = SearchResultCache(negative_ttl=0.05)
+    compute = counting_compute(total_matches=0)
+
+    await cache.get_or_compute("없는요리", compute)
+    await cache.get_or_compute("없는요리", compute)
+    assert compute.calls == 1
+
+    await asyncio.sleep(0.06)
+    await cache.get_or_compute("없는요리", compute)
+    assert compute.calls == 2
+
+
+async def test_stale_entry_is_served_and_refreshed_in_background(counting_compute):
+    cache = SearchResultCache(ttl=0.02, stale_ttl=10.0)
+    compute = counting_compute()
+    await cache.get_or_compute("잡채", compute)
+    await asyncio.sleep(0.03)
+
+    compute.total_matches = 7
+    stale = await cache.get_or_compute("잡채", compute)
+    assert stale.total_matches == 3
+
+    await asyncio.sleep(0.01)
+    assert compute.calls == 2
+    assert (await cache.get_or_compute("잡채", compute)).total_matches == 7
+    assert compute.calls == 2
+
+
+async def test_lru_eviction(counting_compute):
+    cache = SearchResultCache(max_entries=2)
+    compute = counting_compute()
+    for key in ["a", "b", "c"]:
+        await cache.get_or_compute(key, compute)
+
+    await cache.get_or_compute("c", compute)
+    assert compute.calls == 3
+    await cache.get_or_compute("a", compute)
+    assert compute.calls == 4
+
+
+async def test_index_fingerprint_change_clears_cache(counting_compute):
+    fingerprint = {"value": 1}
+
+    async def fingerprint_func():
+        return fingerprint["value"]
+
+    cache = SearchResultCache(fingerprint_interval=0.0, fingerprint_func=fingerprint_func)
+    compute = counting_compute()
+    await cache.get_or_compute("김치", compute)
+    await cache.get_or_compute("김치", compute)
+    assert compute.calls == 1
+
+    fingerprint["value"] = 2
+    await cache.get_or_compute("김치", compute)
+    assert compute.calls == 2
+    assert cache.stats()["invalidations"] == 1
+
+
+async def test_cancelled_first_caller_does_not_cancel_shared_computation(counting_compute):
+    cache = SearchResultCache()
+    compute = counting_compute(wait=True)
+
+    first = asyncio.ensure_future(cache.get_or_compute("된장", compute))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(cache.get_or_compute("된장", compute))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    compute.release.set()
+
+    assert (await asyncio.wait_for(second, timeout=1.0)).total_matches == 3
+    assert first.cancelled()
+    await cache.get_or_compute("된장", compute)
+    assert compute.calls == 1
+
+
+async def test_results_computed_with_errors_are_not_stored(counting_compute):
+    cache = SearchResultCache()
+    compute = counting_compute(fail_with="connection refused")
+
+    result = await cache.get_or_compute("불고기", compute)
+    await cache.get_or_compute("불고기", compute)
+
+    assert result.total_matches == 3
+    assert compute.calls == 2
+    assert cache.stats()["skipped_stores"] == 2
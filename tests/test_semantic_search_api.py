@@ -0,0 +1,84 @@
+"""/api/search/semantic(+stream)이 FinalStrict 검색 서비스로 처리되는지 (가짜 OpenSearch/OpenAI로 확인)"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import search
+from app.config.settings import get_settings
+from app.container import ServiceContainer
+from app.services.final_strict_semantic_search_service import FinalStrictSemanticSearchService
+from app.utils.korean_spell_checker import spell_checker
+
+RECIPES = [
+    {"recipe_id": "1", "name": "김치찌개", "ingredients": "김치, 돼지고기, 두부", "category": "찌개"},
+    {"recipe_id": "2", "name": "김치볶음밥", "ingredients": "김치, 밥, 계란", "category": "밥"},
+]
+
+
+@pytest.fixture
+def opensearch(fake_opensearch_client):
+    return fake_opensearch_client(recipes=RECIPES, ingredients=[{"ingredient_id": 7, "name": "김치"}])
+
+
+@pytest.fixture
+def api(monkeypatch, opensearch, fake_openai_client):
+    async def no_correction(query):
+        return query
+
+    monkeypatch.setattr(spell_checker, "correct_typo", no_correction)
+    # 프로세스 공용 결과 캐시가 테스트 사이에 결과를 넘기지 않도록 끔
+    monkeypatch.setattr(get_settings(), "search_cache_enabled", False)
+
+    app = FastAPI()
+    app.include_router(search.router, prefix="/api/search")
+    app.state.container = ServiceContainer(opensearch=opensearch, openai=fake_openai_client)
+    return TestClient(app)
+
+
+def test_final_strict_is_the_live_service(api):
+    assert search.EnhancedSearchService is FinalStrictSemanticSearchService
+    service = api.app.state.container.get_service(search.EnhancedSearchService)
+    assert isinstance(service, FinalStrictSemanticSearchService)
+    assert service.result_cache is None
+
+
+def test_semantic_search(api):
+    response = api.post("/api/search/semantic", json={"query": "김치찌개", "limit": 2})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [recipe["rcp_nm"] for recipe in body["recipes"]] == ["김치찌개", "김치볶음밥"]
+    assert [ingredient["name"] for ingredient in body["ingredients"]] == ["김치"]
+    assert body["total_matches"] == 3
+
+
+def test_semantic_search_stream_sends_text_stage_before_final(api, opensearch, fake_openai_client):
+    # 텍스트 결과가 limit의 70%에 못 미치면 벡터 검색 전에 텍스트 단계 결과를 먼저 보냄
+    response = api.post("/api/search/semantic/stream", json={"query": "김치찌개", "limit": 10})
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["stage"] for event in events] == ["text", "final"]
+    assert events[-1]["final"] is True
+    assert {recipe["rcp_nm"] for recipe in events[-1]["recipes"]} == {"김치찌개", "김치볶음밥"}
+    assert opensearch.vector_searches >= 1
+    assert "김치찌개" in fake_openai_client.embedded
+
+
+def test_corrected_query_is_reported(api, monkeypatch):
+    async def correct(query):
+        return "김치찌개"
+
+    monkeypatch.setattr(spell_checker, "correct_typo", correct)
+
+    body = api.post("/api/search/semantic", json={"query": "김치찌게", "limit": 2}).json()
+    events = [
+        json.loads(line)
+        for line in api.post("/api/search/semantic/stream", json={"query": "김치찌게", "limit": 2}).text.splitlines()
+    ]
+
+    assert body["corrected_query"] == "김치찌개"
+    assert events[-1]["corrected_query"] == "김치찌개"
@@ -0,0 +1,42 @@
+from app.utils import korean_spell_checker
+from app.utils.concurrency import record_error
+from app.utils.korean_spell_checker import KoreanSpellChecker
+
+
+def _empty():
+    return {"hits": {"hits": [], "total": {"value": 0}}}
+
+
+async def test_correction_computed_during_outage_is_not_cached(monkeypatch):
+    calls = []
+
+    async def failing_msearch(searches):
+        # opensearch_client.msearch처럼 오류를 삼키고 빈 결과로 대체
+        calls.append(searches)
+        record_error("OpenSearch 멀티 검색", "connection refused")
+        return [_empty() for _ in searches]
+
+    monkeypatch.setattr(korean_spell_checker.opensearch_client, "msearch", failing_msearch)
+    checker = KoreanSpellChecker()
+
+    assert await checker.correct_typo("김치찌게") == "김치찌게"
+    assert "김치찌게" not in checker.correction_cache
+
+    await checker.correct_typo("김치찌게")
+    assert len(calls) == 2
+
+
+async def test_correction_without_errors_is_cached(monkeypatch):
+    calls = []
+
+    async def empty_msearch(searches):
+        calls.append(searches)
+        return [_empty() for _ in searches]
+
+    monkeypatch.setattr(korean_spell_checker.opensearch_client, "msearch", empty_msearch)
+    checker = KoreanSpellChecker()
+
+    assert await checker.correct_typo("김치찌게") == "김치찌게"
+    assert await checker.correct_typo("김치찌게") == "김치찌게"
+    assert len(calls) == 1
+    assert checker.correction_cache_hits == 1